@@ -0,0 +1,34 @@
+// Lists longer than this threshold are displayed as a downsampled view (same value as LARGE_LIST_THRESHOLD in main.py)
+export const LARGE_LIST_THRESHOLD = 2000;
+
+// Number of buckets of the downsampled view (same value as DECIMATION_BUCKETS in worker.py)
+export const DECIMATION_BUCKETS = 512;
+
+/**
+ * Downsample a list to the minimum and the maximum of each bucket
+ * @param {Array} arr - The list to downsample
+ * @param {Number} buckets - The number of buckets
+ * @returns {Array} - The minimum and the maximum of each bucket, interleaved
+ * @example - decimate([3, 1, 2, 4], 2) => [1, 3, 2, 4]
+ * @note - A list shorter than the number of buckets gives one bucket per element, as decimate in worker.py
+ */
+export function decimate(arr, buckets = DECIMATION_BUCKETS) {
+    console.assert(arr !== undefined, 'decimate : arr is undefined');
+    console.assert(buckets > 0, 'decimate : buckets should be positive');
+
+    const n = arr.length;
+    buckets = Math.min(buckets, n);
+    const view = [];
+    for (let bucket = 0; bucket < buckets; bucket++) {
+        const start = Math.floor(bucket * n / buckets);
+        const end = Math.floor((bucket + 1) * n / buckets);
+        let min = arr[start];
+        let max = arr[start];
+        for (let i = start + 1; i < end; i++) {
+            if (arr[i] < min) { min = arr[i]; }
+            if (arr[i] > max) { max = arr[i]; }
+        }
+        view.push(min, max);
+    }
+    return view;
+}
@@ -0,0 +1,96 @@
+// Kinds of generated lists (same values as LIST_KINDS in generators.py)
+export const LIST_KINDS = ['sorted', 'reversed', 'random', 'few-unique', 'nearly-sorted', 'organ-pipe', 'sawtooth'];
+
+// Default parameter of the kinds which take one (same values as in generators.py)
+const DEFAULT_FEW_UNIQUE_VALUES = 8;
+const DEFAULT_NEARLY_SORTED_SWAPS_RATIO = 0.01;
+const DEFAULT_SAWTOOTH_TEETH = 8;
+
+/**
+ * Pseudo-random generator, giving the same numbers as LinearCongruentialGenerator in generators.py for the same seed
+ * @param {Number} seed - The seed, a 32-bit unsigned integer
+ * @note - state = (state * 1103515245 + 12345) mod 2^32
+ */
+class LinearCongruentialGenerator {
+    constructor(seed) {
+        this.state = seed >>> 0;
+    }
+
+    next() {
+        this.state = (Math.imul(this.state, 1103515245) + 12345) >>> 0;
+        return this.state;
+    }
+
+    below(bound) {
+        // The low bits have a short period, so only the high halves of two states are used
+        const high = this.next() >>> 16;
+        return (high * 0x10000 + (this.next() >>> 16)) % bound;
+    }
+}
+
+/**
+ * Parse a descriptor of a generated list
+ * @param {String} descriptor - "kind:n:seed" or "kind:n:seed:parameter", e.g. "nearly-sorted:1000:42:10"
+ * @returns {Object} - { kind, n, seed, parameter }, the parameter being null when it is not given
+ */
+export function parseDescriptor(descriptor) {
+    const fields = descriptor.split(':');
+    if (![3, 4].includes(fields.length) || !fields.slice(1).every((field) => /^\d+$/.test(field))) {
+        throw new Error(`Invalid list descriptor '${descriptor}', expected 'kind:n:seed' or 'kind:n:seed:parameter'`);
+    }
+
+    const [kind, n, seed] = [fields[0], Number(fields[1]), Number(fields[2])];
+    const parameter = fields.length === 4 ? Number(fields[3]) : null;
+    if (!LIST_KINDS.includes(kind)) {
+        throw new Error(`Unknown list kind '${kind}'`);
+    }
+    return { kind, n, seed, parameter };
+}
+
+/**
+ * Generate the list described by a descriptor, always the same for the same descriptor
+ * @param {String} descriptor - "kind:n:seed" or "kind:n:seed:parameter", see generate_list in generators.py
+ * @returns {Array} - The generated list
+ * @example - generateList("organ-pipe:5:0") => [1, 3, 5, 4, 2]
+ * @note - The worker generates the same list from the descriptor, so the large lists are never sent to it
+ */
+export function generateList(descriptor) {
+    const { kind, n, seed, parameter } = parseDescriptor(descriptor);
+    const generator = new LinearCongruentialGenerator(seed);
+
+    if (kind === 'few-unique') {
+        const values = parameter || DEFAULT_FEW_UNIQUE_VALUES;
+        const step = Math.max(Math.floor(n / values), 1);
+        return Array.from({ length: n }, () => (generator.below(values) + 1) * step);
+    }
+
+    if (kind === 'organ-pipe') {
+        const odd = Array.from({ length: Math.ceil(n / 2) }, (_, i) => 2 * i + 1);
+        const even = Array.from({ length: Math.floor(n / 2) }, (_, i) => n - n % 2 - 2 * i);
+        return odd.concat(even);
+    }
+
+    if (kind === 'sawtooth') {
+        const width = Math.ceil(n / (parameter || DEFAULT_SAWTOOTH_TEETH));
+        return Array.from({ length: n }, (_, i) => i % width + 1);
+    }
+
+    const list = Array.from({ length: n }, (_, i) => i + 1);
+    if (kind === 'reversed') {
+        list.reverse();
+    } else if (kind === 'random') {
+        // Fisher-Yates shuffle, on the whole state as generate_list in generators.py
+        for (let i = n - 1; i > 0; i--) {
+            const j = generator.next() % (i + 1);
+            [list[i], list[j]] = [list[j], list[i]];
+        }
+    } else if (kind === 'nearly-sorted') {
+        const swaps = parameter ?? Math.max(Math.floor(n * DEFAULT_NEARLY_SORTED_SWAPS_RATIO), 1);
+        for (let swap = 0; swap < swaps; swap++) {
+            const i = generator.below(n);
+            const j = generator.below(n);
+            [list[i], list[j]] = [list[j], list[i]];
+        }
+    }
+    return list;
+}
@@ -0,0 +1,32 @@
+// Number of colors of the heatmap of the lines (see the line-heat-* classes in editor.svelte)
+export const HEAT_LEVELS = 5;
+
+/**
+ * Convert the profile of the lines into the levels of the heatmap
+ * @param {Array} profile - The number of executions and the time (in seconds) of each line, interleaved (see LineProfiler in worker.py)
+ * @param {Number} levels - The number of levels of the heatmap
+ * @returns {Array} - The executed lines, as { line, hits, time, level } objects, level 1 being the coldest
+ * @example - lineHeatmap([1, 0.1, 0, 0, 10, 0.5], 5) => [{ line: 1, hits: 1, time: 0.1, level: 1 }, { line: 3, hits: 10, time: 0.5, level: 5 }]
+ * @note - The level is proportional to the time of the line, relative to the slowest line
+ */
+export function lineHeatmap(profile, levels = HEAT_LEVELS) {
+    console.assert(profile !== undefined, 'lineHeatmap : profile is undefined');
+    console.assert(profile.length % 2 === 0, 'lineHeatmap : profile should contain (hits, time) pairs');
+
+    let maxTime = 0;
+    for (let k = 1; k < profile.length; k += 2) {
+        maxTime = Math.max(maxTime, profile[k]);
+    }
+
+    const heatmap = [];
+    for (let k = 0; k < profile.length; k += 2) {
+        const hits = profile[k];
+        const time = profile[k + 1];
+        if (hits === 0) {
+            continue;
+        }
+        const level = maxTime > 0 ? Math.max(1, Math.ceil(time / maxTime * levels)) : 1;
+        heatmap.push({ line: k / 2 + 1, hits, time, level });
+    }
+    return heatmap;
+}
@@ -0,0 +1,23 @@
+import { describe, it, expect } from 'vitest';
+
+import { decimate } from '$lib/decimate.js';
+
+describe('decimate', () => {
+    it('should return the minimum and the maximum of each bucket', () => {
+        expect(decimate([3, 1, 2, 4], 2)).toEqual([1, 3, 2, 4]);
+        expect(decimate([5, 9, 1, 7, 3, 8], 3)).toEqual([5, 9, 1, 7, 3, 8]);
+    });
+
+    it('should give one bucket per element for a short list', () => {
+        expect(decimate([3, 1, 2], 512)).toEqual([3, 3, 1, 1, 2, 2]);
+    });
+
+    it('should handle a large list', () => {
+        const arr = Array.from({ length: 1000000 }, (_, i) => i);
+        const view = decimate(arr, 512);
+
+        expect(view.length).toBe(1024);
+        expect(view[0]).toBe(0);
+        expect(view[view.length - 1]).toBe(999999);
+    });
+});
@@ -1,52 +1,42 @@
 import { describe, it, expect } from 'vitest';
 
 describe('updateExecutionTime', () => {
-    it('should update the executionTime and push it to executionTimeList', () => {
+    it('should update the executionTime', () => {
         let executionTime = 0;
-        let executionTimeList = [];
 
         // Mock function to simulate the update of execution time
         // This must be a copy of the original function to ensure the validity of the test
         function updateExecutionTime(value) {
             executionTime = value;
-            executionTimeList.push(executionTime);
         }
 
         updateExecutionTime(123.45);
         expect(executionTime).toBe(123.45);
-        expect(executionTimeList).toEqual([123.45]);
 
         updateExecutionTime(67.89);
         expect(executionTime).toBe(67.89);
-        expect(executionTimeList).toEqual([123.45, 67.89]);
     });
 
     it('should handle negative values correctly', () => {
         let executionTime = 0;
-        let executionTimeList = [];
 
         function updateExecutionTime(value) {
             executionTime = value;
-            executionTimeList.push(executionTime);
         }
 
         updateExecutionTime(-50);
         expect(executionTime).toBe(-50);
-        expect(executionTimeList).toEqual([-50]);
     });
 
     it('should handle zero as a valid input', () => {
         let executionTime = 0;
-        let executionTimeList = [];
 
         function updateExecutionTime(value) {
             executionTime = value;
-            executionTimeList.push(executionTime);
         }
 
         updateExecutionTime(0);
         expect(executionTime).toBe(0);
-        expect(executionTimeList).toEqual([0]);
     });
 });
 
@@ -0,0 +1,36 @@
+import { describe, it, expect } from 'vitest';
+
+import { generateList, parseDescriptor, LIST_KINDS } from '$lib/generators.js';
+
+// The expected lists are the same as in test_generators.py, so both generators give the same lists
+describe('generateList', () => {
+    it('should generate the sorted and reversed lists', () => {
+        expect(generateList('sorted:5:0')).toEqual([1, 2, 3, 4, 5]);
+        expect(generateList('reversed:5:0')).toEqual([5, 4, 3, 2, 1]);
+    });
+
+    it('should generate the same random list as the worker', () => {
+        expect(generateList('random:10:42')).toEqual([5, 10, 3, 8, 1, 7, 4, 9, 2, 6]);
+        expect(generateList('random:100000:42').slice(0, 5)).toEqual([19151, 83735, 45567, 805, 49957]);
+    });
+
+    it('should always generate the same list for the same descriptor', () => {
+        for (const kind of LIST_KINDS) {
+            expect(generateList(`${kind}:500:3`)).toEqual(generateList(`${kind}:500:3`));
+        }
+        expect(generateList('random:500:3')).not.toEqual(generateList('random:500:4'));
+    });
+
+    it('should generate the other shapes', () => {
+        expect(new Set(generateList('few-unique:1000:42:5'))).toEqual(new Set([200, 400, 600, 800, 1000]));
+        expect(generateList('nearly-sorted:100:42:0')).toEqual(generateList('sorted:100:42'));
+        expect(generateList('organ-pipe:9:0')).toEqual([1, 3, 5, 7, 9, 8, 6, 4, 2]);
+        expect(generateList('organ-pipe:10:0')).toEqual([1, 3, 5, 7, 9, 10, 8, 6, 4, 2]);
+        expect(generateList('sawtooth:10:0:3')).toEqual([1, 2, 3, 4, 1, 2, 3, 4, 1, 2]);
+    });
+
+    it('should reject an invalid descriptor', () => {
+        expect(() => parseDescriptor('random:10')).toThrow('Invalid list descriptor');
+        expect(() => parseDescriptor('bogo:10:42')).toThrow("Unknown list kind 'bogo'");
+    });
+});
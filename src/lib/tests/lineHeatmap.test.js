@@ -0,0 +1,24 @@
+import { describe, it, expect } from 'vitest';
+
+import { lineHeatmap } from '$lib/lineHeatmap.js';
+
+describe('lineHeatmap', () => {
+    it('should give the slowest line the highest level', () => {
+        expect(lineHeatmap([1, 0.1, 0, 0, 10, 0.5], 5)).toEqual([
+            { line: 1, hits: 1, time: 0.1, level: 1 },
+            { line: 3, hits: 10, time: 0.5, level: 5 },
+        ]);
+    });
+
+    it('should skip the lines which were not executed', () => {
+        expect(lineHeatmap([0, 0, 0, 0], 5)).toEqual([]);
+        expect(lineHeatmap([], 5)).toEqual([]);
+    });
+
+    it('should give the lowest level to the lines without measurable time', () => {
+        expect(lineHeatmap([2, 0, 3, 0], 5)).toEqual([
+            { line: 1, hits: 2, time: 0, level: 1 },
+            { line: 2, hits: 3, time: 0, level: 1 },
+        ]);
+    });
+});
@@ -0,0 +1,21 @@
+import { describe, it, expect } from 'vitest';
+
+import { unsortedLists } from '$lib/unsortedLists.js';
+import { generateList } from '$lib/generators.js';
+
+describe('unsortedLists', () => {
+    it('should generate the large lists only when their value is read', () => {
+        const large = unsortedLists.filter((list) => list.descriptor !== undefined);
+        expect(large.length).toBeGreaterThan(0);
+        large.forEach((list) => {
+            expect(typeof Object.getOwnPropertyDescriptor(list, 'value').get).toBe('function');
+        });
+    });
+
+    it('should generate a large list once, from its descriptor', () => {
+        const list = unsortedLists.find((list) => list.descriptor === 'sawtooth:100000:42');
+        const value = list.value;
+        expect(value).toEqual(generateList(list.descriptor));
+        expect(list.value).toBe(value);
+    });
+});
@@ -1,4 +1,8 @@
+import { generateList } from '$lib/generators.js';
+
 // Initialise unsorted lists for the sorting algorithms
+// The large lists are generated from their descriptor (see generators.js), which is sent to the worker instead of the list.
+// They are only generated when their value is first read (see lazyList), e.g. when they are selected
 export const unsortedLists = [
     {
         name: 'Random List',
@@ -23,5 +27,47 @@ export const unsortedLists = [
     {
         name: 'ZigZag List',
         value: [1, 100, 3, 98, 5, 96, 7, 94, 9, 92, 11, 90, 13, 88, 15, 86, 17, 84, 19, 82, 21, 80, 23, 78, 25, 76, 27, 74, 29, 72, 31, 70, 33, 68, 35, 66, 37, 64, 39, 62, 41, 60, 43, 58, 45, 56, 47, 54, 49, 52, 51, 50, 53, 48, 55, 46, 57, 44, 59, 42, 61, 40, 63, 38, 65, 36, 67, 34, 69, 32, 71, 30, 73, 28, 75, 26, 77, 24, 79, 22, 81, 20, 83, 18, 85, 16, 87, 14, 89, 12, 91, 10, 93, 8, 95, 6, 97, 4, 99, 2]
+    },
+    {
+        name: 'Large Random List (100 000 elements)',
+        descriptor: 'random:100000:42'
+    },
+    {
+        name: 'Huge Random List (1 000 000 elements)',
+        descriptor: 'random:1000000:42'
+    },
+    {
+        name: 'Large Few Unique List (100 000 elements)',
+        descriptor: 'few-unique:100000:42'
+    },
+    {
+        name: 'Large Nearly Sorted List (100 000 elements)',
+        descriptor: 'nearly-sorted:100000:42'
+    },
+    {
+        name: 'Large Organ Pipe List (100 000 elements)',
+        descriptor: 'organ-pipe:100000:42'
+    },
+    {
+        name: 'Large Sawtooth List (100 000 elements)',
+        descriptor: 'sawtooth:100000:42'
     }
-];
\ No newline at end of file
+].map((list) => list.descriptor ? lazyList(list) : list);
+
+/**
+ * Generate the value of a list from its descriptor, the first time it is read
+ * @param {{name: string, descriptor: string}} list - The list, without its value
+ * @returns {{name: string, descriptor: string, value: number[]}} The list, whose value is generated once, on demand
+ */
+function lazyList(list) {
+    let value = null;
+    return {
+        ...list,
+        get value() {
+            if (value === null) {
+                value = generateList(list.descriptor);
+            }
+            return value;
+        }
+    };
+}
@@ -0,0 +1,151 @@
+from array import array
+
+# Kinds of generated lists, see generate_list
+LIST_KINDS = {'sorted', 'reversed', 'random', 'few-unique', 'nearly-sorted', 'organ-pipe', 'sawtooth'}
+
+# Default parameter of the kinds which take one (number of distinct values, of swaps, or of teeth)
+DEFAULT_FEW_UNIQUE_VALUES = 8
+DEFAULT_NEARLY_SORTED_SWAPS_RATIO = 0.01
+DEFAULT_SAWTOOTH_TEETH = 8
+
+# Largest generated list, to keep the memory of the worker reasonable
+MAX_GENERATED_SIZE = 10_000_000
+
+class LinearCongruentialGenerator:
+    '''
+    Pseudo-random generator, giving the same numbers as LinearCongruentialGenerator in generators.js for the same seed
+    
+    Attributes:
+    -----------
+    state: The current state, a 32-bit unsigned integer (int)
+    
+    Note:
+    -----
+    state = (state * 1103515245 + 12345) mod 2^32, as Math.imul(state, 1103515245) + 12345 >>> 0 in JavaScript.
+    '''
+    def __init__(self, seed : int):
+        assert isinstance(seed, int) and seed >= 0, f"Expected non-negative int, got {seed}, in LinearCongruentialGenerator"
+        self.state = seed & 0xFFFFFFFF
+    
+    def next(self) -> int:
+        '''
+        Returns the next state of the generator
+        
+        Return:
+        -------
+        state: A 32-bit unsigned integer (int)
+        '''
+        self.state = (self.state * 1103515245 + 12345) & 0xFFFFFFFF
+        return self.state
+    
+    def below(self, bound : int) -> int:
+        '''
+        Returns a pseudo-random integer in [0, bound)
+        
+        Parameters:
+        -----------
+        bound: The exclusive upper bound (int)
+        
+        Return:
+        -------
+        value: The high halves of the next two states, as a 32-bit integer, modulo bound (int)
+        
+        Note:
+        -----
+        The low bits of a linear congruential generator have a short period (the lowest bit alternates), so they
+        are dropped. Only the Fisher-Yates shuffle uses the whole state, as the former shuffledList of unsortedLists.js.
+        '''
+        high = self.next() >> 16
+        return ((high << 16) | (self.next() >> 16)) % bound
+
+def parse_descriptor(descriptor : str) -> tuple:
+    '''
+    Parses a descriptor of a generated list
+    
+    Parameters:
+    -----------
+    descriptor: "kind:n:seed" or "kind:n:seed:parameter", e.g. "nearly-sorted:1000:42:10" (str)
+    
+    Return:
+    -------
+    (kind, n, seed, parameter): The parameter is None when it is not given (tuple)
+    
+    Raises:
+    -------
+    Exception: If the descriptor is malformed, or its kind is unknown
+    '''
+    assert isinstance(descriptor, str), f"Expected str, got {type(descriptor)}, in parse_descriptor"
+    
+    # str.isdigit also accepts the other Unicode digits, e.g. "²", which int() rejects or reads as another number
+    fields = descriptor.split(':')
+    if len(fields) not in (3, 4) or not all(field.isascii() and field.isdigit() for field in fields[1:]):
+        raise Exception(f"Invalid list descriptor '{descriptor}', expected 'kind:n:seed' or 'kind:n:seed:parameter'")
+    
+    kind, n, seed = fields[0], int(fields[1]), int(fields[2])
+    parameter = int(fields[3]) if len(fields) == 4 else None
+    if kind not in LIST_KINDS:
+        raise Exception(f"Unknown list kind '{kind}', expected one of {', '.join(sorted(LIST_KINDS))}")
+    if not 0 < n <= MAX_GENERATED_SIZE:
+        raise Exception(f"Invalid list size {n}, expected between 1 and {MAX_GENERATED_SIZE}")
+    
+    return (kind, n, seed, parameter)
+
+def generate_list(descriptor : str) -> array:
+    '''
+    Generates the list described by a descriptor, always the same for the same descriptor
+    
+    Parameters:
+    -----------
+    descriptor: "kind:n:seed" or "kind:n:seed:parameter" (str), the kinds being:
+        - "sorted": 1, 2, ..., n
+        - "reversed": n, n - 1, ..., 1
+        - "random": a shuffle of 1, 2, ..., n
+        - "few-unique": n values drawn among parameter distinct values (default = DEFAULT_FEW_UNIQUE_VALUES)
+        - "nearly-sorted": 1, 2, ..., n with parameter random swaps (default = 1% of n)
+        - "organ-pipe": the odd numbers in increasing order, then the even numbers in decreasing order
+        - "sawtooth": parameter increasing runs (default = DEFAULT_SAWTOOTH_TEETH)
+    
+    Return:
+    -------
+    myList: The generated list, as an array of 64-bit integers (array)
+    
+    Raises:
+    -------
+    Exception: If the descriptor is malformed, or its kind is unknown (see parse_descriptor)
+    
+    Note:
+    -----
+    The same algorithms are implemented in generators.js, so the main thread can display the list while only the
+    descriptor is sent to the worker. The seed is ignored by the kinds which are not random.
+    '''
+    kind, n, seed, parameter = parse_descriptor(descriptor)
+    generator = LinearCongruentialGenerator(seed)
+    
+    if kind == 'few-unique':
+        values = parameter if parameter else DEFAULT_FEW_UNIQUE_VALUES
+        step = max(n // values, 1)
+        return array('q', ((generator.below(values) + 1) * step for _ in range(n)))
+    
+    if kind == 'organ-pipe':
+        return array('q', list(range(1, n + 1, 2)) + list(range(n - n % 2, 0, -2)))
+    
+    if kind == 'sawtooth':
+        teeth = parameter if parameter else DEFAULT_SAWTOOTH_TEETH
+        width = -(-n // teeth)
+        return array('q', (i % width + 1 for i in range(n)))
+    
+    myList = array('q', range(1, n + 1))
+    if kind == 'reversed':
+        myList.reverse()
+    elif kind == 'random':
+        # Fisher-Yates shuffle, the large lists stay the same as before the generators
+        for i in range(n - 1, 0, -1):
+            j = generator.next() % (i + 1)
+            myList[i], myList[j] = myList[j], myList[i]
+    elif kind == 'nearly-sorted':
+        swaps = parameter if parameter is not None else max(int(n * DEFAULT_NEARLY_SORTED_SWAPS_RATIO), 1)
+        for _ in range(swaps):
+            i, j = generator.below(n), generator.below(n)
+            myList[i], myList[j] = myList[j], myList[i]
+    
+    return myList
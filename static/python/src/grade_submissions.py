@@ -0,0 +1,164 @@
+import argparse, json, os, sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from .run_submission import run_submission, SANDBOX_WARNING
+    from . import worker
+except ImportError:
+    # Executed as a script: python3 static/python/src/grade_submissions.py
+    from run_submission import run_submission, SANDBOX_WARNING
+    import worker
+
+# Default configuration of the grading
+GRADING_DESCRIPTORS = ["random:1000:42", "reversed:1000:0", "few-unique:1000:42", "nearly-sorted:1000:42"]
+GRADING_OPERATION_BUDGET = 2_000_000    # Maximum number of operations of an execution
+GRADING_TIMEOUT = 10.0                  # Maximum duration of an execution (in seconds)
+
+def findSubmissions(directory : str) -> list:
+    '''
+    Finds the submissions of a directory
+    
+    Parameters:
+    -----------
+    directory: The directory of the submissions, one Python file per submission (str)
+    
+    Return:
+    -------
+    paths: The paths of the Python files of the directory, sorted by name (list)
+    '''
+    assert os.path.isdir(directory), f"Directory {directory} not found, in findSubmissions"
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".py"))
+
+def newRecord(path : str, descriptor : str) -> dict:
+    '''
+    Creates the result of an execution, before the execution
+    
+    Parameters:
+    -----------
+    path: The Python file of the submission (str)
+    descriptor: The descriptor of the list (str)
+    
+    Return:
+    -------
+    record: submission, list, passed (False), time, compares, swaps, reads, writes and error (None) (dict)
+    '''
+    return {"submission": os.path.basename(path), "list": descriptor, "passed": False, "time": None,
+            "compares": None, "swaps": None, "reads": None, "writes": None, "error": None}
+
+def gradeRun(path : str, descriptor : str, maxOperations : int, timeout : float) -> dict:
+    '''
+    Executes a submission on a list, in a process of the pool
+    
+    Parameters:
+    -----------
+    path: The Python file of the submission (str)
+    descriptor: The descriptor of the list, see generate_list (str)
+    maxOperations: The maximum number of operations, 0 if unlimited (int)
+    timeout: The time budget, in seconds, 0 if unlimited (float)
+    
+    Return:
+    -------
+    record: The result of the execution, see newRecord, whose error is None if the submission was executed,
+    even when it did not sort the list (dict)
+    
+    Note:
+    -----
+    The code is checked by check_node before its execution, as in the browser (see compileUserCode), but it is not
+    sandboxed (see SANDBOX_WARNING). The execution is timed, without recording the trace, which is not needed here.
+    '''
+    record = newRecord(path, descriptor)
+    
+    try:
+        with open(path, encoding="utf-8") as file:
+            code = file.read()
+    except (OSError, UnicodeDecodeError) as e:
+        record["error"] = f"The submission can not be read: {e}"
+        return record
+    
+    result = run_submission(code, descriptor, worker.TIMED_MODE, maxOperations, timeout)
+    if "error" in result:
+        record["error"] = result["error"]
+        return record
+    
+    record.update({field: result[field] for field in ("time", "compares", "swaps", "reads", "writes")})
+    record["passed"] = result["sorted"]
+    return record
+
+def grade_submissions(directory : str, output, descriptors : list = GRADING_DESCRIPTORS, workers : int = None,
+                      maxOperations : int = GRADING_OPERATION_BUDGET, timeout : float = GRADING_TIMEOUT) -> dict:
+    '''
+    Executes every submission of a directory on every list, in parallel, and writes the results as JSON lines
+    
+    Parameters:
+    -----------
+    directory: The directory of the submissions, one Python file per submission (str)
+    output: The file where the results are written, one JSON object per line (file object)
+    descriptors: The descriptors of the lists (list) (default = GRADING_DESCRIPTORS)
+    workers: The number of processes, None for the number of processors (int) (default = None)
+    maxOperations: The maximum number of operations of an execution, 0 if unlimited (int) (default = GRADING_OPERATION_BUDGET)
+    timeout: The time budget of an execution, in seconds, 0 if unlimited (float) (default = GRADING_TIMEOUT)
+    
+    Return:
+    -------
+    summary: The number of executions which passed, which failed (list not sorted) and which ended with an error (dict)
+    
+    Note:
+    -----
+    The results are written as soon as each execution ends, so their order is not the order of the submissions.
+    A process which dies (e.g. out of memory) only fails its own executions: they are written with an error.
+    '''
+    assert len(descriptors) > 0, "At least one list is needed, in grade_submissions"
+    summary = {"passed": 0, "failed": 0, "errors": 0}
+    submissions = findSubmissions(directory)
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(gradeRun, path, descriptor, maxOperations, timeout): (path, descriptor)
+                   for path in submissions for descriptor in descriptors}
+        
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                # The process of the execution died, the pool may be broken for the remaining executions too
+                record = newRecord(*futures[future])
+                record["error"] = f"The execution crashed: {e!r}"
+            
+            summary["errors" if record["error"] is not None else "passed" if record["passed"] else "failed"] += 1
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+    
+    return summary
+
+def main(argv : list = None) -> int:
+    '''
+    Grades a directory of submissions from the command line, see --help
+    
+    Parameters:
+    -----------
+    argv: The arguments, without the name of the program, None for sys.argv (list) (default = None)
+    
+    Return:
+    -------
+    status: 0 if every execution passed, 1 otherwise (int)
+    '''
+    parser = argparse.ArgumentParser(description="Executes every sorting submission of a directory on several lists, in parallel, and writes the results as JSON lines.", epilog=SANDBOX_WARNING)
+    parser.add_argument("directory", help="the directory of the submissions, one Python file per submission")
+    parser.add_argument("--output", default="-", help="the JSONL file of the results (default: the standard output)")
+    parser.add_argument("--list", action="append", dest="lists", help="the descriptor of a list, kind:n:seed[:parameter], can be repeated (default: " + ", ".join(GRADING_DESCRIPTORS) + ")")
+    parser.add_argument("--workers", type=int, default=None, help="the number of processes (default: the number of processors)")
+    parser.add_argument("--max-operations", type=int, default=GRADING_OPERATION_BUDGET, help=f"the maximum number of operations of an execution (default: {GRADING_OPERATION_BUDGET})")
+    parser.add_argument("--timeout", type=float, default=GRADING_TIMEOUT, help=f"the time budget of an execution, in seconds (default: {GRADING_TIMEOUT})")
+    args = parser.parse_args(argv)
+    
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        summary = grade_submissions(args.directory, output, args.lists or GRADING_DESCRIPTORS, args.workers, args.max_operations, args.timeout)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    print(f"{summary['passed']} passed, {summary['failed']} failed, {summary['errors']} errors", file=sys.stderr)
+    return 0 if summary["failed"] == summary["errors"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,310 @@
 from pyscript import document, window, PyWorker     # type: ignore
 import pyodide                                      # type: ignore
+import asyncio, json, math, time
+from array import array
+from collections import deque
+
+# Configuration of the worker pool
+MAX_POOL_SIZE = 2               # Maximum number of workers alive at the same time
+WORKER_IDLE_TIMEOUT = 300       # Time (in seconds) after which an idle worker is terminated
+KEEP_WARM_WORKERS = 1           # Number of idle workers kept alive after WORKER_IDLE_TIMEOUT, already initialized
+BOOT_RETRIES = 2                # Number of times a worker which did not start is started again
+
+# Phases of the boot of a worker, measured by WorkerPool.boot (see bootPhases). The packages of pyscript.json are
+# loaded with the interpreter, before worker.py starts, so they can not be measured apart from it
+BOOT_PHASES = ["interpreter and packages", "imports", "module", "sync wiring"]
+
+# Budget of an execution, after which it is interrupted (see runInWorker and cancelExecution)
+EXECUTION_TIME_BUDGET = 60          # Maximum duration of a call to the worker (in seconds)
+OPERATION_BUDGET = 10_000_000       # Maximum number of compare, swap, get and set calls of a recorded execution
+INTERRUPT_GRACE_PERIOD = 2          # Time (in seconds) left to an interrupted worker to stop, before it is terminated
+SIGINT = 2                          # Signal written in the interrupt buffer of the worker
+
+# Execution mode giving both the execution time and the trace of the operations (see worker.py)
+RECORDED_MODE = "recorded"
+
+# Execution mode of the large lists, giving the execution time and downsampled views of the list (see worker.py)
+DECIMATED_MODE = "decimated"
+LARGE_LIST_THRESHOLD = 2_000    # Same value as LARGE_LIST_THRESHOLD in decimate.js
+
+# Configuration of the benchmark (see benchmark_code in worker.py)
+BENCHMARK_RUNS = 20
+BENCHMARK_WARMUPS = 3
+BENCHMARK_LABELS = ["Min", "Median", "Mean", "Standard Deviation", "P95", "95% CI (low)", "95% CI (high)", "Runs"]
+OVERHEAD_PRIMITIVES = ["compare", "swap", "get", "set"]
+
+# Complexity classes, by upper bound of the estimated exponent (see scaling_code in worker.py)
+COMPLEXITY_CLASSES = [(0.5, "O(1)"), (1.08, "O(n)"), (1.4, "O(n log n)"), (2.3, "O(n²)"), (3.3, "O(n³)")]
+
+# Operations of the trace recorded by the worker (see worker.py)
+TRACE_COMPARE = 0
+TRACE_SWAP = 1
+TRACE_READ = 2      # (TRACE_READ, i, i)
+TRACE_WRITE = 3     # (TRACE_WRITE, i, value)
+
+# Configuration of the replay of the trace (see replayTrace)
+COMPARE_DURATION_RATIO = 0.1        # A compare is displayed 10 times shorter than a swap
+MAX_OPERATIONS_PER_FRAME = 50_000   # Maximum number of operations replayed during a single animation frame
+
+# Configuration of the race mode (see startRace)
+MAX_RACE_SIZE = 4                   # Maximum number of codes executed at the same time
+RACE_DURATION = 10                  # Duration (in seconds) of the replay of the longest trace
+
+class WorkerPool:
+    '''
+    Pool of pre-warmed workers, used to execute the user's code
+    
+    Attributes:
+    -----------
+    size: The maximum number of workers alive at the same time (int)
+    idleTimeout: The time (in seconds) after which an idle worker is terminated (float)
+    keepWarm: The number of idle workers which are not terminated after idleTimeout (int)
+    idle: The ready workers, with the timer that will terminate them (list)
+    booting: The number of workers currently starting (int)
+    busy: The number of workers currently handed out (int)
+    waiters: The futures waiting for a ready worker (list)
+    bootStats: The statistics of the boot durations of the workers, in seconds (RunningStats)
+    
+    Note:
+    -----
+    Starting a worker means loading Pyodide and worker.py, which takes most of the time of an execution.
+    The pool starts its workers in the background when the page is loaded, hands out a ready worker for each run,
+    and takes it back afterwards. A worker is only replaced when it crashed or was killed.
+    Pyodide can not start a PyWorker from a memory snapshot, so the initialized workers are kept instead: the last
+    keepWarm idle workers are never terminated, and a run after a long pause does not wait for a new worker.
+    '''
+    def __init__(self, size : int = MAX_POOL_SIZE, idleTimeout : float = WORKER_IDLE_TIMEOUT, keepWarm : int = KEEP_WARM_WORKERS):
+        assert isinstance(size, int) and size > 0, f"Expected positive int, got {size}, in WorkerPool"
+        assert idleTimeout > 0, f"Expected positive timeout, got {idleTimeout}, in WorkerPool"
+        assert isinstance(keepWarm, int) and keepWarm >= 0, f"Expected non-negative int, got {keepWarm}, in WorkerPool"
+        
+        self.size = size
+        self.idleTimeout = idleTimeout
+        self.keepWarm = keepWarm
+        self.idle = []
+        self.booting = 0
+        self.busy = 0
+        self.waiters = []
+        self.bootStats = RunningStats()
+    
+    def fail(self, error : Exception):
+        '''
+        Rejects the runs waiting for a worker, once no worker is starting anymore
+        
+        Parameters:
+        -----------
+        error: The error of the last boot (Exception)
+        '''
+        if self.booting > 0:
+            return
+        
+        while self.waiters:
+            future = self.waiters.pop(0)
+            if not future.done():
+                future.set_exception(error)
+    
+    def prewarm(self):
+        '''
+        Starts, in the background, as many workers as needed to fill the pool
+        '''
+        missing = self.size - (len(self.idle) + self.booting + self.busy)
+        for _ in range(missing):
+            self.booting += 1
+            asyncio.ensure_future(self.boot())
+    
+    async def boot(self, attempt : int = 0):
+        '''
+        Starts a new worker and offers it to the pool once it is ready
+        
+        Parameters:
+        -----------
+        attempt: The number of failed boots before this one (int) (default = 0)
+        
+        Note:
+        -----
+        The duration of each phase of the boot (see bootPhases) is logged in the console and displayed under the stats.
+        A worker which did not start is terminated, and started again at most BOOT_RETRIES times. After that, the runs
+        waiting for a worker are rejected with the error if no other worker is starting (see fail).
+        '''
+        worker = None
+        try:
+            created = time.time()
+            worker = createWorker()
+            await worker.ready
+            if worker.interruptBuffer is None or not await worker.sync.set_interrupt_buffer(worker.interruptBuffer):
+                window.console.log("⚠️ Interrupt buffer not available, a cancelled execution will restart the worker")
+            phases = bootPhases(created, list(await worker.sync.boot_times()), time.time())
+        except Exception as e:
+            window.console.log("❌ Worker did not start properly : " + str(e))
+            if worker is not None:
+                worker.terminate()
+            if attempt < BOOT_RETRIES:
+                # The worker is still counted as booting
+                asyncio.ensure_future(self.boot(attempt + 1))
+                return
+            self.booting -= 1
+            self.fail(e)
+            return
+        
+        self.booting -= 1
+        self.bootStats.push(sum(phases))
+        report = formatBoot(phases, self.bootStats)
+        window.console.log("🚀 Worker started in " + report)
+        window.updateWorkerBoot(report)
+        self.offer(worker)
+    
+    def resize(self, size : int):
+        '''
+        Changes the maximum number of workers alive at the same time
+        
+        Parameters:
+        -----------
+        size: The new maximum number of workers (int)
+        
+        Note:
+        -----
+        The missing workers are started in the background. When the pool shrinks, the idle workers in excess
+        are terminated, and the busy ones are terminated when they are released.
+        '''
+        assert isinstance(size, int) and size > 0, f"Expected positive int, got {size}, in resize"
+        self.size = size
+        
+        while self.idle and len(self.idle) + self.booting + self.busy > self.size:
+            worker, timer = self.idle.pop(0)
+            timer.cancel()
+            worker.terminate()
+        self.prewarm()
+    
+    def offer(self, worker):
+        '''
+        Gives a ready worker to the first waiting run, or keeps it idle in the pool
+        
+        Parameters:
+        -----------
+        worker: The ready worker (PyWorker)
+        '''
+        while self.waiters:
+            future = self.waiters.pop(0)
+            if not future.done():
+                self.busy += 1
+                future.set_result(worker)
+                return
+        
+        timer = asyncio.get_event_loop().call_later(self.idleTimeout, self.expire, worker)
+        self.idle.append((worker, timer))
+    
+    def expire(self, worker):
+        '''
+        Terminates a worker which stayed idle for too long, unless it is one of the last keepWarm idle workers
+        
+        Parameters:
+        -----------
+        worker: The idle worker (PyWorker)
+        '''
+        if len(self.idle) <= self.keepWarm:
+            return
+        
+        for entry in self.idle:
+            if entry[0] is worker:
+                self.idle.remove(entry)
+                worker.terminate()
+                return
+    
+    async def acquire(self):
+        '''
+        Hands out a ready worker, waiting for one to start if needed
+        
+        Return:
+        -------
+        worker: A ready worker (PyWorker)
+        
+        Raises:
+        -------
+        Exception: If no worker could be started (see boot)
+        '''
+        if self.idle:
+            worker, timer = self.idle.pop()
+            timer.cancel()
+            self.busy += 1
+            return worker
+        
+        future = asyncio.get_event_loop().create_future()
+        self.waiters.append(future)
+        self.prewarm()
+        return await future
+    
+    async def release(self, worker, crashed : bool = False):
+        '''
+        Takes back a worker once its run is over
+        
+        Parameters:
+        -----------
+        worker: The worker handed out by acquire (PyWorker)
+        crashed: If True, the worker is terminated and replaced by a new one (bool) (default = False)
+        '''
+        assert isinstance(crashed, bool), f"Expected bool, got {type(crashed)}, in release"
+        self.busy -= 1
+        
+        if not crashed:
+            try:
+                # Clean the globals of the worker (swapCount, compareCount, timedExecution)
+                await worker.sync.reset_state()
+            except Exception as e:
+                window.console.log("❌ Worker could not be reset : " + str(e))
+                crashed = True
+        
+        if crashed:
+            worker.terminate()
+            self.prewarm()
+        elif not self.waiters and len(self.idle) + self.booting + self.busy >= self.size:
+            # The pool has been shrunk while the worker was busy (see resize)
+            worker.terminate()
+        else:
+            self.offer(worker)
+
+def bootPhases(created : float, bootTimes : list, wired : float) -> list:
+    '''
+    Computes the duration of each phase of the boot of a worker (see BOOT_PHASES)
+    
+    Parameters:
+    -----------
+    created: The creation of the PyWorker, in seconds since the epoch (float)
+    bootTimes: The start of worker.py, the end of its imports and its end, see boot_times in worker.py (list)
+    wired: The end of the boot, once the worker is ready and its interrupt buffer is set (float)
+    
+    Return:
+    -------
+    phases: The durations of the load of the interpreter and of the packages, of the imports of worker.py, of the
+    execution of the rest of worker.py and of the sync wiring, in seconds (list)
+    
+    Note:
+    -----
+    Both threads use the wall clock of the browser, whose resolution is about a millisecond, so a negative
+    duration is rounded to 0.
+    '''
+    assert len(bootTimes) == 3, f"Expected 3 timestamps, got {len(bootTimes)}, in bootPhases"
+    timestamps = [created, *bootTimes, wired]
+    return [max(0.0, end - start) for start, end in zip(timestamps, timestamps[1:])]
+
+def formatBoot(phases : list, stats : "RunningStats") -> str:
+    '''
+    Formats the boot of a worker, for the console and the stats
+    
+    Parameters:
+    -----------
+    phases: The durations of the phases of the boot, in seconds, see bootPhases (list)
+    stats: The statistics of the boot durations of the pool, including this one (RunningStats)
+    
+    Return:
+    -------
+    report: The total duration, the duration of each phase, and the mean duration of the boots (str)
+    '''
+    details = ", ".join(f"{name} {phase:.3f} s" for name, phase in zip(BOOT_PHASES, phases))
+    return f"{sum(phases):.3f} s ({details}), mean {stats.mean:.3f} s over {stats.count} start(s)"
 
 async def startWorker(event):
     '''
-    Creates a new worker to execute the user's code and returns the result
+    Takes a ready worker from the pool to execute the user's code and displays the result
     
     Parameter:
     -----------
@@ -11,7 +312,16 @@ async def startWorker(event):
     
     Note:
     ------
-    This function is called when the user clicks the "Execute code" button
+    This function is called when the user clicks the "Execute code" button.
+    The user's code is executed only once, in the recorded mode of the worker: the same execution gives
+    the execution time, the compare and swap counts, and the trace of the operations, which is replayed on the diagram.
+    The lists longer than LARGE_LIST_THRESHOLD are executed in the decimated mode: the worker keeps the list and only
+    sends downsampled views of it, displayed as they arrive (see updateDecimated).
+    When the profiling is enabled, the lines of the code are also profiled and displayed as a heatmap in the editor.
+    When the counting of the accesses is enabled, the operations per index and their rate over time are displayed
+    below the result (see formatAccesses). When the measure of the memory is enabled, the peak memory allocated by
+    the code is displayed, and the operations are not animated, as the trace would be counted in the memory.
+    These runs are not added to the statistics, nor to the execution count, as they slow the execution down.
     '''
     assert window is not None, "Window not found, in startWorker"
     window.updateInExecution(True)
@@ -27,21 +337,10 @@ async def startWorker(event):
     
     outputDiv.innerHTML = "Creating a safe place to execute your code :)"
         
-    #  Worker for the "normal" execution
-    myWorker = createWorker()
-    await myWorker.ready
-    assert myWorker.ready is not None, "Worker did not start properly, in startWorker"
-    
-    # Worker for the "measuring" execution
-    # This worker is used to measure the time taken for the execution of the user's code
-    timedWorker = createWorker()
-    await timedWorker.ready
-    assert timedWorker.ready is not None, "Timed Worker did not start properly, in startWorker"
-    
-    # Set the onmessage function for both workers
-    # This function allows to handle the messages sent by the worker
-    myWorker.onmessage = on_worker_message
-    timedWorker.onmessage = on_worker_message
+    worker = await acquireWorker(outputDiv)
+    if worker is None:
+        HandleError()
+        return
     
     arr = getArr()
     assert arr is not None, "Array not found, in startWorker"
@@ -51,47 +350,700 @@ async def startWorker(event):
     code = getCode()
     assert code is not None, "Code not found, in startWorker"
     assert isinstance(code, str), f"Expected str, got {type(code)}, in startWorker"
-
-    console.log("💨 Worker starting execution")
-    sorted_list = myWorker.sync.execute_code(code, arr, False)
     
-    console.log("💨 Timed Worker starting execution")
-    time = timedWorker.sync.execute_code(code, arr, True)
+    # The heatmap of the previous run is removed
+    profile = getProfileLines()
+    accesses = getCountAccesses()
+    memory = getMeasureMemory()
+    instrumented = profile or accesses or memory
+    showLineProfile([])
+    
+    # The list is sent once to the worker, the operations of the worker are then replayed on a local copy
+    largeList = len(arr) > LARGE_LIST_THRESHOLD
+    if not largeList:
+        startReplay(arr)
+    
+    outputDiv.innerHTML = "Executing code..."
+    console.log("💨 Worker starting execution")
     
-    time = await time
+    try:
+        if largeList:
+            result = await runInWorker(worker, "execute_code", code, toWorkerList(arr), DECIMATED_MODE, 0, profile, accesses, memory)
+        else:
+            result = await runInWorker(worker, "execute_code", code, toWorkerList(arr), RECORDED_MODE, OPERATION_BUDGET, profile, accesses, memory)
+    except (Exception, asyncio.CancelledError) as e:
+        # The worker crashed or was killed, it is replaced by a new one
+        console.log("❌ Worker crashed : " + str(e))
+        stopReplay()
+        HandleError()
+        outputDiv.innerHTML = "Something went wrong... please try again"
+        await workerPool.release(worker, crashed=True)
+        return
     
-    # Handle unexpected errors (mostly related to JSON parsing)
-    if time is None :
+    # The error message has already been displayed by on_worker_message
+    if result is None :
+        stopReplay()
         HandleError()
-        terminateWorkers(timedWorker, myWorker)
+        await workerPool.release(worker)
+        return
+    console.log("✅ Received result from Worker !")
+    
+    await workerPool.release(worker)
+    
+    result = receiveResult(result)
+    myList, time, compareCount, swapCount, readCount, writeCount = result[0], result[1], result[2], result[3], result[4], result[5]
+    
+    window.updateExecutionTime(time)
+    updateCompareCount(compareCount)
+    updateSwapCount(swapCount)
+    
+    # The optional results follow the counts, in this order, each as a list of parts (see execute_code in worker.py)
+    extras = [result[k] for k in range(6, len(result))]
+    if profile:
+        showLineProfile(extras.pop(0)[0])
+    if instrumented:
+        # The execution count must stay equal to the count of the statistics (see loadRunningStats)
+        window.decrementExecutionCount()
+    else:
+        stats = updateRunningStats(time)
+    
+    # Wait for the end of the animation
+    await waitForReplay()
+    if instrumented:
+        outputDiv.innerHTML = "Code executed successfully (instrumented, the time includes the cost of the measures)"
+    else:
+        outputDiv.innerHTML = "Code executed successfully" + formatQuantiles(stats)
+    if readCount or writeCount:
+        outputDiv.innerHTML += f"<br>{readCount} reads (get) and {writeCount} writes (set)"
+    if accesses:
+        *counters, (bucketWidth,) = extras.pop(0)
+        outputDiv.innerHTML += formatAccesses([list(map(int, values)) for values in counters] + [bucketWidth])
+    if memory:
+        extraBytes, listBytes = extras.pop(0)[0]
+        outputDiv.innerHTML += f"<br>Peak extra memory : {formatBytes(extraBytes)} (the list itself takes {formatBytes(listBytes)})"
+    
+    if largeList:
+        # The final list is also received as a downsampled view
+        updateDecimated(pyodide.ffi.to_js(myList.tolist()))
+    else:
+        # Update the final two elements of the list
+        updateList(pyodide.ffi.to_js(myList.tolist()), len(arr) - 1, len(arr), end = True)
+        
+    window.updateInExecution(False)
+    
+async def startBenchmark(event):
+    '''
+    Executes the user's code several times in a worker and displays statistics about the execution time
+    
+    Parameter:
+    -----------
+    event: Event
+    
+    Note:
+    ------
+    This function is called when the user clicks the "Benchmark" button.
+    All the executions are done in a single call to the worker (see benchmark_code in worker.py).
+    '''
+    assert window is not None, "Window not found, in startBenchmark"
+    window.updateInExecution(True)
+    
+    outputDiv = document.getElementById('output')
+    assert outputDiv is not None, "Output div not found, in startBenchmark"
+    outputDiv.innerHTML = f"Benchmarking your code ({BENCHMARK_WARMUPS} warm-up runs, {BENCHMARK_RUNS} measured runs)..."
+    
+    worker = await acquireWorker(outputDiv)
+    if worker is None:
+        window.updateInExecution(False)
+        return
+    
+    try:
+        summary = await runInWorker(worker, "benchmark_code", getCode(), toWorkerList(getArr()), BENCHMARK_RUNS, BENCHMARK_WARMUPS)
+        # The costs of the primitives only depend on the worker, they are measured once per worker
+        if worker.primitiveCosts is None:
+            worker.primitiveCosts = list(await worker.sync.benchmark_primitives())
+        primitives = worker.primitiveCosts
+    except (Exception, asyncio.CancelledError) as e:
+        # The worker crashed or was killed, it is replaced by a new one
+        window.console.log("❌ Worker crashed : " + str(e))
+        outputDiv.innerHTML = "Something went wrong... please try again"
+        await workerPool.release(worker, crashed=True)
+        window.updateInExecution(False)
+        return
+    
+    await workerPool.release(worker)
+    window.updateInExecution(False)
+    
+    # The error message has already been displayed by on_worker_message
+    if summary is None:
+        return
+    
+    summary = list(summary)
+    fieldCount = len(BENCHMARK_LABELS)
+    overheads = summary[2 * fieldCount:2 * fieldCount + len(OVERHEAD_PRIMITIVES)]
+    outputDiv.innerHTML = formatBenchmark(summary[:fieldCount], summary[fieldCount:2 * fieldCount], overheads, bool(summary[-1]))
+    
+    checkedCompare, fastCompare, checkedSwap, fastSwap = primitives
+    window.console.log(f"⏱️ compare : {checkedCompare:.0f} ns (checked), {fastCompare:.0f} ns (fast) per call")
+    window.console.log(f"⏱️ swap : {checkedSwap:.0f} ns (checked), {fastSwap:.0f} ns (fast) per call")
+
+def formatBenchmark(summary : list, correctedSummary : list, overheads : list, reliable : bool) -> str:
+    '''
+    Formats the statistics returned by the benchmark as an HTML table
+    
+    Parameters:
+    -----------
+    summary: The statistics of the raw times, in the order of BENCHMARK_LABELS (list)
+    correctedSummary: The statistics of the overhead-corrected times, in the order of BENCHMARK_LABELS (list)
+    overheads: The overhead of one call of each primitive of OVERHEAD_PRIMITIVES, in nanoseconds (list)
+    reliable: If False, the correction would give negative times and the corrected column is not shown (bool)
+    
+    Return:
+    -------
+    table: The HTML table (str)
+    '''
+    assert len(summary) == len(BENCHMARK_LABELS), f"Expected {len(BENCHMARK_LABELS)} values, got {len(summary)}, in formatBenchmark"
+    assert len(correctedSummary) == len(BENCHMARK_LABELS), f"Expected {len(BENCHMARK_LABELS)} values, got {len(correctedSummary)}, in formatBenchmark"
+    assert len(overheads) == len(OVERHEAD_PRIMITIVES), f"Expected {len(OVERHEAD_PRIMITIVES)} overheads, got {len(overheads)}, in formatBenchmark"
+    
+    rows = "<tr><th></th><th>Raw</th><th>Corrected</th></tr>"
+    for label, value, corrected in zip(BENCHMARK_LABELS, summary, correctedSummary):
+        if label == "Runs":
+            rows += f"<tr><td>{label}</td><td>{int(value)}</td><td>{int(corrected)}</td></tr>"
+        elif reliable:
+            rows += f"<tr><td>{label}</td><td>{value:.6f} s</td><td>{corrected:.6f} s</td></tr>"
+        else:
+            rows += f"<tr><td>{label}</td><td>{value:.6f} s</td><td>-</td></tr>"
+    
+    estimates = ", ".join(f"{overhead:.0f} ns per {name}" for name, overhead in zip(OVERHEAD_PRIMITIVES, overheads))
+    if reliable:
+        caption = f"Corrected: minus the estimated overhead, {estimates}"
+    else:
+        caption = f"Correction unreliable, the estimated overhead ({estimates}) is negative or larger than a measured time"
+    
+    return f"<table class='table table-xs sm:table-sm mx-auto'><caption>{caption}</caption><tbody>{rows}</tbody></table>"
+
+async def startScaling(event):
+    '''
+    Executes the user's code on lists of increasing sizes in a worker, and displays its estimated complexity
+    
+    Parameter:
+    -----------
+    event: Event
+    
+    Note:
+    ------
+    This function is called when the user clicks the "Complexity" button (see scaling_code in worker.py).
+    '''
+    assert window is not None, "Window not found, in startScaling"
+    window.updateInExecution(True)
+    
+    outputDiv = document.getElementById('output')
+    assert outputDiv is not None, "Output div not found, in startScaling"
+    outputDiv.innerHTML = "Estimating the complexity of your code, on lists of increasing sizes..."
+    
+    worker = await acquireWorker(outputDiv)
+    if worker is None:
+        window.updateInExecution(False)
+        return
+    
+    try:
+        results = await runInWorker(worker, "scaling_code", getCode())
+    except (Exception, asyncio.CancelledError) as e:
+        # The worker crashed or was killed, it is replaced by a new one
+        window.console.log("❌ Worker crashed : " + str(e))
+        outputDiv.innerHTML = "Something went wrong... please try again"
+        await workerPool.release(worker, crashed=True)
+        window.updateInExecution(False)
+        return
+    
+    await workerPool.release(worker)
+    window.updateInExecution(False)
+    
+    # The error message has already been displayed by on_worker_message
+    if results is None:
+        return
+    
+    outputDiv.innerHTML = formatScaling(results.to_py() if isinstance(results, pyodide.ffi.JsProxy) else results)
+
+def formatScaling(results : list) -> str:
+    '''
+    Formats the results of the scaling benchmark as an HTML table
+    
+    Parameters:
+    -----------
+    results: For each shape, [shape, sizes, times, compareCounts, swapCounts, timeExponent, timeR2, nlognR2, operationExponent] (list)
+    
+    Return:
+    -------
+    table: The HTML table (str)
+    '''
+    rows = ""
+    for shape, sizes, times, _, _, timeExponent, timeR2, nlognR2, operationExponent in results:
+        rows += (
+            f"<tr><td>{shape}</td><td>{sizes[0]} - {sizes[-1]}</td>"
+            f"<td>{timeExponent:.2f} (R² = {timeR2:.3f})</td><td>{nlognR2:.3f}</td>"
+            f"<td>{operationExponent:.2f}</td><td>{classifyComplexity(operationExponent)}</td></tr>"
+        )
+    
+    head = "<tr><th>List</th><th>Sizes</th><th>Time exponent</th><th>n log n R²</th><th>Operations exponent</th><th>Estimation</th></tr>"
+    return f"<table class='table table-xs sm:table-sm mx-auto'><thead>{head}</thead><tbody>{rows}</tbody></table>"
+
+def formatAccesses(counters : list) -> str:
+    '''
+    Formats the counters of the operations as two heatmaps of the indices and a chart of the rate over time
+    
+    Parameters:
+    -----------
+    counters: [compares, writes, timelineCompares, timelineSwaps, bucketWidth], the compares including the reads and
+    the swaps including the writes (see AccessCounters in worker.py) (list)
+    
+    Return:
+    -------
+    charts: The HTML of the charts, as inline SVG (str)
+    
+    Note:
+    -----
+    The opacity of each index is proportional to its number of operations, relative to the most used index.
+    The chart gives the number of compares and swaps per second of each time bucket of the execution.
+    '''
+    compares, writes, timelineCompares, timelineSwaps, bucketWidth = counters
+    assert len(compares) == len(writes), "Expected as many compare and write counters, in formatAccesses"
+    
+    def heatmap(values, label):
+        peak = max(max(values), 1)
+        cells = "".join(f"<rect x='{i}' width='1' height='1' fill='#B40000' fill-opacity='{value / peak:.3f}'/>" for i, value in enumerate(values) if value)
+        return f"<p class='text-xs'>{label} per index (max {peak})</p><svg viewBox='0 0 {len(values)} 1' preserveAspectRatio='none' class='w-full h-4 border'>{cells}</svg>"
+    
+    def polyline(values, peak, color):
+        points = " ".join(f"{k + 0.5},{peak - value}" for k, value in enumerate(values))
+        return f"<polyline points='{points}' fill='none' stroke='{color}' stroke-width='1' vector-effect='non-scaling-stroke'/>"
+    
+    peak = max(max(timelineCompares), max(timelineSwaps), 1)
+    chart = (
+        f"<p class='text-xs'>Compares and reads (red), swaps and writes (blue) per second, over {len(timelineCompares) * bucketWidth:.3f} s (max {peak / bucketWidth:.0f})</p>"
+        f"<svg viewBox='0 0 {len(timelineCompares)} {peak}' preserveAspectRatio='none' class='w-full h-16 border'>"
+        f"{polyline(timelineCompares, peak, '#B40000')}{polyline(timelineSwaps, peak, '#0050B4')}</svg>"
+    )
+    return f"<div class='mt-2'>{heatmap(compares, 'Compares and reads')}{heatmap(writes, 'Writes')}{chart}</div>"
+
+def formatBytes(size : int) -> str:
+    '''
+    Formats a memory size with its unit
+    
+    Parameters:
+    -----------
+    size: The size, in bytes (int)
+    
+    Return:
+    -------
+    text: The size, e.g. "1.5 KiB" (str)
+    '''
+    for unit in ["B", "KiB", "MiB"]:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+def classifyComplexity(exponent : float) -> str:
+    '''
+    Returns the complexity class corresponding to an estimated exponent
+    
+    Parameters:
+    -----------
+    exponent: The exponent k of the power-law fit c * n^k (float)
+    
+    Return:
+    -------
+    complexity: The complexity class, e.g. "O(n log n)" (str)
+    '''
+    for bound, complexity in COMPLEXITY_CLASSES:
+        if exponent < bound:
+            return complexity
+    return f"O(n^{exponent:.1f})"
+
+# Race between the saved codes
+
+async def startRace(event):
+    '''
+    Executes the saved codes at the same time, each in its own worker, on the same list, and compares them
+    
+    Parameter:
+    -----------
+    event: Event
+    
+    Note:
+    ------
+    This function is called when the user clicks the "Race" button. The codes are the ones saved in the localStorage
+    ("Code-1", "Code-2", ..., see getSavedCodes), at most MAX_RACE_SIZE. Each code is executed once, in the recorded
+    mode, on its own worker. The times, compare counts and swap counts are displayed in a table, then the traces are
+    replayed side by side at the same number of operations per frame: the code with the fewest operations finishes first.
+    The workers share the cores of the computer, so the times are only indicative, the counts are exact.
+    '''
+    assert window is not None, "Window not found, in startRace"
+    
+    outputDiv = document.getElementById('output')
+    assert outputDiv is not None, "Output div not found, in startRace"
+    
+    codes = getSavedCodes()[:MAX_RACE_SIZE]
+    if len(codes) < 2:
+        outputDiv.innerHTML = "Write at least two codes to start a race"
+        return
+    
+    arr = getArr()
+    assert len(arr) > 0, "Array is empty, in startRace"
+    if len(arr) > LARGE_LIST_THRESHOLD:
+        outputDiv.innerHTML = f"A race is only available for lists of at most {LARGE_LIST_THRESHOLD} elements"
+        return
+    
+    window.updateInExecution(True)
+    outputDiv.innerHTML = f"Racing {len(codes)} codes on the same list..."
+    
+    # One worker per code, the pool gets back to its usual size after the race
+    workerPool.resize(max(MAX_POOL_SIZE, len(codes)))
+    try:
+        results = await asyncio.gather(*(runRacer(code, arr) for _, code in codes))
+    finally:
+        workerPool.resize(MAX_POOL_SIZE)
+    
+    names = [name for name, _ in codes]
+    values = arr.to_py()
+    lanes = [RaceLane(name, values, result[5]) for name, result in zip(names, results) if result is not None]
+    
+    outputDiv.innerHTML = formatRace(names, results) + "<div class='grid grid-cols-2 gap-2 mt-2'>" + "".join(lane.html(k) for k, lane in enumerate(lanes)) + "</div>"
+    for k, lane in enumerate(lanes):
+        lane.bind(k)
+    
+    global replayTask
+    stopReplay()
+    if lanes:
+        replayTask = asyncio.ensure_future(replayRace(lanes))
+        await waitForReplay()
+    
+    window.updateInExecution(False)
+
+async def runRacer(code : str, arr) -> list | None:
+    '''
+    Executes one code of the race in its own worker, and keeps its trace
+    
+    Parameters:
+    -----------
+    code: The code to execute (str)
+    arr: The list of the race (pyodide.ffi.JsProxy)
+    
+    Return:
+    -------
+    result: [time, compareCount, swapCount, readCount, writeCount, trace], the trace being the recorded operations (list)
+    If the execution failed: None
+    
+    Note:
+    ------
+    The trace of this worker is stored for the race, instead of being replayed on the main diagram (see receiveTrace).
+    '''
+    assert isinstance(code, str), f"Expected str, got {type(code)}, in runRacer"
+    
+    worker = await acquireWorker(document.getElementById('output'))
+    if worker is None:
+        return None
+    
+    trace = array('q')
+    def receiveRaceTrace(chunk):
+        trace.extend(toTraceChunk(chunk))
+    worker.sync.receiveTrace = receiveRaceTrace
+    
+    try:
+        result = await runInWorker(worker, "execute_code", code, toWorkerList(arr), RECORDED_MODE, OPERATION_BUDGET)
+    except (Exception, asyncio.CancelledError) as e:
+        # The worker crashed or was killed, it is replaced by a new one
+        window.console.log("❌ Worker crashed : " + str(e))
+        await workerPool.release(worker, crashed=True)
+        return None
+    
+    worker.sync.receiveTrace = receiveTrace
+    await workerPool.release(worker)
+    
+    # The error message has already been displayed by on_worker_message
+    if result is None:
+        return None
+    result = receiveResult(result)
+    return [result[1], result[2], result[3], result[4], result[5], trace]
+
+def getSavedCodes() -> list:
+    '''
+    Gets the codes saved in the localStorage
+    
+    Return:
+    -------
+    codes: The (name, code) pairs, sorted by number, e.g. [("Code-1", "..."), ("Code-2", "...")] (list)
+    
+    Note:
+    ------
+    The localStorage is only updated every 2 seconds, so the current code is read from the editor.
+    '''
+    assert window is not None, "Window not found, in getSavedCodes"
+    currentName = "Code-" + window.getStatsKey().split("-")[1]
+    
+    codes = []
+    for name in window.Object.keys(window.localStorage).to_py():
+        if name.startswith("Code-") and name[5:].isdigit():
+            codes.append((name, getCode() if name == currentName else window.localStorage.getItem(name)))
+    
+    codes.sort(key=lambda entry: int(entry[0][5:]))
+    return codes
+
+def formatRace(names : list, results : list) -> str:
+    '''
+    Formats the results of the race as an HTML table
+    
+    Parameters:
+    -----------
+    names: The names of the codes (list)
+    results: For each code, [time, compareCount, swapCount, readCount, writeCount, trace], or None if its execution failed (list)
+    
+    Return:
+    -------
+    table: The HTML table, ranked by time (str)
+    '''
+    assert len(names) == len(results), f"Expected {len(names)} results, got {len(results)}, in formatRace"
+    
+    times = sorted(result[0] for result in results if result is not None)
+    rows = ""
+    for name, result in zip(names, results):
+        if result is None:
+            rows += f"<tr><td>{name}</td><td colspan='6'>Error</td></tr>"
+            continue
+        time, compareCount, swapCount, readCount, writeCount, _ = result
+        rows += f"<tr><td>{name}</td><td>{times.index(time) + 1}</td><td>{time:.6f} s</td><td>{compareCount}</td><td>{swapCount}</td><td>{readCount}</td><td>{writeCount}</td></tr>"
+    
+    head = "<tr><th>Code</th><th>Rank</th><th>Time</th><th>Compares</th><th>Swaps</th><th>Reads</th><th>Writes</th></tr>"
+    return f"<table class='table table-xs sm:table-sm mx-auto'><thead>{head}</thead><tbody>{rows}</tbody></table>"
+
+class RaceLane:
+    '''
+    Replay of the trace of one code of the race, on its own small diagram
+    
+    Attributes:
+    -----------
+    name: The name of the code (str)
+    values: Copy of the list, on which the operations are replayed (list)
+    trace: The recorded operations, as (operation, i, j) triples (array)
+    position: The position of the next operation in the trace (int)
+    maxValue: The largest value of the list, height of the diagram (int)
+    rects: The bars of the diagram, once it is displayed (pyodide.ffi.JsProxy)
+    '''
+    def __init__(self, name : str, values : list, trace : array):
+        assert len(trace) % 3 == 0, "Trace should contain (operation, i, j) triples, in RaceLane"
+        
+        self.name = name
+        self.values = list(values)
+        self.trace = trace
+        self.position = 0
+        self.maxValue = max(max(self.values), 1)
+        self.rects = None
+    
+    @property
+    def done(self) -> bool:
+        '''
+        True once all the operations have been replayed
+        '''
+        return self.position >= len(self.trace)
+    
+    def html(self, index : int) -> str:
+        '''
+        Returns the diagram of the list
+        
+        Parameters:
+        -----------
+        index: The index of the lane, used in the id of the diagram (int)
+        
+        Return:
+        -------
+        diagram: The name of the code and its SVG diagram (str)
+        '''
+        bars = "".join(
+            f"<rect x='{i}' y='{self.maxValue - max(value, 0)}' width='0.8' height='{max(value, 0)}' fill='#B40000'/>"
+            for i, value in enumerate(self.values)
+        )
+        svg = f"<svg id='race-lane-{index}' viewBox='0 0 {len(self.values)} {self.maxValue}' preserveAspectRatio='none' class='w-full h-24'>{bars}</svg>"
+        return f"<div><p class='text-xs text-center'>{self.name}</p>{svg}</div>"
+    
+    def bind(self, index : int):
+        '''
+        Finds the bars of the diagram, once it is displayed
+        
+        Parameters:
+        -----------
+        index: The index of the lane, used in the id of the diagram (int)
+        '''
+        svg = document.getElementById(f"race-lane-{index}")
+        assert svg is not None, f"Diagram {index} not found, in bind"
+        self.rects = svg.querySelectorAll("rect")
+    
+    def advance(self, operations : int):
+        '''
+        Replays the next operations, and updates the bars which changed
+        
+        Parameters:
+        -----------
+        operations: The number of operations to replay (int)
+        '''
+        end = min(len(self.trace), self.position + 3 * operations)
+        changed = set()
+        for k in range(self.position, end, 3):
+            if self.trace[k] == TRACE_SWAP:
+                i, j = self.trace[k + 1], self.trace[k + 2]
+                self.values[i], self.values[j] = self.values[j], self.values[i]
+                changed.update((i, j))
+            elif self.trace[k] == TRACE_WRITE:
+                self.values[self.trace[k + 1]] = self.trace[k + 2]
+                changed.add(self.trace[k + 1])
+        self.position = end
+        
+        for i in changed:
+            value = min(max(self.values[i], 0), self.maxValue)
+            rect = self.rects.item(i)
+            rect.setAttribute("y", self.maxValue - value)
+            rect.setAttribute("height", value)
+
+async def replayRace(lanes : list):
+    '''
+    Replays the traces of the race side by side, once per animation frame
+    
+    Parameters:
+    -----------
+    lanes: The lanes of the race (list)
+    
+    Note:
+    ------
+    Every lane replays the same number of operations per frame, so that the longest trace lasts RACE_DURATION
+    seconds, or the duration chosen by the user when the animation is fitted. Nothing is replayed while it is paused.
+    '''
+    longest = max(len(lane.trace) // 3 for lane in lanes)
+    budget = 0.0            # Number of operations left to replay
+    lastFrame = await nextFrame()
+    
+    while not all(lane.done for lane in lanes):
+        frame = await nextFrame()
+        elapsed, lastFrame = frame - lastFrame, frame
+        if getReplayPaused():
+            continue
+        
+        duration = getReplayDuration() or RACE_DURATION
+        budget += elapsed * longest / (duration * 1_000)
+        operations = min(int(budget), MAX_OPERATIONS_PER_FRAME)
+        budget -= int(budget)
+        
+        for lane in lanes:
+            if not lane.done:
+                lane.advance(operations)
+
+# Cancellation of the executions
+
+runningExecutions = []      # The (worker, call) pairs of the running executions (see runInWorker)
+
+async def acquireWorker(outputDiv):
+    '''
+    Takes a ready worker from the pool, or displays an error if no worker could be started
+    
+    Parameters:
+    -----------
+    outputDiv: The output div, where the error is displayed (Element)
+    
+    Return:
+    -------
+    worker: A ready worker, None if no worker could be started (PyWorker | None)
+    '''
+    try:
+        return await workerPool.acquire()
+    except Exception as e:
+        window.console.log("❌ No worker could be started : " + str(e))
+        outputDiv.innerHTML = "The Python environment could not be started... please reload the page"
+        return None
+
+async def runInWorker(worker, name : str, *args):
+    '''
+    Calls a function of the worker, which can be cancelled by the user and is interrupted after EXECUTION_TIME_BUDGET
+    
+    Parameters:
+    -----------
+    worker: The worker handed out by the pool (PyWorker)
+    name: The name of the function of the worker, such as "execute_code" (str)
+    args: The arguments of the function
+    
+    Return:
+    -------
+    result: The result of the function, None if the execution failed or was interrupted
+    
+    Raises:
+    -------
+    asyncio.CancelledError: If the worker did not stop after being interrupted, it must then be terminated
+    '''
+    assert isinstance(name, str), f"Expected str, got {type(name)}, in runInWorker"
+    
+    if worker.interruptBuffer is not None:
+        worker.interruptBuffer[0] = 0
+    
+    execution = asyncio.ensure_future(getattr(worker.sync, name)(*args))
+    entry = (worker, execution)
+    runningExecutions.append(entry)
+    timer = asyncio.get_event_loop().call_later(EXECUTION_TIME_BUDGET, interruptExecution, worker, execution)
+    
+    try:
+        return await execution
+    finally:
+        timer.cancel()
+        runningExecutions.remove(entry)
+
+def cancelExecution(event):
+    '''
+    Stops the running executions of the workers, and the replay of their operations
+    
+    Parameter:
+    -----------
+    event: Event
+    
+    Note:
+    ------
+    This function is called when the user clicks the "Cancel" button.
+    '''
+    stopReplay()
+    for worker, execution in list(runningExecutions):
+        interruptExecution(worker, execution)
+
+def interruptExecution(worker, execution):
+    '''
+    Interrupts a call to a worker
+    
+    Parameters:
+    -----------
+    worker: The worker running the call (PyWorker)
+    execution: The call to the worker (asyncio.Future)
+    
+    Note:
+    ------
+    This function is called by cancelExecution, or by runInWorker after EXECUTION_TIME_BUDGET.
+    SIGINT is written in the interrupt buffer of the worker, which raises a KeyboardInterrupt in the user's code:
+    the worker returns None and can be reused. If it is still running after INTERRUPT_GRACE_PERIOD (for instance if
+    the interrupt buffer is not available), the call is abandoned and the worker is terminated (see WorkerPool.release).
+    '''
+    if execution.done():
         return
-    console.log("✅ Received result from timed Worker !")
     
-    window.updateExecutionTime(time)
-    
-    averageTime = updateAverageTime()
-    assert averageTime is not None, "Average time not found, in startWorker"
+    window.console.log("🛑 Interrupting the execution")
+    if worker.interruptBuffer is not None:
+        worker.interruptBuffer[0] = SIGINT
+    asyncio.get_event_loop().call_later(INTERRUPT_GRACE_PERIOD, abandonExecution, execution)
 
-    window.updateAverageTime(averageTime)
-    window.updateStandardDeviation(computeStandardDeviation(averageTime))
-    
-    myList = await sorted_list
+def abandonExecution(execution):
+    '''
+    Abandons a call to the worker which did not stop after being interrupted
     
-    # Handle unexpected errors (mostly related to JSON parsing)
-    if myList is None : 
-        HandleError()
-        outputDiv.innerHTML = "Something went wrong... please try again"
-        terminateWorkers(timedWorker, myWorker)
-        return
-    console.log("✅ Received result from Worker !")
+    Parameters:
+    -----------
+    execution: The call to the worker (asyncio.Future)
+    '''
+    if not execution.done():
+        execution.cancel()
 
-    # Update the final two elements of the list
-    updateList(myList, len(arr) - 1, len(arr), end = True)
-    
-    terminateWorkers(timedWorker, myWorker)
-        
-    window.updateInExecution(False)
-    
 def createWorker():
     '''
     Creates a new worker to execute the user's code
@@ -108,13 +1060,23 @@ def createWorker():
     '''
     worker = PyWorker("python/src/worker.py", type="pyodide")
     assert worker is not None, "Worker not found, in createWorker"
-    worker.sync.compareOnDiagram = compareOnDiagram
-    worker.sync.updateList = updateList
-    worker.sync.getSwap = getSwap
-    worker.sync.getCompare = getCompare
-    worker.sync.getAnimationTime = getAnimationTime
+    
+    # Buffer shared with the worker, used to interrupt its executions (see cancelExecution)
+    try:
+        worker.interruptBuffer = window.Int32Array.new(window.SharedArrayBuffer.new(4))
+    except Exception:
+        # The page is not cross-origin isolated, the executions can only be stopped by terminating the worker
+        worker.interruptBuffer = None
+    
+    # Costs of compare and swap in this worker, measured by the first benchmark (see startBenchmark)
+    worker.primitiveCosts = None
+    worker.sync.receiveTrace = receiveTrace
+    worker.sync.updateDecimated = updateDecimated
     worker.sync.updateCompareCount = updateCompareCount
     worker.sync.updateSwapCount = updateSwapCount
+    
+    # This function allows to handle the messages sent by the worker
+    worker.onmessage = on_worker_message
     return worker
 
 def on_worker_message(event):
@@ -143,32 +1105,10 @@ def on_worker_message(event):
     assert outputDiv is not None, "Output div not found, in on_worker_message"
     
     window.console.log("❌ Error in worker : " + event.data)
-
-    # If the error message contains "SyntaxError" and "JSON", it means the error is related to JSON parsing.  
-    # This issue arises from multiple conversions between Python and JavaScript objects.  
-    # It cannot be fully corrected, only minimized (between 2 and 5 %).  
-
-    if all(keyword in event.data for keyword in ["SyntaxError", "JSON"]):
-        # Therefore, the user is advised to try again.  
-        outputDiv.innerHTML = "Something went wrong... please try again"
-    else:
-        outputDiv.innerHTML = event.data
-
-def terminateWorkers(worker1, worker2):
-    '''
-    Terminates the two workers
-    
-    Parameters:
-    -----------
-    worker1: The worker to be terminated (PyWorker)
-    worker2: The worker to be terminated (PyWorker)
-    '''
-    worker1.terminate()
-    assert worker1.terminate, "Worker1 did not terminate properly, in terminateWorkers"
-    
-    worker2.terminate()
-    assert worker2.terminate, "Worker2 did not terminate properly, in terminateWorkers"
     
+    # The restriction errors give one violation per line (see check_node in worker.py)
+    outputDiv.innerHTML = event.data.replace("\n", "<br>")
+
 def HandleError():
     '''
     Handles the case when an error occurs during the execution of the user's code
@@ -184,7 +1124,7 @@ def HandleError():
 def getCode() -> str:
     '''
     Extracts and returns the code from the editor
-
+    
     Return:
     -------
     code: The code entered by the user in the editor (str)
@@ -209,6 +1149,69 @@ def getArr() -> pyodide.ffi.JsProxy:
     
     return arr
 
+def toTypedArray(arr) -> pyodide.ffi.JsProxy:
+    '''
+    Converts the list to a typed array, which is sent to the worker as a single buffer
+    
+    Parameters:
+    -----------
+    arr: The list stored in the window object (pyodide.ffi.JsProxy)
+    
+    Return:
+    -------
+    typedArray: The list, as a Float64Array (pyodide.ffi.JsProxy)
+    
+    Note:
+    -----
+    A Float64Array holds any JavaScript number without loss, so the worker can reject the non-integer values.
+    '''
+    assert isinstance(arr, pyodide.ffi.JsProxy), f"Expected pyodide.ffi.JsProxy, got {type(arr)}, in toTypedArray"
+    return window.Float64Array.new(arr)
+
+def receiveResult(result) -> list:
+    '''
+    Unpacks the result of an execution, received from the worker as a single buffer (see pack_result in worker.py)
+    
+    Parameters:
+    -----------
+    result: The buffer (pyodide.ffi.JsProxy, a Float64Array)
+    
+    Return:
+    -------
+    result: [myList, time, compareCount, swapCount, readCount, writeCount] followed by the extras, see unpack_result (list)
+    
+    Note:
+    -----
+    The typed array is copied at once from its buffer, so no element is converted on the way.
+    '''
+    if isinstance(result, pyodide.ffi.JsProxy):
+        buffer = array('d')
+        buffer.frombytes(result.to_bytes())
+        return unpack_result(buffer)
+    return unpack_result(result)
+
+def toWorkerList(arr) -> pyodide.ffi.JsProxy | str:
+    '''
+    Gives what is sent to the worker for the list: its descriptor if it is a generated list, else the typed array
+    
+    Parameters:
+    -----------
+    arr: The list stored in the window object (pyodide.ffi.JsProxy)
+    
+    Return:
+    -------
+    workerList: The descriptor of the selected list, see generators.js (str), or the list as a Float64Array (pyodide.ffi.JsProxy)
+    
+    Note:
+    -----
+    The worker generates the same list from the descriptor (see generate_list in worker.py), so a list of a million
+    elements costs a few bytes to send instead of 8 MB. The list sorted by a previous execution has no descriptor.
+    '''
+    descriptor = window.getListDescriptor()
+    if descriptor:
+        return str(descriptor)
+    return toTypedArray(arr)
+
 def getSwap():
     '''
     Gets the value of the swap variable
@@ -242,6 +1245,73 @@ def getAnimationTime():
     assert window is not None, "Window not found, in getAnimationTime"
     return window.getAnimationTime()
 
+def getReplayPaused():
+    '''
+    Gets the value of the replayPaused variable
+    
+    Return:
+    -------
+    replayPaused: True if the user paused the animation (bool)
+    '''
+    assert window is not None, "Window not found, in getReplayPaused"
+    return window.getReplayPaused()
+
+def getReplayDuration():
+    '''
+    Gets the duration to which the animation is fitted
+    
+    Return:
+    -------
+    replayDuration: The duration of the whole animation, in seconds, or 0 if the animation is not fitted (float)
+    '''
+    assert window is not None, "Window not found, in getReplayDuration"
+    return window.getReplayDuration()
+
+def getProfileLines() -> bool:
+    '''
+    Gets whether the lines of the code are profiled
+    
+    Return:
+    -------
+    profileLines: True if the user enabled the profiling of the lines (bool)
+    '''
+    assert window is not None, "Window not found, in getProfileLines"
+    return bool(window.getProfileLines())
+
+def getCountAccesses() -> bool:
+    '''
+    Gets whether the operations are counted per index and over time
+    
+    Return:
+    -------
+    countAccesses: True if the user enabled the counting of the accesses (bool)
+    '''
+    assert window is not None, "Window not found, in getCountAccesses"
+    return bool(window.getCountAccesses())
+
+def getMeasureMemory() -> bool:
+    '''
+    Gets whether the peak memory of the code is measured
+    
+    Return:
+    -------
+    measureMemory: True if the user enabled the measure of the memory (bool)
+    '''
+    assert window is not None, "Window not found, in getMeasureMemory"
+    return bool(window.getMeasureMemory())
+
+def showLineProfile(profile):
+    '''
+    Displays the profile of the lines as a heatmap in the editor
+    
+    Parameters:
+    -----------
+    profile: The number of executions and the time of each line, interleaved (see LineProfiler in worker.py),
+    an empty profile removes the heatmap (list or pyodide.ffi.JsProxy)
+    '''
+    assert window is not None, "Window not found, in showLineProfile"
+    window.showLineProfile(profile if isinstance(profile, pyodide.ffi.JsProxy) else pyodide.ffi.to_js(profile))
+
 # Functions that update the animation of the diagram
 
 def compareOnDiagram(i : int, j : int):
@@ -256,7 +1326,7 @@ def compareOnDiagram(i : int, j : int):
     assert window is not None, "Window not found, in compareOnDiagram"
     window.compareOnDiagram(i, j)
 
-def updateList(arr, i, j, timedExecution = False, end = False) :
+def updateList(arr, i, j, end = False) :
     '''
     Updates the list displayed in the window
     
@@ -265,62 +1335,510 @@ def updateList(arr, i, j, timedExecution = False, end = False) :
     arr: The list to be displayed (pyodide.ffi.JsProxy)
     i : The index of the first element (int)
     j : The index of the second element (int)
-    timedExecution : Boolean to indicate if the execution is timed (bool) (default = False)
     end : Boolean to indicate the end of the sorting process (bool) (default = False)
     '''
     assert isinstance(arr, pyodide.ffi.JsProxy), f"Expected pyodide.ffi.JsProxy, got {type(arr)}, in updateList"
     assert isinstance(i, int) and not isinstance(i, bool), f"Expected int, got {type(i)}, in updateList"
     assert isinstance(j, int) and not isinstance(i, bool), f"Expected int, got {type(j)}, in updateList"
-    assert isinstance(timedExecution, bool), f"Expected bool, got {type(timedExecution)}, in updateList"
     assert isinstance(end, bool), f"Expected bool, got {type(end)}, in updateList"
     
-    if not timedExecution:
-        assert window is not None, "Window not found, in updateList"
-        window.updateList(arr)
-        if getSwap() and not end:
-            window.swapOnDiagram(i, j)
-        if end : 
-            window.stopComparing()
+    assert window is not None, "Window not found, in updateList"
+    window.updateList(arr)
+    if getSwap() and not end:
+        window.swapOnDiagram(i, j)
+    if end : 
+        window.stopComparing()
 
-# Compute the average time and standard deviation
-   
-def updateAverageTime() -> float:
+# Replay of the operations recorded by the worker
+
+replayList = []         # Local copy of the list, on which the operations are replayed
+traceQueue = deque()    # Chunks of operations waiting to be replayed
+replayTask = None       # Task replaying the operations
+receivedOperations = 0  # Number of operations received since the start of the replay
+
+def updateDecimated(view):
+    '''
+    Displays a downsampled view of a large list on the diagram
+    
+    Parameters:
+    -----------
+    view: The minimum and the maximum of each bucket of the list, interleaved (pyodide.ffi.JsProxy)
+    
+    Note:
+    ------
+    This function is called by the worker during the executions in the decimated mode, at most a few times per second.
+    The full list stays in the worker, only the view crosses the thread boundary.
+    '''
+    assert isinstance(view, pyodide.ffi.JsProxy), f"Expected pyodide.ffi.JsProxy, got {type(view)}, in updateDecimated"
+    assert window is not None, "Window not found, in updateDecimated"
+    window.updateDecimated(view)
+
+def startReplay(arr):
+    '''
+    Prepares the replay of the operations of a new execution
+    
+    Parameters:
+    -----------
+    arr: The list sent to the worker (pyodide.ffi.JsProxy)
+    '''
+    assert isinstance(arr, pyodide.ffi.JsProxy), f"Expected pyodide.ffi.JsProxy, got {type(arr)}, in startReplay"
+    global replayList, receivedOperations
+    
+    stopReplay()
+    replayList = arr.to_py()
+    receivedOperations = 0
+
+def stopReplay():
+    '''
+    Stops the replay and drops the operations which have not been replayed yet
+    '''
+    global replayTask
+    
+    traceQueue.clear()
+    if replayTask is not None and not replayTask.done():
+        replayTask.cancel()
+    replayTask = None
+
+async def waitForReplay():
+    '''
+    Waits until all the received operations have been replayed
     '''
-    Updates the average time taken for execution
+    if replayTask is not None:
+        try:
+            await replayTask
+        except asyncio.CancelledError:
+            # The replay was stopped by the user (see cancelExecution)
+            pass
 
-    Returns:
-    --------
-    newAverage: The updated average time taken for execution (float)
+def receiveTrace(chunk):
     '''
-    assert window is not None, "Window not found, in updateAverageTime"
+    Receives a chunk of operations from the worker and schedules its replay
+    
+    Parameters:
+    -----------
+    chunk: The recorded operations, as (operation, i, j) triples (pyodide.ffi.JsProxy)
+    
+    Note:
+    ------
+    This function is called by the worker, which is blocked until it returns. It only stores the chunk,
+    the operations are replayed at the animation speed by the replayTrace task.
+    '''
+    global replayTask, receivedOperations
+    
+    operations = toTraceChunk(chunk)
+    assert len(operations) % 3 == 0, "Trace chunk should contain (operation, i, j) triples, in receiveTrace"
+    traceQueue.append(operations)
+    receivedOperations += len(operations) // 3
+    
+    if replayTask is None or replayTask.done():
+        replayTask = asyncio.ensure_future(replayTrace())
+
+def toTraceChunk(chunk) -> array:
+    '''
+    Converts a chunk of operations received from the worker
+    
+    Parameters:
+    -----------
+    chunk: The recorded operations, as (operation, i, j) triples (pyodide.ffi.JsProxy | list)
+    
+    Return:
+    -------
+    operations: The recorded operations (array)
+    
+    Note:
+    -----
+    The BigInt64Array is copied at once from its buffer, so no element is converted to a JavaScript BigInt.
+    '''
+    if not isinstance(chunk, pyodide.ffi.JsProxy):
+        return array('q', chunk)
+    
+    operations = array('q')
+    operations.frombytes(chunk.to_bytes())
+    return operations
+
+async def nextFrame() -> float:
+    '''
+    Waits for the next animation frame of the browser
+    
+    Return:
+    -------
+    timestamp: The time of the frame, in milliseconds (float)
+    '''
+    frame = asyncio.get_event_loop().create_future()
+    window.requestAnimationFrame(pyodide.ffi.create_once_callable(frame.set_result))
+    return await frame
+
+async def replayTrace():
+    '''
+    Replays the recorded operations on the diagram, in batches, once per animation frame
+    
+    Note:
+    ------
+    Each frame, the time elapsed since the previous frame is spent on the next operations: a swap lasts
+    getAnimationTime() milliseconds and a compare COMPARE_DURATION_RATIO of it, or nothing if it is not shown.
+    A write (set) is displayed as a swap of an element with itself, and a read (get) as a compare.
+    When the animation is fitted to a duration, every operation lasts the same time, so that all the received
+    operations are replayed in this duration. The diagram is updated once per frame, with the last compare and
+    swap of the batch highlighted. Nothing is replayed while the animation is paused.
+    '''
+    position = 0            # Position of the next operation in the first chunk of the queue
+    budget = 0.0            # Time (in milliseconds) left to spend on the operations
+    lastFrame = await nextFrame()
+    
+    while traceQueue:
+        frame = await nextFrame()
+        elapsed, lastFrame = frame - lastFrame, frame
+        if getReplayPaused():
+            continue
+        
+        # The settings are read once per frame
+        duration = getReplayDuration()
+        if duration > 0:
+            swapDuration = compareDuration = duration * 1_000 / max(receivedOperations, 1)
+        else:
+            # The compares keep their own duration when the swaps are not displayed
+            animationTime = getAnimationTime()
+            swapDuration = animationTime if getSwap() else 0
+            compareDuration = animationTime * COMPARE_DURATION_RATIO if getCompare() else 0
+        budget += elapsed
+        
+        lastCompare, lastSwap = None, None
+        for _ in range(MAX_OPERATIONS_PER_FRAME):
+            operations = traceQueue[0]
+            operation, i, j = operations[position], operations[position + 1], operations[position + 2]
+            
+            operationDuration = compareDuration if operation == TRACE_COMPARE or operation == TRACE_READ else swapDuration
+            if operationDuration > budget:
+                break
+            budget -= operationDuration
+            
+            if operation == TRACE_COMPARE or operation == TRACE_READ:
+                lastCompare = (i, j)
+            elif operation == TRACE_SWAP:
+                replayList[i], replayList[j] = replayList[j], replayList[i]
+                lastSwap = (i, j)
+            else:
+                replayList[i] = j
+                lastSwap = (i, i)
+            
+            position += 3
+            if position == len(operations):
+                traceQueue.popleft()
+                position = 0
+                if not traceQueue:
+                    break
+        else:
+            # The replay is late, the time left is not carried over to the next frames
+            budget = 0.0
+        
+        if lastCompare is not None and getCompare():
+            compareOnDiagram(*lastCompare)
+        if lastSwap is not None:
+            updateList(pyodide.ffi.to_js(replayList), *lastSwap)
 
-    executionCount = window.getExecutionCount()
-    assert executionCount > 0, "Execution count value is negative, in updateAverageTime"
-    executionTimeList = window.getExecutionTimeList()
+# Compute the average time and standard deviation
+
+# ------------------------------------------------------------------------------------------------------------------------
+# The following class computes the statistics of the execution times. It has been copied in the current file, as the
+# result buffer at the end of the file (see ./static/python/src/running_stats.py).
+# ------------------------------------------------------------------------------------------------------------------------
+
+# Relative accuracy of the quantiles estimated by RunningStats
+SKETCH_ACCURACY = 0.01
+
+class RunningStats:
+    '''
+    Incremental statistics about the execution times
+    
+    Attributes:
+    -----------
+    count: The number of execution times (int)
+    mean: The mean of the execution times (float)
+    m2: The sum of the squared differences to the mean (float)
+    buckets: The number of execution times in each bucket of the quantile sketch (dict)
+    zeros: The number of execution times equal to 0 (int)
+    
+    Note:
+    -----
+    The mean and the variance are updated with Welford's algorithm, and the quantiles are estimated with a
+    logarithmic sketch: each time x goes to the bucket ceil(log(x) / log(gamma)), so every estimated quantile is
+    within SKETCH_ACCURACY (relative error) of the real one. Adding a time costs O(1), whatever the number of executions.
+    The statistics can be saved as JSON (in the localStorage), and merged with the statistics of another session.
+    The statistics rebuilt from the displayed stats (see fromSummary) have no quantile sketch: their quantiles only
+    cover the times added afterwards (see sketchCount).
+    '''
+    gamma = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.buckets = {}
+        self.zeros = 0
+    
+    def push(self, value : float):
+        '''
+        Adds an execution time to the statistics
+        
+        Parameters:
+        -----------
+        value: The execution time (float)
+        '''
+        assert value >= 0, f"Expected non-negative time, got {value}, in push"
+        
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        
+        if value == 0:
+            self.zeros += 1
+        else:
+            index = math.ceil(math.log(value) / math.log(self.gamma))
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+    
+    @property
+    def variance(self) -> float:
+        '''
+        The (population) variance of the execution times
+        '''
+        return self.m2 / self.count if self.count > 0 else 0.0
+    
+    @property
+    def standardDeviation(self) -> float:
+        '''
+        The (population) standard deviation of the execution times
+        '''
+        return self.variance ** 0.5
+    
+    @property
+    def sketchCount(self) -> int:
+        '''
+        The number of execution times in the quantile sketch, lower than count if the statistics were rebuilt by fromSummary
+        '''
+        return self.zeros + sum(self.buckets.values())
+    
+    def quantile(self, q : float) -> float:
+        '''
+        Estimates a quantile of the execution times
+        
+        Parameters:
+        -----------
+        q: The quantile, between 0 and 1 (e.g. 0.5 for the median) (float)
+        
+        Return:
+        -------
+        value: The estimated quantile of the times of the sketch (see sketchCount), 0 if the sketch is empty (float)
+        '''
+        assert 0 <= q <= 1, f"Expected quantile between 0 and 1, got {q}, in quantile"
+        sketchCount = self.sketchCount
+        if sketchCount == 0:
+            return 0.0
+        
+        rank = q * (sketchCount - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Middle of the bucket ]gamma^(index - 1), gamma^index]
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+    
+    def merge(self, other : "RunningStats") -> "RunningStats":
+        '''
+        Merges the statistics of another session into these statistics
+        
+        Parameters:
+        -----------
+        other: The statistics to merge (RunningStats)
+        
+        Return:
+        -------
+        self: The merged statistics (RunningStats)
+        
+        Note:
+        -----
+        The mean and M2 are combined with Chan's parallel formula, and the buckets of the sketches are summed, so the
+        result is the same as if every time of both sessions had been pushed into a single instance.
+        '''
+        assert isinstance(other, RunningStats), f"Expected RunningStats, got {type(other)}, in merge"
+        if other.count == 0:
+            return self
+        
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        
+        self.zeros += other.zeros
+        for index, bucketCount in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + bucketCount
+        return self
+    
+    def toJSON(self) -> str:
+        '''
+        Serializes the statistics, to save them in the localStorage
+        
+        Return:
+        -------
+        text: The statistics, as JSON (str)
+        '''
+        return json.dumps({"count": self.count, "mean": self.mean, "m2": self.m2, "zeros": self.zeros, "buckets": self.buckets})
+    
+    @classmethod
+    def fromJSON(cls, text : str) -> "RunningStats":
+        '''
+        Restores the statistics saved by toJSON
+        
+        Parameters:
+        -----------
+        text: The statistics, as JSON (str)
+        
+        Return:
+        -------
+        stats: The restored statistics (RunningStats)
+        '''
+        data = json.loads(text)
+        stats = cls()
+        stats.count, stats.mean, stats.m2, stats.zeros = data["count"], data["mean"], data["m2"], data["zeros"]
+        stats.buckets = {int(index): bucketCount for index, bucketCount in data["buckets"].items()}
+        return stats
+    
+    @classmethod
+    def fromSummary(cls, count : int, mean : float, standardDeviation : float) -> "RunningStats":
+        '''
+        Restores the mean and the variance from the statistics displayed in the window (the quantile sketch is empty)
+        
+        Parameters:
+        -----------
+        count: The number of execution times (int)
+        mean: The mean of the execution times (float)
+        standardDeviation: The (population) standard deviation of the execution times (float)
+        
+        Return:
+        -------
+        stats: The restored statistics (RunningStats)
+        '''
+        stats = cls()
+        if count > 0:
+            stats.count, stats.mean, stats.m2 = count, mean, standardDeviation ** 2 * count
+        return stats
     
-    return sum(executionTimeList) / executionCount
+    @classmethod
+    def restore(cls, text : str, count : int, mean : float, standardDeviation : float) -> "RunningStats":
+        '''
+        Restores the saved statistics, or rebuilds them from the statistics displayed in the window
+        
+        Parameters:
+        -----------
+        text: The saved statistics, or None (str)
+        count: The number of execution times displayed in the window (int)
+        mean: The mean displayed in the window (float)
+        standardDeviation: The standard deviation displayed in the window (float)
+        
+        Return:
+        -------
+        stats: The restored statistics (RunningStats)
+        
+        Note:
+        -----
+        The saved statistics are only kept when they contain as many execution times as the window, otherwise
+        (e.g. after a reset of the stats) only the mean and the variance can be restored (see fromSummary).
+        '''
+        if text is not None:
+            stats = cls.fromJSON(text)
+            if stats.count == count:
+                return stats
+        return cls.fromSummary(count, mean, standardDeviation)
 
-def computeStandardDeviation(averageTime) -> float:
+def formatQuantiles(stats : RunningStats) -> str:
     '''
-    Computes the standard deviation of the time taken for execution
+    Formats the median and the 95th percentile of the execution times, for the output div
     
     Parameters:
     -----------
-    averageTime: The average time taken for execution (float)
+    stats: The running statistics (RunningStats)
     
     Return:
     -------
-    standardDeviation: The standard deviation of the time taken for execution (float)
+    text: The quantiles, empty if the sketch has no execution time (str)
+    
+    Note:
+    -----
+    When the statistics were rebuilt from the displayed stats (see fromSummary), the quantiles only cover the
+    executions of the sketch, which is said next to them.
+    '''
+    if stats.sketchCount == 0:
+        return ""
+    
+    scope = f", over the last {stats.sketchCount} executions" if stats.sketchCount < stats.count else ""
+    return f" (median time : {stats.quantile(0.5):.6f} s, p95 : {stats.quantile(0.95):.6f} s{scope})"
+
+def getRunningStatsKey() -> str:
+    '''
+    Returns the localStorage key of the running statistics of the current code
+    
+    Return:
+    -------
+    key: The key, e.g. "Stats-1-stream" (str)
+    '''
+    assert window is not None, "Window not found, in getRunningStatsKey"
+    return window.getStatsKey() + "-stream"
+
+def loadRunningStats() -> RunningStats:
+    '''
+    Loads the running statistics of the current code, before adding a new execution time
+    
+    Return:
+    -------
+    stats: The running statistics (RunningStats)
+    
+    Note:
+    -----
+    The execution count has already been incremented for the new execution. If the saved statistics do not match
+    the previous executions (e.g. after a reset of the stats), they are rebuilt from the stats displayed in the window.
+    '''
+    assert window is not None, "Window not found, in loadRunningStats"
+    previousCount = window.getExecutionCount() - 1
+    assert previousCount >= 0, "Execution count value is negative, in loadRunningStats"
+    
+    text = window.localStorage.getItem(getRunningStatsKey())
+    return RunningStats.restore(text, previousCount, window.getAverageTime(), window.getEcartType())
+
+def saveRunningStats(stats : RunningStats):
+    '''
+    Saves the running statistics of the current code in the localStorage
+    
+    Parameters:
+    -----------
+    stats: The running statistics (RunningStats)
     '''
-    assert window is not None, "Window not found, in computeStandardDeviation"
+    assert isinstance(stats, RunningStats), f"Expected RunningStats, got {type(stats)}, in saveRunningStats"
+    window.localStorage.setItem(getRunningStatsKey(), stats.toJSON())
+
+def updateRunningStats(time : float) -> RunningStats:
+    '''
+    Adds a new execution time to the statistics of the current code, and updates the average time and the standard deviation
     
-    executionTimeList = window.getExecutionTimeList()
-    assert len(executionTimeList) > 0, "Length of executionTimeList is negative, in computeStandardDeviation"
+    Parameters:
+    -----------
+    time: The new execution time (float)
     
-    variance = sum((time - averageTime) ** 2 for time in executionTimeList) / len(executionTimeList)
-    standardDeviation = variance ** 0.5
+    Return:
+    -------
+    stats: The updated running statistics (RunningStats)
+    '''
+    stats = loadRunningStats()
+    stats.push(time)
+    saveRunningStats(stats)
     
-    return standardDeviation
+    window.updateAverageTime(stats.mean)
+    window.updateStandardDeviation(stats.standardDeviation)
+    return stats
 
 # Update the values of the compareCount and swapCount variables in the window object
 
@@ -338,4 +1856,57 @@ def updateSwapCount(swapCount):
     '''
     assert window is not None, "Window not found, in updateSwapCount"
     
-    window.updateSwapCount(swapCount)
\ No newline at end of file
+    window.updateSwapCount(swapCount)
+
+# ------------------------------------------------------------------------------------------------------------------------
+# The following function unpacks the result of an execution, packed by the worker. It has been copied in the current file,
+# as in worker.py (see ./static/python/src/result_buffer.py).
+# ------------------------------------------------------------------------------------------------------------------------
+
+# Layout of the result of an execution, as a single buffer of doubles (see pack_result)
+RESULT_FORMAT_VERSION = 1
+RESULT_HEADER_SIZE = 8      # version, listLength, time, compareCount, swapCount, readCount, writeCount, extraCount
+
+def unpack_result(buffer) -> list:
+    '''
+    Unpacks the result of an execution packed by pack_result
+    
+    Parameters:
+    -----------
+    buffer: The buffer of doubles (array | memoryview | list)
+    
+    Return:
+    -------
+    result: [myList, final_time, compareCount, swapCount, readCount, writeCount] followed by the extras, myList being
+    an array of doubles and each extra a list of parts, which are lists of numbers (list)
+    
+    Raises:
+    -------
+    Exception: If the buffer is truncated, or was packed by another version of pack_result
+    '''
+    if len(buffer) < RESULT_HEADER_SIZE or buffer[0] != RESULT_FORMAT_VERSION:
+        raise Exception("Invalid result buffer, in unpack_result")
+    
+    listLength, extraCount = int(buffer[1]), int(buffer[7])
+    offset = RESULT_HEADER_SIZE + listLength
+    result = [array('d', buffer[RESULT_HEADER_SIZE:offset]), buffer[2]] + [int(count) for count in buffer[3:7]]
+    
+    try:
+        for _ in range(extraCount):
+            parts = []
+            partCount, offset = int(buffer[offset]), offset + 1
+            for _ in range(partCount):
+                length, offset = int(buffer[offset]), offset + 1
+                parts.append(list(buffer[offset:offset + length]))
+                offset += length
+            result.append(parts)
+    except IndexError:
+        raise Exception("Invalid result buffer, in unpack_result")
+    
+    if offset != len(buffer):
+        raise Exception("Invalid result buffer, in unpack_result")
+    return result
+
+# Start the workers in the background, as soon as the page is loaded
+workerPool = WorkerPool()
+workerPool.prewarm()
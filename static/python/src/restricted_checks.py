@@ -3,6 +3,89 @@ import ast
 RESTRICTED_MODULES = {'os', 'sys', 'subprocess', 'shutil', 'socket', 'http', 'ftplib', 'pickle'}
 RESTRICTED_VARIABLES = {'myList'}
 
+def import_violations(node) -> list:
+    '''
+    Finds the restricted modules imported by "import ..."
+    
+    Parameters:
+    -----------
+    node: ast.Import
+    
+    Return:
+    -------
+    violations: The error message of each restricted module (list)
+    '''
+    assert hasattr(node, 'names') and isinstance(node.names, list), "Node does not have 'names' attribute or it is not a list, in import_violations"
+    return [f"Importing '{alias.name}' module is not allowed" for alias in node.names if alias.name in RESTRICTED_MODULES]
+
+def import_from_violations(node) -> list:
+    '''
+    Finds the restricted module imported by "from ... import ..."
+    
+    Parameters:
+    -----------
+    node: ast.ImportFrom
+    
+    Return:
+    -------
+    violations: The error message of the restricted module, if any (list)
+    '''
+    assert hasattr(node, 'module'), "Node does not have 'module' attribute, in import_from_violations"
+    if node.module in RESTRICTED_MODULES:
+        return [f"Importing from '{node.module}' module is not allowed"]
+    return []
+
+def attribute_violations(node) -> list:
+    '''
+    Finds the access to a restricted module via an attribute
+    
+    Parameters:
+    -----------
+    node: ast.Attribute
+    
+    Return:
+    -------
+    violations: The error message of the restricted module, if any (list)
+    '''
+    assert hasattr(node, 'value'), "Node does not have 'value' attribute, in attribute_violations"
+    if isinstance(node.value, ast.Name) and node.value.id in RESTRICTED_MODULES:
+        return [f"Access to '{node.value.id}' module is not allowed"]
+    return []
+
+def name_violations(node) -> list:
+    '''
+    Finds the redefinition or the deletion of a restricted variable
+    
+    Parameters:
+    -----------
+    node: ast.Name
+    
+    Return:
+    -------
+    violations: The error message of the restricted variable, if any (list)
+    
+    Note:
+    -----
+    Every target of an assignment is a name in the Store context: "=", "+=", annotated assignments, "for" loops,
+    comprehensions, ":=", "with ... as", and the unpacking of tuples and lists.
+    '''
+    assert hasattr(node, 'id') and hasattr(node, 'ctx'), "Node does not have 'id' or 'ctx' attribute, in name_violations"
+    if node.id not in RESTRICTED_VARIABLES:
+        return []
+    if isinstance(node.ctx, ast.Store):
+        return [f"Redefining '{node.id}' variable is not allowed"]
+    if isinstance(node.ctx, ast.Del):
+        return [f"Deleting '{node.id}' variable is not allowed"]
+    return []
+
+# Function finding the violations of each type of node, the other types of nodes are allowed
+NODE_CHECKS = {
+    ast.Import: import_violations,
+    ast.ImportFrom: import_from_violations,
+    ast.Attribute: attribute_violations,
+    ast.Name: name_violations,
+}
+
 def check_import(node):
     '''
     Checks "import ..." to restrict some modules
@@ -16,9 +99,8 @@ def check_import(node):
     Exception: If a restricted module is imported
     '''
     assert hasattr(node, 'names') and isinstance(node.names, list), "Node does not have 'names' attribute or it is not a list, in check_import"
-    for alias in node.names:
-        if alias.name in RESTRICTED_MODULES:
-            raise Exception(f"Importing '{alias.name}' module is not allowed")
+    for message in import_violations(node):
+        raise Exception(message)
 
 def check_import_from(node):
     '''
@@ -33,8 +115,8 @@ def check_import_from(node):
     Exception: If a restricted module is imported
     '''
     assert hasattr(node, 'module'), "Node does not have 'module' attribute, in check_import_from"
-    if node.module in RESTRICTED_MODULES:
-        raise Exception(f"Importing from '{node.module}' module is not allowed")
+    for message in import_from_violations(node):
+        raise Exception(message)
 
 def check_attribute(node):
     '''
@@ -49,8 +131,8 @@ def check_attribute(node):
     Exception: If a restricted module is accessed
     '''
     assert hasattr(node, 'value'), "Node does not have 'value' attribute, in check_attribute"
-    if isinstance(node.value, ast.Name) and node.value.id in RESTRICTED_MODULES:
-        raise Exception(f"Access to '{node.value.id}' module is not allowed")
+    for message in attribute_violations(node):
+        raise Exception(message)
 
 def check_variable_redefinition(node):
     '''
@@ -62,13 +144,48 @@ def check_variable_redefinition(node):
     
     Raises:
     -------
-    Exception: If a restricted variable is redefined
+    Exception: If a restricted variable is redefined, including in an unpacking such as "myList, x = ..."
     '''
     assert hasattr(node, 'targets') and isinstance(node.targets, list), "Node does not have 'targets' attribute or it is not a list, in check_variable_redefinition"
     for target in node.targets:
-        if isinstance(target, ast.Name) and target.id in RESTRICTED_VARIABLES:
-            raise Exception(f"Redefining '{target.id}' variable is not allowed")
-  
+        for child in ast.walk(target):
+            if isinstance(child, ast.Name):
+                for message in name_violations(child):
+                    raise Exception(message)
+
+def find_violations(node) -> list:
+    '''
+    Finds all the restricted imports, attributes, and variable redefinitions of an AST
+    
+    Parameters:
+    -----------
+    node: ast.Module
+    
+    Return:
+    -------
+    violations: The (line, message) pair of each violation, sorted by line (list)
+    
+    Note:
+    -----
+    The whole tree is walked exactly once, with an explicit stack, and the check of each node is found in the
+    NODE_CHECKS table, so the time is linear in the size of the AST. Nodes without a line number are reported on line 0.
+    '''
+    assert isinstance(node, ast.AST), f"Expected ast.AST, got {type(node)}, in find_violations"
+    violations = []
+    stack = [node]
+    while stack:
+        child = stack.pop()
+        check = NODE_CHECKS.get(type(child))
+        if check is not None:
+            position = (getattr(child, 'lineno', 0), getattr(child, 'col_offset', 0))
+            for message in check(child):
+                violations.append((position, message))
+        stack.extend(ast.iter_child_nodes(child))
+    
+    # The stack visits the nodes in reverse order, the violations are sorted by position in the code
+    violations.sort(key=lambda violation: violation[0])
+    return [(position[0], message) for position, message in violations]
+
 def check_node(node):
     '''
     Checks the AST node for restricted imports, attributes, and variable redefinitions
@@ -79,21 +196,14 @@ def check_node(node):
     
     Raises:
     -------
-    Exception: If a restricted module is imported, accessed, or used in a call
+    Exception: If a restricted module is imported or accessed, or a restricted variable is redefined
     
     Note:
     -----
-    This function traverses the AST node and its children to ensure that no restricted modules
-    are imported, accessed, or used in a call. It also checks for redefinitions of certain variables.
-    It raises an exception if any restricted module is found.
+    The whole tree is checked (see find_violations), including the bodies of functions, loops and conditions,
+    and the nested expressions. The message of the exception gives every violation, one per line, with its line number.
     '''
     assert hasattr(node, 'body') and isinstance(node.body, list), "Node does not have 'body' attribute or it is not a list, in check_node"
-    for child in node.body:
-        if isinstance(child, ast.Import):
-            check_import(child)
-        elif isinstance(child, ast.ImportFrom):
-            check_import_from(child)
-        elif isinstance(child, ast.Attribute):
-            check_attribute(child)
-        elif isinstance(child, ast.Assign):
-            check_variable_redefinition(child)
\ No newline at end of file
+    violations = find_violations(node)
+    if violations:
+        raise Exception("\n".join(f"Line {line}: {message}" for line, message in violations))
@@ -0,0 +1,81 @@
+from array import array
+
+# Layout of the result of an execution, as a single buffer of doubles (see pack_result)
+RESULT_FORMAT_VERSION = 1
+RESULT_HEADER_SIZE = 8      # version, listLength, time, compareCount, swapCount, readCount, writeCount, extraCount
+
+def pack_result(myList, final_time : float, counts : list, extras : list) -> array:
+    '''
+    Packs the result of an execution in a single buffer of doubles, which crosses the thread boundary at once
+    
+    Parameters:
+    -----------
+    myList: The final list, or its downsampled view (array | list)
+    final_time: The execution time, in seconds (float)
+    counts: [compareCount, swapCount, readCount, writeCount] (list)
+    extras: The optional results, each being a list of numbers, or a list of numbers and lists of numbers (list)
+    
+    Return:
+    -------
+    buffer: The header (RESULT_HEADER_SIZE values), the list, then each extra (array)
+    
+    Note:
+    -----
+    Each extra is written as its number of parts, then each part as its length and its values. An extra made
+    of numbers only is a single part, otherwise each of its items is a part (a number is a part of length 1).
+    The doubles hold the integers exactly up to 2^53, like the numbers of JavaScript.
+    '''
+    assert len(counts) == 4, f"Expected 4 counts, got {len(counts)}, in pack_result"
+    
+    buffer = array('d', [RESULT_FORMAT_VERSION, len(myList), final_time, *counts, len(extras)])
+    buffer.extend(map(float, myList))
+    
+    for extra in extras:
+        parts = [extra] if all(isinstance(item, (int, float)) for item in extra) else extra
+        buffer.append(len(parts))
+        for part in parts:
+            part = [part] if isinstance(part, (int, float)) else part
+            buffer.append(len(part))
+            buffer.extend(map(float, part))
+    
+    return buffer
+
+def unpack_result(buffer) -> list:
+    '''
+    Unpacks the result of an execution packed by pack_result
+    
+    Parameters:
+    -----------
+    buffer: The buffer of doubles (array | memoryview | list)
+    
+    Return:
+    -------
+    result: [myList, final_time, compareCount, swapCount, readCount, writeCount] followed by the extras, myList being
+    an array of doubles and each extra a list of parts, which are lists of numbers (list)
+    
+    Raises:
+    -------
+    Exception: If the buffer is truncated, or was packed by another version of pack_result
+    '''
+    if len(buffer) < RESULT_HEADER_SIZE or buffer[0] != RESULT_FORMAT_VERSION:
+        raise Exception("Invalid result buffer, in unpack_result")
+    
+    listLength, extraCount = int(buffer[1]), int(buffer[7])
+    offset = RESULT_HEADER_SIZE + listLength
+    result = [array('d', buffer[RESULT_HEADER_SIZE:offset]), buffer[2]] + [int(count) for count in buffer[3:7]]
+    
+    try:
+        for _ in range(extraCount):
+            parts = []
+            partCount, offset = int(buffer[offset]), offset + 1
+            for _ in range(partCount):
+                length, offset = int(buffer[offset]), offset + 1
+                parts.append(list(buffer[offset:offset + length]))
+                offset += length
+            result.append(parts)
+    except IndexError:
+        raise Exception("Invalid result buffer, in unpack_result")
+    
+    if offset != len(buffer):
+        raise Exception("Invalid result buffer, in unpack_result")
+    return result
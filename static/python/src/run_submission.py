@@ -0,0 +1,201 @@
+import argparse, json, signal, sys
+from array import array
+from contextlib import contextmanager
+
+try:
+    from . import worker
+    from .result_buffer import unpack_result
+except ImportError:
+    # Executed as a script: python3 static/python/src/run_submission.py
+    import worker
+    from result_buffer import unpack_result
+
+# Modes of run_submission, the first two are the execution modes of execute_code
+RUN_MODES = [worker.RECORDED_MODE, worker.TIMED_MODE, "benchmark", "scaling"]
+DEFAULT_DESCRIPTOR = "random:1000:42"
+
+# Outside of the browser, the submissions are not sandboxed (see run_submission)
+SANDBOX_WARNING = ("Warning: the submission is executed by the Python interpreter of this machine, with the permissions "
+                   "of the current user. It is only checked by check_node, which does not block every way to reach the "
+                   "system (e.g. __import__, importlib or open). Only run trusted code, or run this tool in a disposable "
+                   "container or virtual machine without network access.")
+
+@contextmanager
+def interruptAfter(seconds : float):
+    '''
+    Raises a KeyboardInterrupt in the code executed in the block after the given time, as the interrupt buffer of the browser
+    
+    Parameters:
+    -----------
+    seconds: The time budget, 0 if unlimited (float)
+    
+    Note:
+    -----
+    The KeyboardInterrupt is handled by the execution engine, which reports INTERRUPTED_MESSAGE. The budget is ignored
+    on the systems without signal.setitimer (Windows), and outside of the main thread.
+    '''
+    assert seconds >= 0, f"Expected non-negative number, got {seconds}, in interruptAfter"
+    if not seconds or not hasattr(signal, 'setitimer'):
+        yield
+        return
+    
+    def interrupt(signum, frame):
+        raise KeyboardInterrupt
+    
+    previous = signal.signal(signal.SIGALRM, interrupt)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def run_submission(code : str, descriptor : str = DEFAULT_DESCRIPTOR, mode : str = worker.RECORDED_MODE, maxOperations : int = 0,
+                   timeout : float = 0, runs : int = worker.BENCHMARK_RUNS, warmups : int = worker.BENCHMARK_WARMUPS) -> dict:
+    '''
+    Executes a submission with the execution engine of the worker, on native CPython
+    
+    Parameters:
+    -----------
+    code: The code of the submission (str)
+    descriptor: The descriptor of the list, see generate_list (str) (default = DEFAULT_DESCRIPTOR)
+    mode: One of RUN_MODES (str) (default = RECORDED_MODE)
+    maxOperations: The maximum number of operations of a recorded or timed execution, 0 if unlimited (int) (default = 0)
+    timeout: The time budget, in seconds, 0 if unlimited (float) (default = 0)
+    runs: The number of measured executions of the benchmark (int) (default = BENCHMARK_RUNS)
+    warmups: The number of executions of the benchmark done before measuring (int) (default = BENCHMARK_WARMUPS)
+    
+    Return:
+    -------
+    result: The result of the execution (dict), with "error" if it failed, else:
+        - recorded: sorted, time, compares, swaps, reads, writes
+        - timed: sorted, time, compares, swaps, reads, writes, without the cost of the trace
+        - benchmark: raw and corrected, the statistics described by BENCHMARK_FIELDS, overheads, in nanoseconds per call
+          of each primitive of OVERHEAD_PRIMITIVES, and reliable, False if the corrected times are the raw times
+        - scaling: shapes, for each kind of list, as returned by scaling_code
+    
+    Note:
+    -----
+    The worker uses a NullHost, so nothing is displayed nor sent, and the errors are kept in its messages.
+    The code is NOT sandboxed: in the browser, it runs in the WebAssembly sandbox of Pyodide, but here it runs on
+    native CPython, with the permissions of the current user, and check_node is the only guard (see SANDBOX_WARNING).
+    '''
+    assert isinstance(code, str), f"Expected str, got {type(code)}, in run_submission"
+    assert mode in RUN_MODES, f"Expected one of {RUN_MODES}, got {mode}, in run_submission"
+    
+    worker.reset_state()
+    messageCount = len(worker.host.messages)
+    # The complexity estimation generates its own lists
+    result = {"mode": mode, "list": descriptor if mode != "scaling" else None}
+    
+    try:
+        with interruptAfter(timeout):
+            if mode == worker.RECORDED_MODE:
+                output = worker.execute_code(code, descriptor, worker.RECORDED_MODE, maxOperations)
+            elif mode == worker.TIMED_MODE:
+                output = worker.execute_code(code, descriptor, worker.TIMED_MODE, maxOperations)
+            elif mode == "benchmark":
+                output = worker.benchmark_code(code, descriptor, runs, warmups)
+            else:
+                output = worker.scaling_code(code)
+    except KeyboardInterrupt:
+        # The time budget ended outside of the submission, e.g. while generating the list
+        result["error"] = worker.INTERRUPTED_MESSAGE
+        return result
+    except Exception as e:
+        # The list is checked before the execution (see defineGlobals)
+        result["error"] = str(e)
+        return result
+    
+    if output is None:
+        errors = worker.host.messages[messageCount:]
+        result["error"] = errors[-1] if errors else "The execution failed"
+        return result
+    
+    if mode == worker.RECORDED_MODE:
+        myList, elapsed, compares, swaps, reads, writes = unpack_result(output)[:6]
+        result["sorted"] = myList == array('d', sorted(worker.generatedList(descriptor)))
+        result.update(time=elapsed, compares=compares, swaps=swaps, reads=reads, writes=writes)
+    elif mode == worker.TIMED_MODE:
+        # The timed execution only returns its time, its list is still the traced list of the worker
+        result["sorted"] = worker.tracedList == array('q', sorted(worker.generatedList(descriptor)))
+        result.update(time=output, compares=worker.compareCount, swaps=worker.swapCount, reads=worker.readCount, writes=worker.writeCount)
+    elif mode == "benchmark":
+        fields = worker.BENCHMARK_FIELDS
+        result["raw"] = dict(zip(fields, output[:len(fields)]))
+        result["corrected"] = dict(zip(fields, output[len(fields):2 * len(fields)]))
+        overheads = output[2 * len(fields):-1]
+        result["overheads"] = dict(zip(worker.OVERHEAD_PRIMITIVES, overheads))
+        result["reliable"] = bool(output[-1])
+    else:
+        result["shapes"] = output
+    
+    return result
+
+def formatResult(result : dict) -> str:
+    '''
+    Formats the result of run_submission for the terminal
+    
+    Parameters:
+    -----------
+    result: The result of run_submission (dict)
+    
+    Return:
+    -------
+    text: The result, one value per line (str)
+    '''
+    assert isinstance(result, dict), f"Expected dict, got {type(result)}, in formatResult"
+    target = f" on {result['list']}" if result['list'] else ""
+    lines = [f"{result['mode']}{target} ({sys.implementation.name} {sys.version.split()[0]})"]
+    
+    if "error" in result:
+        lines.append(f"error: {result['error']}")
+    elif "shapes" in result:
+        for shape, sizes, times, *_, timeExponent, timeR2, nlognR2, operationExponent in result["shapes"]:
+            lines.append(f"{shape}: time ~ n^{timeExponent:.2f} (R² {timeR2:.3f}, n log n R² {nlognR2:.3f}), operations ~ n^{operationExponent:.2f}, up to n = {sizes[-1]}")
+    elif "raw" in result:
+        for name in ("raw", "corrected") if result["reliable"] else ("raw",):
+            values = result[name]
+            lines.append(f"{name}: median {values['median']:.6f} s, mean {values['mean']:.6f} s ± {values['stddev']:.6f} s, min {values['min']:.6f} s ({values['runs']} runs)")
+        estimates = ", ".join(f"{overhead:.0f} ns per {name}" for name, overhead in result["overheads"].items())
+        lines.append(f"overhead: {estimates}" + ("" if result["reliable"] else " (unreliable, the correction is not applied)"))
+    else:
+        if "sorted" in result:
+            lines.append(f"sorted: {result['sorted']}")
+        lines.append(f"time: {result['time']:.6f} s")
+        lines.append(f"operations: {result['compares']} compares, {result['swaps']} swaps, {result['reads']} reads, {result['writes']} writes")
+    
+    return "\n".join(lines)
+
+def main(argv : list = None) -> int:
+    '''
+    Runs a submission file from the command line, see --help
+    
+    Parameters:
+    -----------
+    argv: The arguments, without the name of the program, None for sys.argv (list) (default = None)
+    
+    Return:
+    -------
+    status: 0 if the execution succeeded, 1 if it failed (int)
+    '''
+    parser = argparse.ArgumentParser(description="Executes a sorting submission with the execution engine of the worker, on native CPython.", epilog=SANDBOX_WARNING)
+    parser.add_argument("submission", help="the Python file of the submission, which sorts myList")
+    parser.add_argument("--list", default=DEFAULT_DESCRIPTOR, help=f"the descriptor of the list, kind:n:seed[:parameter] (default: {DEFAULT_DESCRIPTOR})")
+    parser.add_argument("--mode", choices=RUN_MODES, default=worker.RECORDED_MODE, help="the kind of execution (default: recorded)")
+    parser.add_argument("--max-operations", type=int, default=0, help="the maximum number of operations of a recorded or timed execution (default: unlimited)")
+    parser.add_argument("--timeout", type=float, default=0, help="the time budget, in seconds (default: unlimited)")
+    parser.add_argument("--runs", type=int, default=worker.BENCHMARK_RUNS, help="the number of measured executions of the benchmark")
+    parser.add_argument("--warmups", type=int, default=worker.BENCHMARK_WARMUPS, help="the number of executions of the benchmark done before measuring")
+    parser.add_argument("--json", action="store_true", help="print the result as a JSON object")
+    args = parser.parse_args(argv)
+    
+    with open(args.submission, encoding="utf-8") as file:
+        code = file.read()
+    
+    result = run_submission(code, args.list, args.mode, args.max_operations, args.timeout, args.runs, args.warmups)
+    print(json.dumps(result) if args.json else formatResult(result))
+    return 1 if "error" in result or result.get("sorted") is False else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+import json, math
+
+# Relative accuracy of the quantiles estimated by RunningStats
+SKETCH_ACCURACY = 0.01
+
+class RunningStats:
+    '''
+    Incremental statistics about the execution times
+    
+    Attributes:
+    -----------
+    count: The number of execution times (int)
+    mean: The mean of the execution times (float)
+    m2: The sum of the squared differences to the mean (float)
+    buckets: The number of execution times in each bucket of the quantile sketch (dict)
+    zeros: The number of execution times equal to 0 (int)
+    
+    Note:
+    -----
+    The mean and the variance are updated with Welford's algorithm, and the quantiles are estimated with a
+    logarithmic sketch: each time x goes to the bucket ceil(log(x) / log(gamma)), so every estimated quantile is
+    within SKETCH_ACCURACY (relative error) of the real one. Adding a time costs O(1), whatever the number of executions.
+    The statistics can be saved as JSON (in the localStorage), and merged with the statistics of another session.
+    The statistics rebuilt from the displayed stats (see fromSummary) have no quantile sketch: their quantiles only
+    cover the times added afterwards (see sketchCount).
+    '''
+    gamma = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.buckets = {}
+        self.zeros = 0
+    
+    def push(self, value : float):
+        '''
+        Adds an execution time to the statistics
+        
+        Parameters:
+        -----------
+        value: The execution time (float)
+        '''
+        assert value >= 0, f"Expected non-negative time, got {value}, in push"
+        
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        
+        if value == 0:
+            self.zeros += 1
+        else:
+            index = math.ceil(math.log(value) / math.log(self.gamma))
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+    
+    @property
+    def variance(self) -> float:
+        '''
+        The (population) variance of the execution times
+        '''
+        return self.m2 / self.count if self.count > 0 else 0.0
+    
+    @property
+    def standardDeviation(self) -> float:
+        '''
+        The (population) standard deviation of the execution times
+        '''
+        return self.variance ** 0.5
+    
+    @property
+    def sketchCount(self) -> int:
+        '''
+        The number of execution times in the quantile sketch, lower than count if the statistics were rebuilt by fromSummary
+        '''
+        return self.zeros + sum(self.buckets.values())
+    
+    def quantile(self, q : float) -> float:
+        '''
+        Estimates a quantile of the execution times
+        
+        Parameters:
+        -----------
+        q: The quantile, between 0 and 1 (e.g. 0.5 for the median) (float)
+        
+        Return:
+        -------
+        value: The estimated quantile of the times of the sketch (see sketchCount), 0 if the sketch is empty (float)
+        '''
+        assert 0 <= q <= 1, f"Expected quantile between 0 and 1, got {q}, in quantile"
+        sketchCount = self.sketchCount
+        if sketchCount == 0:
+            return 0.0
+        
+        rank = q * (sketchCount - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Middle of the bucket ]gamma^(index - 1), gamma^index]
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+    
+    def merge(self, other : "RunningStats") -> "RunningStats":
+        '''
+        Merges the statistics of another session into these statistics
+        
+        Parameters:
+        -----------
+        other: The statistics to merge (RunningStats)
+        
+        Return:
+        -------
+        self: The merged statistics (RunningStats)
+        
+        Note:
+        -----
+        The mean and M2 are combined with Chan's parallel formula, and the buckets of the sketches are summed, so the
+        result is the same as if every time of both sessions had been pushed into a single instance.
+        '''
+        assert isinstance(other, RunningStats), f"Expected RunningStats, got {type(other)}, in merge"
+        if other.count == 0:
+            return self
+        
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        
+        self.zeros += other.zeros
+        for index, bucketCount in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + bucketCount
+        return self
+    
+    def toJSON(self) -> str:
+        '''
+        Serializes the statistics, to save them in the localStorage
+        
+        Return:
+        -------
+        text: The statistics, as JSON (str)
+        '''
+        return json.dumps({"count": self.count, "mean": self.mean, "m2": self.m2, "zeros": self.zeros, "buckets": self.buckets})
+    
+    @classmethod
+    def fromJSON(cls, text : str) -> "RunningStats":
+        '''
+        Restores the statistics saved by toJSON
+        
+        Parameters:
+        -----------
+        text: The statistics, as JSON (str)
+        
+        Return:
+        -------
+        stats: The restored statistics (RunningStats)
+        '''
+        data = json.loads(text)
+        stats = cls()
+        stats.count, stats.mean, stats.m2, stats.zeros = data["count"], data["mean"], data["m2"], data["zeros"]
+        stats.buckets = {int(index): bucketCount for index, bucketCount in data["buckets"].items()}
+        return stats
+    
+    @classmethod
+    def fromSummary(cls, count : int, mean : float, standardDeviation : float) -> "RunningStats":
+        '''
+        Restores the mean and the variance from the statistics displayed in the window (the quantile sketch is empty)
+        
+        Parameters:
+        -----------
+        count: The number of execution times (int)
+        mean: The mean of the execution times (float)
+        standardDeviation: The (population) standard deviation of the execution times (float)
+        
+        Return:
+        -------
+        stats: The restored statistics (RunningStats)
+        '''
+        stats = cls()
+        if count > 0:
+            stats.count, stats.mean, stats.m2 = count, mean, standardDeviation ** 2 * count
+        return stats
+    
+    @classmethod
+    def restore(cls, text : str, count : int, mean : float, standardDeviation : float) -> "RunningStats":
+        '''
+        Restores the saved statistics, or rebuilds them from the statistics displayed in the window
+        
+        Parameters:
+        -----------
+        text: The saved statistics, or None (str)
+        count: The number of execution times displayed in the window (int)
+        mean: The mean displayed in the window (float)
+        standardDeviation: The standard deviation displayed in the window (float)
+        
+        Return:
+        -------
+        stats: The restored statistics (RunningStats)
+        
+        Note:
+        -----
+        The saved statistics are only kept when they contain as many execution times as the window, otherwise
+        (e.g. after a reset of the stats) only the mean and the variance can be restored (see fromSummary).
+        '''
+        if text is not None:
+            stats = cls.fromJSON(text)
+            if stats.count == count:
+                return stats
+        return cls.fromSummary(count, mean, standardDeviation)
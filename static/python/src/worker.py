@@ -1,284 +1,2070 @@
-from pyscript import document, sync       # type: ignore
-from time import time, sleep
-from js import postMessage                # type: ignore
-import pyodide, copy, ast                 # type: ignore
+from time import perf_counter_ns, time
+
+# Timestamps of the boot of the worker, in seconds since the epoch: start of worker.py, end of the imports
+# and end of worker.py (see boot_times)
+bootTimes = [time()]
+
+from array import array
+from collections import OrderedDict
+from types import CodeType
+import ast, statistics, math, hashlib, sys
+
+try:
+    from pyscript import document, sync       # type: ignore
+    from js import postMessage                # type: ignore
+    from pyodide_js import setInterruptBuffer  # type: ignore
+    import pyodide                            # type: ignore
+except ImportError:
+    # Native CPython (see NullHost and run_submission.py). In the browser, a failed import is a real error,
+    # which must not silently disconnect the worker from the main thread
+    if sys.platform == "emscripten":
+        raise
+    pyodide = None
+
+try:
+    import tracemalloc
+except ImportError:
+    # The memory can not be measured (see execute_code)
+    tracemalloc = None
+
+bootTimes.append(time())
 
 # from restricted_checks import check_node
-# This import does not work for some reason. The functions from the restricted_checks module are copied below
+# from generators import generate_list
+# from result_buffer import pack_result
+# This import does not work for some reason. The functions from the restricted_checks, generators and result_buffer modules are copied below
 # However, I respected the pyscript documentation relative to the configuration.
 # See : https://docs.pyscript.net/2025.3.1/user-guide/configuration/#files
 
+class PyScriptHost:
+    '''
+    Host of the execution engine in the browser: the main thread is reached through pyscript's sync and postMessage
+    
+    Note:
+    -----
+    Every access of the execution engine to the browser goes through the host (see host), so the engine can also
+    run on native CPython with a NullHost.
+    '''
+    def postMessage(self, message : str) -> None:
+        '''
+        Sends an error message to the main thread, where it is handled
+        
+        Parameters:
+        -----------
+        message: The message (str)
+        '''
+        postMessage(message)
+    
+    def receiveTrace(self, chunk : array) -> None:
+        '''
+        Sends a chunk of recorded operations to the main thread, as a BigInt64Array (see flushTrace)
+        
+        Parameters:
+        -----------
+        chunk: The operations, as (operation, i, j) triples (array)
+        '''
+        sync.receiveTrace(pyodide.ffi.to_js(chunk))
+    
+    def updateDecimated(self, view : array) -> None:
+        '''
+        Sends a downsampled view of the list to the main thread, as a Float64Array (see sendFrame)
+        
+        Parameters:
+        -----------
+        view: The minimum and the maximum of each bucket, interleaved (array)
+        '''
+        sync.updateDecimated(pyodide.ffi.to_js(view))
+    
+    def updateCounts(self, compareCount : int, swapCount : int) -> None:
+        '''
+        Displays the compare and swap counts of a timed execution
+        
+        Parameters:
+        -----------
+        compareCount: The number of compares (int)
+        swapCount: The number of swaps (int)
+        '''
+        sync.updateCompareCount(compareCount)
+        sync.updateSwapCount(swapCount)
+    
+    def toTransferable(self, buffer : array):
+        '''
+        Converts a buffer of doubles to the typed array returned to the main thread
+        
+        Parameters:
+        -----------
+        buffer: The buffer, see pack_result (array)
+        
+        Return:
+        -------
+        typedArray: The buffer, as a Float64Array (pyodide.ffi.JsProxy)
+        '''
+        return pyodide.ffi.to_js(buffer)
+    
+    def setOutput(self, html : str) -> None:
+        '''
+        Displays a message in the output div
+        
+        Parameters:
+        -----------
+        html: The message (str)
+        '''
+        outputDiv = document.getElementById('output')
+        assert outputDiv is not None, "Output div not found, in setOutput"
+        outputDiv.innerHTML = html
+    
+    def setInterruptBuffer(self, buffer) -> None:
+        '''
+        Registers the buffer shared with the main thread, see set_interrupt_buffer
+        
+        Parameters:
+        -----------
+        buffer: An Int32Array backed by a SharedArrayBuffer (pyodide.ffi.JsProxy)
+        '''
+        setInterruptBuffer(buffer)
+    
+    def toPython(self, value):
+        '''
+        Converts a value sent by the main thread to a Python value
+        
+        Parameters:
+        -----------
+        value: A typed array, another JavaScript object or a Python value (pyodide.ffi.JsBuffer | pyodide.ffi.JsProxy | object)
+        
+        Return:
+        -------
+        value: An array of doubles for a typed array, the converted JavaScript object, or the unchanged value (array | object)
+        
+        Note:
+        -----
+        A typed array is copied at once from its buffer, instead of element by element.
+        '''
+        if isinstance(value, pyodide.ffi.JsBuffer):
+            values = array('d')
+            values.frombytes(value.to_bytes())
+            return values
+        if isinstance(value, pyodide.ffi.JsProxy):
+            return value.to_py()
+        return value
+    
+    def expose(self, functions : dict) -> None:
+        '''
+        Makes the functions callable by the main thread, through worker.sync
+        
+        Parameters:
+        -----------
+        functions: The functions, by name (dict)
+        '''
+        for name, function in functions.items():
+            setattr(sync, name, function)
+
+class NullHost(PyScriptHost):
+    '''
+    Host of the execution engine on native CPython, without main thread: nothing is displayed nor sent
+    
+    Attributes:
+    -----------
+    messages: The error messages of the executions, in order (list)
+    traceLength: The number of operations given to receiveTrace (int)
+    
+    Note:
+    -----
+    The executions are stopped by a KeyboardInterrupt (Ctrl+C, or a signal, see run_submission.py) instead of
+    the interrupt buffer.
+    '''
+    def __init__(self):
+        self.messages = []
+        self.traceLength = 0
+    
+    def postMessage(self, message : str) -> None:
+        '''
+        Keeps the error message, see messages
+        '''
+        self.messages.append(message)
+    
+    def receiveTrace(self, chunk : array) -> None:
+        '''
+        Counts the recorded operations, which are dropped
+        '''
+        self.traceLength += len(chunk) // 3
+    
+    def updateDecimated(self, view : array) -> None:
+        pass
+    
+    def updateCounts(self, compareCount : int, swapCount : int) -> None:
+        pass
+    
+    def toTransferable(self, buffer : array) -> array:
+        '''
+        Returns the buffer, which can be unpacked by unpack_result (see result_buffer.py)
+        '''
+        return buffer
+    
+    def setOutput(self, html : str) -> None:
+        pass
+    
+    def setInterruptBuffer(self, buffer) -> None:
+        '''
+        Refuses the buffer, so set_interrupt_buffer returns False
+        '''
+        raise Exception("There is no interrupt buffer on native CPython")
+    
+    def toPython(self, value):
+        '''
+        Returns the value, as it already is a Python value
+        '''
+        return value
+    
+    def expose(self, functions : dict) -> None:
+        pass
+
+# The host of the execution engine, all the accesses to the browser go through it
+host = PyScriptHost() if pyodide is not None else NullHost()
+
 timedExecution = False
+streamTrace = True
 swapCount = 0
 compareCount = 0
+readCount = 0
+writeCount = 0
+tracedList = None       # The list whose operations are recorded in the trace, myList of the current execution
+
+# The budget and the views are only checked every 1024 compares or swaps (see checkpoint)
+CHECKPOINT_MASK = 1023
+operationBudget = 0     # Maximum number of compare, swap, get and set calls of the current execution, 0 if unlimited
+timeDeadline = 0        # perf_counter_ns after which the current execution is stopped, 0 if unlimited (see timeRun)
+
+# As KeyboardInterrupt, the budget exceptions derive from BaseException, so an `except Exception` of the user's code
+# does not catch them and the execution is really stopped
+class OperationBudgetExceeded(BaseException):
+    '''
+    Raised by checkpoint when an execution makes more calls than operationBudget
+    '''
+
+class TimeBudgetExceeded(BaseException):
+    '''
+    Raised by checkpoint when an execution outlives its time budget (see timeRun)
+    '''
+
+# Message sent to the main thread when the execution is interrupted (see set_interrupt_buffer)
+INTERRUPTED_MESSAGE = "Execution cancelled: it was stopped by the user or took too long"
+
+# Execution modes of execute_code
+ANIMATED_MODE = "animated"      # The trace is streamed to the main thread during the execution
+TIMED_MODE = "timed"            # The execution is timed, without recording the trace
+RECORDED_MODE = "recorded"      # The execution is timed and the trace is sent by large chunks, outside of the measured time
+DECIMATED_MODE = "decimated"    # The execution is timed and a downsampled view of the list is sent at a fixed frame rate
+EXECUTION_MODES = {ANIMATED_MODE, TIMED_MODE, RECORDED_MODE, DECIMATED_MODE}
+
+# Operations recorded in the trace, as (operation, i, j) triples
+TRACE_COMPARE = 0
+TRACE_SWAP = 1
+TRACE_READ = 2      # (TRACE_READ, i, i)
+TRACE_WRITE = 3     # (TRACE_WRITE, i, value)
+TRACE_CHUNK_SIZE = 4096     # Number of operations sent to the main thread at once
+RECORDED_CHUNK_SIZE = 65_536    # Number of operations kept by a recorded execution before they are sent (24 bytes each)
+
+trace = array('q')     # 64-bit, as the written values (TRACE_WRITE) are any value of the list
+
+# Downsampled view of the list, used for the large lists (see decimate and sendFrame)
+DECIMATION_BUCKETS = 512        # Number of (min, max) pairs of the view
+DECIMATION_FPS = 20             # Maximum number of views sent to the main thread per second
+DECIMATION_MAX_SHARE = 0.2      # Maximum share of the execution spent to build and send the views
+lastFrameTime = 0
+lastFrameCost = 0
+frameTime = 0       # Time spent to send the views and the recorded operations, subtracted from the execution time
+
+# Operations per index and per time bucket of an execution (see AccessCounters)
+ACCESS_BUCKETS = 2048               # Maximum number of values of the per-index counters sent to the main thread
+TIMELINE_BUCKETS = 256              # Number of time buckets of the time series
+TIMELINE_RESOLUTION = 1_000_000     # Initial duration of a time bucket, in nanoseconds
+accessCounters = None               # The counters of the current execution, None if the accesses are not counted
+
+# Cache of the checked and compiled user's codes, see compileUserCode
+CODE_CACHE_SIZE = 16
+codeCache = OrderedDict()
+
+# Cache of the lists generated from a descriptor, see generatedList
+LIST_CACHE_SIZE = 4
+listCache = OrderedDict()
+
+# Name of the file of the compiled user's code, used to find its lines (see LineProfiler)
+USER_CODE_FILENAME = "<user code>"
+
+# Default configuration of the benchmark
+BENCHMARK_RUNS = 20
+BENCHMARK_WARMUPS = 3
+
+# Statistics returned by benchmark_code, in this order
+BENCHMARK_FIELDS = ["min", "median", "mean", "stddev", "p95", "ciLow", "ciHigh", "runs"]
+
+# Number of calls used to measure the overhead of the primitives, see calibrate_overhead
+CALIBRATION_CALLS = 100_000
+
+# Primitives whose overhead is measured by calibrate_overhead, in this order
+OVERHEAD_PRIMITIVES = ["compare", "swap", "get", "set"]
+overheadCalibration = None      # The overheads measured in this worker, see calibrate_overhead
+
+# Default configuration of the scaling benchmark
+SCALING_SIZES = [100, 300, 1_000, 3_000, 10_000, 30_000, 100_000]
+SCALING_SHAPES = ["random", "reversed", "sorted"]
+SCALING_TIME_BUDGET = 2.0       # Larger sizes are skipped once an execution takes longer (in seconds)
+SCALING_SEED = 42
+
+# Two-sided 95% critical values of the Student t-distribution, by degrees of freedom (1.96 above 30)
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228,
+    11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131, 16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086,
+    21: 2.080, 22: 2.074, 23: 2.069, 24: 2.064, 25: 2.060, 26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042
+}
+
+def parse_and_restrict(code: str) -> ast.Module:
+    '''
+    Parses the code and restricts the imports and variable redefinitions.
+    
+    Parameters:
+    -----------
+    code: The code entered by the user in the editor (str)
+    
+    Return:
+    -------
+    parsed_code: The parsed code after restricting the imports and variable redefinitions (ast.Module)
+    
+    Notes:
+    ------
+    Exception: If an error occurs during restricting the imports and variable redefinitions
+    '''
+    assert isinstance(code, str), f"Expected str, got {type(code)}, in parse_and_restrict"
+    
+    parsed_code = ast.parse(code, mode='exec')
+    check_node(parsed_code)
+    return parsed_code
+  
+def compileUserCode(code: str):
+    '''
+    Parses, checks and compiles the user's code, using a cache keyed by a hash of the code
+    
+    Parameters:
+    -----------
+    code: The code entered by the user in the editor (str)
+    
+    Return:
+    -------
+    compiled_code: The compiled code, ready to be executed (code)
+    
+    Raises:
+    -------
+    Exception: If the code can not be parsed, or does not respect the restrictions (see parse_and_restrict)
+    
+    Note:
+    -----
+    The cache stores both the compiled code and the result of the checks, so an unchanged code (same click, or
+    benchmark runs) is neither parsed, checked nor compiled again, and a rejected code is rejected with the same message.
+    The key contains a fingerprint of the restriction rules, so the cached codes are invalidated when the rules change.
+    The cache is a LRU cache of at most CODE_CACHE_SIZE codes.
+    '''
+    assert isinstance(code, str), f"Expected str, got {type(code)}, in compileUserCode"
+    
+    key = (hashlib.sha256(code.encode()).hexdigest(), restrictionRulesFingerprint())
+    
+    if key in codeCache:
+        codeCache.move_to_end(key)
+        compiled_code, error = codeCache[key]
+    else:
+        try:
+            compiled_code, error = compile(parse_and_restrict(code), filename=USER_CODE_FILENAME, mode='exec'), None
+        except Exception as e:
+            compiled_code, error = None, str(e)
+        
+        codeCache[key] = (compiled_code, error)
+        if len(codeCache) > CODE_CACHE_SIZE:
+            codeCache.popitem(last=False)
+    
+    if error is not None:
+        raise Exception(error)
+    return compiled_code
+
+def restrictionRulesFingerprint() -> tuple:
+    '''
+    Returns a fingerprint of the restriction rules, used to invalidate the cache of compileUserCode
+    
+    Return:
+    -------
+    fingerprint: The restricted modules and variables (tuple)
+    '''
+    return (tuple(sorted(RESTRICTED_MODULES)), tuple(sorted(RESTRICTED_VARIABLES)))
+
+def compare(arr : list, i : int, j : int) -> bool:
+    '''
+    Compares two integers, returns True if arr[i] is less than or equal to arr[j], False otherwise.
+    
+    Parameters:
+    -----------
+    arr: The list in which the elements are to be compared (list)
+    i: The index of the first integer (int)
+    j: The index of the second integer (int)
+    
+    Return:
+    -------
+    result: True if arr[i] is less than or equal to arr[j], False otherwise (bool)
+    
+    Note:
+    ------
+    This function is available to the user's code
+    '''
+    assert isinstance(arr, (list, array)), f"Expected list, got {type(arr)}, in compare"
+    assert len(arr) > 0, "List should not be empty, in compare"
+    
+    assert isinstance(i, int) and not isinstance(i, bool), f"Expected int, got {type(i)}, in compare"
+    assert i < len(arr), f"Index {i} out of range, in compare"
+    assert i >= 0, f"Index {i} out of range, in compare"
+    
+    assert isinstance(j, int) and not isinstance(j, bool), f"Expected int, got {type(j)}, in compare"
+    assert j < len(arr), f"Index {j} out of range, in compare"
+    assert j >= 0, f"Index {j} out of range, in compare"
+    
+    if not timedExecution and arr is tracedList:
+        recordOperation(TRACE_COMPARE, i, j)
+        
+    updateCompareCount()
+    if not compareCount & CHECKPOINT_MASK:
+        checkpoint(arr)
+    return arr[i] <= arr[j]
+
+def updateCompareCount(reset=False) -> None:
+    '''
+    Updates the compare count
+    
+    Parameters:
+    -----------
+    reset: If True, the compare count is reset to 0 (bool)
+    '''
+    global compareCount
+    if reset:
+        compareCount = 0
+    else:
+        compareCount += 1
+
+def swap(arr: list, i: int, j: int):
+    '''
+    Swaps the elements at the given indices in the list
+    
+    Parameters:
+    -----------
+    arr: The list in which the elements are to be swapped (list)
+    i: The index of the first element (int)
+    j: The index of the second element (int)
+    
+    Note:
+    ------
+    This function is available to the user's code
+    '''    
+    assert isinstance(arr, (list, array)), f"Expected list, got {type(arr)}, in swap"
+    assert len(arr) > 0, "List should not be empty, in swap"
+    
+    assert isinstance(i, int) and not isinstance(i, bool), f"Expected int, got {type(i)}, in swap"
+    assert i < len(arr), f"Index {i} out of range, in swap"
+    assert i >= 0, f"Index {i} out of range, in swap"
+    
+    assert isinstance(j, int) and not isinstance(j, bool), f"Expected int, got {type(j)}, in swap"
+    assert j < len(arr), f"Index {j} out of range, in swap"
+    assert j >= 0, f"Index {j} out of range, in swap"
+    
+    arr[i], arr[j] = arr[j], arr[i]
+    
+    if not timedExecution and arr is tracedList:
+        recordOperation(TRACE_SWAP, i, j)
+    updateSwapCount() 
+    if not swapCount & CHECKPOINT_MASK:
+        checkpoint(arr)
+
+def checkpoint(arr, frames : bool = False) -> None:
+    '''
+    Checks the operation budget and, if needed, sends the recorded operations or a downsampled view of the list to the main thread
+    
+    Parameters:
+    -----------
+    arr: The list sorted by the user's code (array)
+    frames: If True, a downsampled view of the list is sent, see sendFrame (bool) (default = False)
+    
+    Raises:
+    -------
+    OperationBudgetExceeded: If the execution made more compare, swap, get and set calls than operationBudget
+    TimeBudgetExceeded: If the execution is still running after timeDeadline
+    
+    Note:
+    -----
+    This function is called by compare, swap, get and set every 1024 calls, so the budgets cost almost nothing.
+    The time series of the operations is also sampled here, when the accesses are counted (see AccessCounters).
+    '''
+    if operationBudget and compareCount + swapCount + readCount + writeCount > operationBudget:
+        raise OperationBudgetExceeded(f"Operation budget exceeded: more than {operationBudget} compare, swap, get and set calls")
+    if timeDeadline and perf_counter_ns() > timeDeadline:
+        raise TimeBudgetExceeded()
+    if not streamTrace and len(trace) >= 3 * RECORDED_CHUNK_SIZE:
+        sendRecordedTrace()
+    if accessCounters is not None:
+        accessCounters.sample()
+    if frames:
+        sendFrame(arr)
+
+def recordOperation(operation : int, i : int, j : int) -> None:
+    '''
+    Records an operation in the trace, the trace is sent to the main thread when it is full
+    
+    Parameters:
+    -----------
+    operation: The recorded operation, TRACE_COMPARE, TRACE_SWAP, TRACE_READ or TRACE_WRITE (int)
+    i: The index of the first element (int)
+    j: The index of the second element, or the written value for TRACE_WRITE (int)
+    '''
+    trace.append(operation)
+    trace.append(i)
+    trace.append(j)
+    if streamTrace and len(trace) >= 3 * TRACE_CHUNK_SIZE:
+        flushTrace()
+
+def flushTrace() -> None:
+    '''
+    Sends the recorded operations to the main thread, where they are replayed, and empties the trace
+    
+    Note:
+    -----
+    The trace is converted to typed arrays (BigInt64Array) of at most TRACE_CHUNK_SIZE operations, so a whole chunk
+    of operations crosses the thread boundary in a single call, instead of the whole list at each swap.
+    '''
+    chunkLength = 3 * TRACE_CHUNK_SIZE
+    for start in range(0, len(trace), chunkLength):
+        host.receiveTrace(trace[start:start + chunkLength])
+    del trace[:]
+
+def sendRecordedTrace() -> None:
+    '''
+    Sends the operations recorded so far by a recorded execution to the main thread, and empties the trace
+    
+    Note:
+    -----
+    The trace of a recorded execution is sent every RECORDED_CHUNK_SIZE operations (see checkpoint), so the worker
+    never keeps more than a few MB of it. As for the views (see sendFrame), the time spent to send it is added to
+    frameTime, which is subtracted from the execution time.
+    '''
+    global frameTime
+    start_time = perf_counter_ns()
+    flushTrace()
+    frameTime += perf_counter_ns() - start_time
+
+def updateSwapCount(reset = False) -> None:
+    '''
+    Updates the swap count
+    
+    Parameters:
+    -----------
+        reset: If True, the swap count is reset to 0 (bool)
+    '''
+    global swapCount
+    if reset :
+        swapCount = 0
+    else :
+        swapCount += 1
+        
+
+def checkIndex(arr, i : int, name : str) -> None:
+    '''
+    Checks that the list is a list of the user's code, and that the index is within its length
+    
+    Parameters:
+    -----------
+    arr: The list, myList or an auxiliary list (list)
+    i: The index (int)
+    name: The name of the calling function, used in the error messages (str)
+    
+    Raises:
+    -------
+    AssertionError: If the list or the index is not valid
+    '''
+    assert isinstance(arr, (list, array)), f"Expected list, got {type(arr)}, in {name}"
+    assert isinstance(i, int) and not isinstance(i, bool), f"Expected int, got {type(i)}, in {name}"
+    assert 0 <= i < len(arr), f"Index {i} out of range, in {name}"
+
+def getValue(arr, i : int) -> int:
+    '''
+    Reads an element of the list
+    
+    Parameters:
+    -----------
+    arr: The list to read, myList or an auxiliary list (list)
+    i: The index of the element (int)
+    
+    Return:
+    -------
+    value: The element at the given index (int)
+    
+    Note:
+    ------
+    This function is available to the user's code, as get
+    '''
+    checkIndex(arr, i, "get")
+    
+    if not timedExecution and arr is tracedList:
+        recordOperation(TRACE_READ, i, i)
+    updateReadCount()
+    if not readCount & CHECKPOINT_MASK:
+        checkpoint(arr)
+    return arr[i]
+
+def setValue(arr, i : int, value : int) -> None:
+    '''
+    Writes an element of the list
+    
+    Parameters:
+    -----------
+    arr: The list to write, myList or an auxiliary list (list)
+    i: The index of the element (int)
+    value: The new value of the element (int)
+    
+    Note:
+    ------
+    This function is available to the user's code, as set
+    '''
+    checkIndex(arr, i, "set")
+    assert isinstance(value, int) and not isinstance(value, bool), f"Expected int, got {type(value)}, in set"
+    
+    arr[i] = value
+    if not timedExecution and arr is tracedList:
+        recordOperation(TRACE_WRITE, i, value)
+    updateWriteCount()
+    if not writeCount & CHECKPOINT_MASK:
+        checkpoint(arr)
+
+def moveValue(source, i : int, destination, j : int) -> None:
+    '''
+    Copies an element of a list into another list, or into the same list
+    
+    Parameters:
+    -----------
+    source: The list to read, myList or an auxiliary list (list)
+    i: The index of the element to read (int)
+    destination: The list to write, myList or an auxiliary list (list)
+    j: The index of the element to write (int)
+    
+    Note:
+    ------
+    This function is available to the user's code, as move. It counts as one read and one write.
+    '''
+    setValue(destination, j, getValue(source, i))
+
+def allocate(n : int, value : int = 0) -> array:
+    '''
+    Allocates an auxiliary list, such as the buffer of a merge sort or the counts of a counting sort
+    
+    Parameters:
+    -----------
+    n: The length of the list (int)
+    value: The initial value of the elements (int) (default = 0)
+    
+    Return:
+    -------
+    auxiliary: A new list of n integers, which can be used with get, set, move, compare and swap (array)
+    
+    Note:
+    ------
+    This function is available to the user's code. The operations on the auxiliary lists are counted,
+    but only the operations on myList are animated.
+    '''
+    assert isinstance(n, int) and not isinstance(n, bool) and n >= 0, f"Expected non-negative int, got {n}, in allocate"
+    assert isinstance(value, int) and not isinstance(value, bool), f"Expected int, got {type(value)}, in allocate"
+    return array('q', [value]) * n
+
+def updateReadCount(reset = False) -> None:
+    '''
+    Updates the read count
+    
+    Parameters:
+    -----------
+    reset: If True, the read count is reset to 0 (bool)
+    '''
+    global readCount
+    if reset:
+        readCount = 0
+    else:
+        readCount += 1
+
+def updateWriteCount(reset = False) -> None:
+    '''
+    Updates the write count
+    
+    Parameters:
+    -----------
+    reset: If True, the write count is reset to 0 (bool)
+    '''
+    global writeCount
+    if reset:
+        writeCount = 0
+    else:
+        writeCount += 1
+
+def decimate(arr, buckets : int = DECIMATION_BUCKETS) -> array:
+    '''
+    Downsamples the list to the minimum and the maximum of each bucket
+    
+    Parameters:
+    -----------
+    arr: The list to downsample (array)
+    buckets: The number of buckets (int) (default = DECIMATION_BUCKETS)
+    
+    Return:
+    -------
+    view: The minimum and the maximum of each bucket, interleaved (array)
+    
+    Note:
+    -----
+    The view is an array of doubles, converted to a Float64Array by to_js, as an array of 64-bit integers
+    would be converted to a BigInt64Array. A list shorter than the number of buckets gives one bucket per element.
+    '''
+    assert isinstance(buckets, int) and buckets > 0, f"Expected positive int, got {buckets}, in decimate"
+    
+    n = len(arr)
+    buckets = min(buckets, n)
+    view = array('d')
+    for bucket in range(buckets):
+        values = arr[bucket * n // buckets:(bucket + 1) * n // buckets]
+        view.append(min(values))
+        view.append(max(values))
+    
+    return view
+
+def sendFrame(arr) -> None:
+    '''
+    Sends a downsampled view of the list to the main thread, if the last one is old enough
+    
+    Parameters:
+    -----------
+    arr: The list sorted by the user's code (array)
+    
+    Note:
+    -----
+    At most DECIMATION_FPS views are sent per second, and less for very large lists, so the views never take more than
+    DECIMATION_MAX_SHARE of the execution. The time spent to build and send the views is added to frameTime,
+    which is subtracted from the execution time.
+    '''
+    global lastFrameTime, lastFrameCost, frameTime
+    now = perf_counter_ns()
+    if now - lastFrameTime < max(1_000_000_000 // DECIMATION_FPS, lastFrameCost / DECIMATION_MAX_SHARE):
+        return
+    
+    host.updateDecimated(decimate(arr))
+    lastFrameTime = perf_counter_ns()
+    lastFrameCost = lastFrameTime - now
+    frameTime += lastFrameCost
+
+def makeFastPrimitives(target, record : bool = False, frames : bool = False, counters = None) -> tuple:
+    '''
+    Creates the trusted fast path of compare and swap, for the measured executions
+    
+    Parameters:
+    -----------
+    target: The list sorted by the user's code (array)
+    record: If True, the operations are recorded in the trace (bool) (default = False)
+    frames: If True, a downsampled view of the list is regularly sent to the main thread (bool) (default = False)
+    counters: If given, the operations are counted per index in it (AccessCounters) (default = None)
+    
+    Return:
+    -------
+    (fast_compare, fast_swap): The fast compare and swap functions, with the same signature as compare and swap (tuple)
+    
+    Note:
+    -----
+    The fast functions only do one combined check: the list is the target and both indices are ints within its length,
+    computed once. Any other call (another list, an index out of range, ...) goes through the checked compare or swap,
+    which raises the same clear error messages. The counters are updated inline, without calling updateCompareCount
+    or updateSwapCount.
+    '''
+    n = len(target)
+    compareHits = counters.compares if counters is not None else None
+    writeHits = counters.writes if counters is not None else None
+    
+    def fast_compare(arr, i, j):
+        global compareCount
+        if arr is target and type(i) is int and type(j) is int and 0 <= i < n and 0 <= j < n:
+            if record:
+                trace.append(TRACE_COMPARE)
+                trace.append(i)
+                trace.append(j)
+            if compareHits is not None:
+                compareHits[i] += 1
+                compareHits[j] += 1
+            compareCount += 1
+            if not compareCount & CHECKPOINT_MASK:
+                checkpoint(target, frames)
+            return arr[i] <= arr[j]
+        return compare(arr, i, j)
+    
+    def fast_swap(arr, i, j):
+        global swapCount
+        if arr is target and type(i) is int and type(j) is int and 0 <= i < n and 0 <= j < n:
+            arr[i], arr[j] = arr[j], arr[i]
+            if record:
+                trace.append(TRACE_SWAP)
+                trace.append(i)
+                trace.append(j)
+            if writeHits is not None:
+                writeHits[i] += 1
+                writeHits[j] += 1
+            swapCount += 1
+            if not swapCount & CHECKPOINT_MASK:
+                checkpoint(target, frames)
+            return
+        swap(arr, i, j)
+    
+    return (fast_compare, fast_swap)
+
+def makeFastAccessors(target, record : bool = False, frames : bool = False, counters = None) -> tuple:
+    '''
+    Creates the trusted fast path of get, set and move, for the measured executions
+    
+    Parameters:
+    -----------
+    target: The list sorted by the user's code (array)
+    record: If True, the operations on the target are recorded in the trace (bool) (default = False)
+    frames: If True, a downsampled view of the list is regularly sent to the main thread (bool) (default = False)
+    counters: If given, the operations on the target are counted per index in it (AccessCounters) (default = None)
+    
+    Return:
+    -------
+    (fast_get, fast_set, fast_move): The fast functions, with the same signature as get, set and move (tuple)
+    
+    Note:
+    -----
+    As in makeFastPrimitives, the fast functions only do one combined check, and any other call goes through the
+    checked functions. The auxiliary lists (see allocate) are not the target, so their operations are always checked.
+    '''
+    n = len(target)
+    readHits = counters.compares if counters is not None else None
+    writeHits = counters.writes if counters is not None else None
+    
+    def fast_get(arr, i):
+        global readCount
+        if arr is target and type(i) is int and 0 <= i < n:
+            if record:
+                trace.append(TRACE_READ)
+                trace.append(i)
+                trace.append(i)
+            if readHits is not None:
+                readHits[i] += 1
+            readCount += 1
+            if not readCount & CHECKPOINT_MASK:
+                checkpoint(target, frames)
+            return arr[i]
+        return getValue(arr, i)
+    
+    def fast_set(arr, i, value):
+        global writeCount
+        if arr is target and type(i) is int and 0 <= i < n and type(value) is int:
+            arr[i] = value
+            if record:
+                trace.append(TRACE_WRITE)
+                trace.append(i)
+                trace.append(value)
+            if writeHits is not None:
+                writeHits[i] += 1
+            writeCount += 1
+            if not writeCount & CHECKPOINT_MASK:
+                checkpoint(target, frames)
+            return
+        setValue(arr, i, value)
+    
+    def fast_move(source, i, destination, j):
+        fast_set(destination, j, fast_get(source, i))
+    
+    return (fast_get, fast_set, fast_move)
+
+def benchmark_primitives(calls : int = 100_000, size : int = 1_000) -> list:
+    '''
+    Measures the cost of one call of each variant of compare and swap
+    
+    Parameters:
+    -----------
+    calls: The number of calls measured for each variant (int) (default = 100_000)
+    size: The size of the list on which the calls are done (int) (default = 1_000)
+    
+    Return:
+    -------
+    costs: The cost of one call, in nanoseconds, of the checked compare, the fast compare, the checked swap
+           and the fast swap (list)
+    
+    Note:
+    -----
+    The calls are done in the timed mode (no trace). The cost of the loop itself is measured and subtracted.
+    '''
+    assert isinstance(calls, int) and calls > 0, f"Expected positive int, got {calls}, in benchmark_primitives"
+    assert isinstance(size, int) and size > 1, f"Expected int greater than 1, got {size}, in benchmark_primitives"
+    
+    arr = array('q', range(size))
+    fast_compare, fast_swap = makeFastPrimitives(arr)
+    indices = [(k % size, (k * 7 + 1) % size) for k in range(calls)]
+    
+    def measure(function) -> float:
+        start_time = perf_counter_ns()
+        for i, j in indices:
+            function(arr, i, j)
+        return (perf_counter_ns() - start_time) / calls
+    
+    global timedExecution
+    timedExecution = True
+    try:
+        loop = measure(lambda arr, i, j: None)
+        costs = [measure(function) - loop for function in (compare, fast_compare, swap, fast_swap)]
+    finally:
+        timedExecution = False
+        updateCompareCount(reset=True)
+        updateSwapCount(reset=True)
+    
+    return costs
+
+def calibrate_overhead(calls : int = CALIBRATION_CALLS, size : int = 1_000) -> list:
+    '''
+    Measures the overhead of the instrumented primitives, compared to the bare operations
+    
+    Parameters:
+    -----------
+    calls: The number of calls measured for each primitive (int) (default = CALIBRATION_CALLS)
+    size: The size of the list on which the calls are done (int) (default = 1_000)
+    
+    Return:
+    -------
+    overheads: The overhead of one call, in nanoseconds, of each primitive of OVERHEAD_PRIMITIVES (list)
+    
+    Note:
+    -----
+    The instrumented functions are the fast path used by the measured executions (see makeFastPrimitives and
+    makeFastAccessors). They are compared to the same loops with `arr[i] <= arr[j]`, `arr[i], arr[j] = arr[j], arr[i]`,
+    `arr[i]` and `arr[i] = value` inlined. Each loop is measured three times and the fastest measure is kept, to limit
+    the noise. The overheads are returned as measured: a negative overhead means that the noise was larger than
+    the overhead, and the correction based on it is not reliable (see benchmark_code).
+    '''
+    assert isinstance(calls, int) and calls > 0, f"Expected positive int, got {calls}, in calibrate_overhead"
+    assert isinstance(size, int) and size > 1, f"Expected int greater than 1, got {size}, in calibrate_overhead"
+    
+    arr = array('q', range(size))
+    fast_compare, fast_swap = makeFastPrimitives(arr)
+    fast_get, fast_set, _ = makeFastAccessors(arr)
+    indices = [(k % size, (k * 7 + 1) % size) for k in range(calls)]
+    
+    def bareCompare():
+        for i, j in indices:
+            arr[i] <= arr[j]
+    
+    def instrumentedCompare():
+        for i, j in indices:
+            fast_compare(arr, i, j)
+    
+    def bareSwap():
+        for i, j in indices:
+            arr[i], arr[j] = arr[j], arr[i]
+    
+    def instrumentedSwap():
+        for i, j in indices:
+            fast_swap(arr, i, j)
+    
+    def bareGet():
+        for i, j in indices:
+            arr[i]
+    
+    def instrumentedGet():
+        for i, j in indices:
+            fast_get(arr, i)
+    
+    def bareSet():
+        for i, j in indices:
+            arr[i] = j
+    
+    def instrumentedSet():
+        for i, j in indices:
+            fast_set(arr, i, j)
+    
+    def measure(loop) -> int:
+        best = None
+        for _ in range(3):
+            start_time = perf_counter_ns()
+            loop()
+            elapsed = perf_counter_ns() - start_time
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+    
+    loops = [(instrumentedCompare, bareCompare), (instrumentedSwap, bareSwap), (instrumentedGet, bareGet), (instrumentedSet, bareSet)]
+    
+    global timedExecution
+    timedExecution = True
+    try:
+        return [(measure(instrumented) - measure(bare)) / calls for instrumented, bare in loops]
+    finally:
+        timedExecution = False
+        updateCompareCount(reset=True)
+        updateSwapCount(reset=True)
+        updateReadCount(reset=True)
+        updateWriteCount(reset=True)
+
+def toIntArray(myList) -> array:
+    '''
+    Converts the list sent by the main thread to a compact array of 64-bit integers
+    
+    Parameter:
+    ----------
+    myList: The list, as a typed array (Float64Array), a JsProxy, a list or an array (pyodide.ffi.JsBuffer | pyodide.ffi.JsProxy | list | array)
+    
+    Return:
+    -------
+    values: A new array of 64-bit integers, with the same elements (array)
+    
+    Raises:
+    -------
+    AssertionError: If an element of the list is not an integer
+    
+    Note:
+    -----
+    The typed array sent by the main thread is copied at once from its buffer, then the elements are
+    converted and checked in a single pass done in C (no isinstance on each element).
+    '''
+    message = "All elements of the list should be integers, in toIntArray"
+    
+    values = host.toPython(myList)
+    
+    if isinstance(values, array) and values.typecode == 'q':
+        return array('q', values)
+    
+    if isinstance(values, array):
+        # Floating point numbers sent by JavaScript : NaN, infinities and decimals are rejected
+        try:
+            integers = array('q', map(int, values))
+        except (ValueError, OverflowError):
+            raise AssertionError(message)
+        assert array(values.typecode, integers) == values, message
+        return integers
+    
+    assert isinstance(values, list), f"Expected list, got {type(values)}, in toIntArray"
+    assert set(map(type, values)) <= {int}, message
+    return array('q', values)
+
+def generatedList(descriptor : str) -> array:
+    '''
+    Generates the list described by a descriptor, using a cache keyed by the descriptor
+    
+    Parameter:
+    ----------
+    descriptor: "kind:n:seed" or "kind:n:seed:parameter", see generate_list (str)
+    
+    Return:
+    -------
+    myList: A new copy of the generated list (array)
+    
+    Note:
+    -----
+    Generating a random list of a million elements takes about a second, while copying it takes a few milliseconds,
+    so the list is generated once for the repeated executions on the same list. The cache is a LRU cache of at most
+    LIST_CACHE_SIZE lists.
+    '''
+    assert isinstance(descriptor, str), f"Expected str, got {type(descriptor)}, in generatedList"
+    
+    if descriptor in listCache:
+        listCache.move_to_end(descriptor)
+    else:
+        listCache[descriptor] = generate_list(descriptor)
+        if len(listCache) > LIST_CACHE_SIZE:
+            listCache.popitem(last=False)
+    
+    return array('q', listCache[descriptor])
+
+def defineGlobals(myList) -> dict:
+    '''
+    Defines the global variables and builtins functions that can be accessed by the user's code
+    
+    Parameter:
+    ----------
+    myList: The list currently selected by the user, or the descriptor of a generated list, see generatedList
+            (pyodide.ffi.JsBuffer | pyodide.ffi.JsProxy | list | array | str)
+    
+    Return:
+    -------
+    exec_globals: The global variables and builtins functions that can be accessed by the user's code (dict)
+    
+    Note:
+    -----
+    The user's code receives myList as a compact array of 64-bit integers (array('q')), which is a flat copy
+    of the given list, or the list generated in the worker from the descriptor. It can be indexed, sliced and iterated like a list. Besides compare and swap, the user's code
+    can read and write the elements with get, set and move, and allocate auxiliary lists with allocate.
+    '''
+    myList = generatedList(myList) if isinstance(myList, str) else toIntArray(myList)
+    assert len(myList) > 0, "List should not be empty, in defineGlobals"
+    
+    assert callable(compare), f"Expected callable, got {type(compare)}, in defineGlobals"
+    assert callable(swap), f"Expected callable, got {type(swap)}, in defineGlobals"
+    
+    global tracedList
+    tracedList = myList
+    
+    exec_globals = {
+        '__builtins__': {
+            '__import__': __import__,
+            'range': range,
+            'len': len,
+            'int': int,
+            'float': float,
+            'str': str,
+            'list': list,
+            'bool': bool,
+            'min': min,
+            'max': max,
+            'all': all,
+            'any': any,
+            'abs': abs,
+            'sum': sum,
+            'round': round,
+            'reversed': reversed
+        },
+        'myList': myList,
+        'compare': compare,
+        'swap': swap,
+        'get': getValue,
+        'set': setValue,
+        'move': moveValue,
+        'allocate': allocate
+    }
+    
+    return exec_globals
+
+class AccessCounters:
+    '''
+    Counts the operations of the user's code per index of the list, and per time bucket of the execution
+    
+    Attributes:
+    -----------
+    compares: The number of comparisons and reads of each index (array)
+    writes: The number of writes of each index, a swap writing both of its indices (array)
+    timelineCompares: The number of comparisons and reads of each time bucket (array)
+    timelineSwaps: The number of swaps and writes of each time bucket (array)
+    bucketWidth: The duration of a time bucket, in nanoseconds (int)
+    startTime: The time at which the execution started (int)
+    endTime: The time at which the execution ended (int)
+    sampledCompares: The number of comparisons and reads already put in a time bucket (int)
+    sampledSwaps: The number of swaps and writes already put in a time bucket (int)
+    
+    Note:
+    -----
+    All the arrays are allocated before the execution. The per-index counters are incremented by the fast compare,
+    swap, get and set (see makeFastPrimitives and makeFastAccessors), and the time buckets are only filled by checkpoint, every 1024 operations.
+    When the execution outgrows the time buckets, their width is doubled and the buckets are merged by pairs, in place.
+    '''
+    def __init__(self, n : int):
+        assert isinstance(n, int) and n > 0, f"Expected positive int, got {n}, in AccessCounters"
+        
+        self.compares = array('q', bytes(8 * n))
+        self.writes = array('q', bytes(8 * n))
+        self.timelineCompares = array('q', bytes(8 * TIMELINE_BUCKETS))
+        self.timelineSwaps = array('q', bytes(8 * TIMELINE_BUCKETS))
+        self.bucketWidth = TIMELINE_RESOLUTION
+        self.startTime = 0
+        self.endTime = 0
+        self.sampledCompares = 0
+        self.sampledSwaps = 0
+    
+    def start(self):
+        '''
+        Starts the time series, at the start of the execution
+        '''
+        self.startTime = perf_counter_ns()
+    
+    def stop(self):
+        '''
+        Ends the time series, at the end of the execution
+        '''
+        self.endTime = perf_counter_ns()
+    
+    def sample(self):
+        '''
+        Puts the operations made since the last sample in the current time bucket
+        '''
+        bucket = (perf_counter_ns() - self.startTime) // self.bucketWidth
+        while bucket >= TIMELINE_BUCKETS:
+            for timeline in (self.timelineCompares, self.timelineSwaps):
+                for k in range(TIMELINE_BUCKETS // 2):
+                    timeline[k] = timeline[2 * k] + timeline[2 * k + 1]
+                for k in range(TIMELINE_BUCKETS // 2, TIMELINE_BUCKETS):
+                    timeline[k] = 0
+            self.bucketWidth *= 2
+            bucket //= 2
+        
+        compares, swaps = compareCount + readCount, swapCount + writeCount
+        self.timelineCompares[bucket] += compares - self.sampledCompares
+        self.timelineSwaps[bucket] += swaps - self.sampledSwaps
+        self.sampledCompares, self.sampledSwaps = compares, swaps
+    
+    def result(self) -> list:
+        '''
+        Returns the counters, the per-index ones being summed into at most ACCESS_BUCKETS buckets
+        
+        Return:
+        -------
+        counters: [compares, writes, timelineCompares, timelineSwaps, bucketWidth], the time series being cut after
+        the last used bucket and bucketWidth being in seconds (list)
+        '''
+        n = len(self.compares)
+        buckets = min(ACCESS_BUCKETS, n)
+        compares, writes = [], []
+        for bucket in range(buckets):
+            start, end = bucket * n // buckets, (bucket + 1) * n // buckets
+            compares.append(sum(self.compares[start:end]))
+            writes.append(sum(self.writes[start:end]))
+        
+        used = (self.endTime - self.startTime) // self.bucketWidth + 1
+        used = min(used, TIMELINE_BUCKETS)
+        return [compares, writes, self.timelineCompares[:used].tolist(), self.timelineSwaps[:used].tolist(), self.bucketWidth / 1e9]
+
+class LineProfiler:
+    '''
+    Counts the executions of each line of the user's code, and measures the time spent on it
+    
+    Attributes:
+    -----------
+    hits: The number of executions of each line, index 0 being the first line (array)
+    times: The time spent on each line, in nanoseconds (array)
+    codes: The code objects of the user's code, monitored by sys.monitoring (list)
+    lastLine: The line being executed, 0 before the first line (int)
+    lastTime: The time at which the line being executed started (int)
+    
+    Note:
+    -----
+    The time between two line events is charged to the first line, so a line includes its calls to compare, swap and
+    the built-in functions, but not the lines of the user's functions it calls. The time spent by the profiler itself
+    is not charged to any line, but it is included in the execution time of a profiled run.
+    sys.monitoring (Python 3.12+) is used when available: only the code objects of the user's code generate events,
+    so the rest of the worker runs at full speed. Otherwise, sys.settrace is used, filtered by the name of the file.
+    '''
+    def __init__(self, code : str):
+        assert isinstance(code, str), f"Expected str, got {type(code)}, in LineProfiler"
+        
+        lines = code.count("\n") + 1
+        self.hits = array('q', bytes(8 * lines))
+        self.times = array('q', bytes(8 * lines))
+        self.codes = []
+        self.lastLine = 0
+        self.lastTime = 0
+    
+    def lineEvent(self, code, line : int):
+        '''
+        Charges the time elapsed to the previous line, and starts the given line
+        
+        Parameters:
+        -----------
+        code: The code object being executed (code)
+        line: The number of the line about to be executed (int)
+        '''
+        now = perf_counter_ns()
+        if self.lastLine:
+            self.times[self.lastLine - 1] += now - self.lastTime
+        self.hits[line - 1] += 1
+        self.lastLine = line
+        self.lastTime = perf_counter_ns()
+    
+    def traceEvent(self, frame, event : str, arg):
+        '''
+        Trace function of sys.settrace, used when sys.monitoring is not available
+        '''
+        if frame.f_code.co_filename != USER_CODE_FILENAME:
+            return None
+        if event == 'line':
+            self.lineEvent(frame.f_code, frame.f_lineno)
+        return self.traceEvent
+    
+    def start(self, compiled_code):
+        '''
+        Starts to profile the user's code
+        
+        Parameters:
+        -----------
+        compiled_code: The compiled user's code, with its nested functions (code)
+        '''
+        monitoring = getattr(sys, 'monitoring', None)
+        if monitoring is None:
+            sys.settrace(self.traceEvent)
+            return
+        
+        monitoring.use_tool_id(monitoring.PROFILER_ID, "line profiler")
+        monitoring.register_callback(monitoring.PROFILER_ID, monitoring.events.LINE, self.lineEvent)
+        
+        # The functions, lambdas and classes of the user are stored in the constants of the compiled code
+        stack = [compiled_code]
+        while stack:
+            code = stack.pop()
+            self.codes.append(code)
+            monitoring.set_local_events(monitoring.PROFILER_ID, code, monitoring.events.LINE)
+            stack.extend(const for const in code.co_consts if isinstance(const, CodeType))
+    
+    def stop(self):
+        '''
+        Stops to profile the user's code, and charges the time elapsed to the last line
+        '''
+        now = perf_counter_ns()
+        monitoring = getattr(sys, 'monitoring', None)
+        if monitoring is None:
+            sys.settrace(None)
+        else:
+            for code in self.codes:
+                monitoring.set_local_events(monitoring.PROFILER_ID, code, 0)
+            monitoring.register_callback(monitoring.PROFILER_ID, monitoring.events.LINE, None)
+            monitoring.free_tool_id(monitoring.PROFILER_ID)
+            self.codes = []
+        
+        if self.lastLine:
+            self.times[self.lastLine - 1] += now - self.lastTime
+            self.lastLine = 0
+    
+    def result(self) -> list:
+        '''
+        Returns the profile of the lines
+        
+        Return:
+        -------
+        profile: The number of executions and the time in seconds of each line, interleaved:
+        [hits of line 1, time of line 1, hits of line 2, time of line 2, ...] (list)
+        '''
+        profile = []
+        for hits, duration in zip(self.hits, self.times):
+            profile += [hits, duration / 1e9]
+        return profile
+
+def execute_code(code, myList, mode=ANIMATED_MODE, maxOperations=0, profile=False, accesses=False, memory=False) -> list | float | None:
+    '''
+    Executes the user's code and returns the result
+    
+    Parameters:
+    -----------
+    code: The code entered by the user in the editor (str)
+    myList: The list currently selected by the user, or the descriptor of a generated list (list | str)
+    mode: The execution mode, ANIMATED_MODE, TIMED_MODE, RECORDED_MODE or DECIMATED_MODE (str) (default = ANIMATED_MODE)
+    maxOperations: The maximum number of compare and swap calls, 0 if unlimited (int) (default = 0)
+    profile: If True, the lines of the code are profiled, in RECORDED_MODE and DECIMATED_MODE only (bool) (default = False)
+    accesses: If True, the operations are counted per index and per time bucket, in RECORDED_MODE and DECIMATED_MODE only (bool) (default = False)
+    memory: If True, the peak memory allocated by the code is measured, in RECORDED_MODE and DECIMATED_MODE only (bool) (default = False)
+    
+    Return:
+    -------
+    If mode is ANIMATED_MODE: myList: The list after the code has been executed 
+    If mode is TIMED_MODE: final_time: The time taken to execute the code, in seconds (float)
+    If mode is RECORDED_MODE: [myList, final_time, compareCount, swapCount, readCount, writeCount], packed by pack_result (Float64Array)
+    If mode is DECIMATED_MODE: [view, final_time, compareCount, swapCount, readCount, writeCount], view being the downsampled final list,
+    packed by pack_result (Float64Array)
+    If profile is True, the profile of the lines is packed as the first extra (see LineProfiler.result)
+    If accesses is True, the counters of the operations are then packed as an extra (see AccessCounters.result)
+    If memory is True, [extraBytes, listBytes] is then packed as an extra: the peak memory allocated by the code,
+    and the size of myList, which is not included in extraBytes
+    If an error occurs: None
+    
+    Raises:
+    -------
+    Exception: If an error occurs during the execution of the code
+    
+    Note:
+    -----
+    The postMessage function of the host is used to send the error to the main thread, where it handles the error
+    '''
+    assert isinstance(code, str), f"Expected str, got {type(code)}, in execute_code"
+    assert mode in EXECUTION_MODES, f"Expected one of {EXECUTION_MODES}, got {mode}, in execute_code"
+    assert isinstance(maxOperations, int) and maxOperations >= 0, f"Expected non-negative int, got {maxOperations}, in execute_code"
+    assert not profile or mode in (RECORDED_MODE, DECIMATED_MODE), f"Profiling is not available in {mode} mode, in execute_code"
+    assert not accesses or mode in (RECORDED_MODE, DECIMATED_MODE), f"Counting the accesses is not available in {mode} mode, in execute_code"
+    assert not memory or mode in (RECORDED_MODE, DECIMATED_MODE), f"Measuring the memory is not available in {mode} mode, in execute_code"
+    
+    if memory and tracemalloc is None:
+        host.postMessage("The memory can not be measured in this browser")
+        return
+    
+    # Reset the compare, swap, read and write count, and the trace, for the new code execution
+    updateCompareCount(reset=True)
+    updateSwapCount(reset=True)
+    updateReadCount(reset=True)
+    updateWriteCount(reset=True)
+    del trace[:]
+    
+    # The list is converted and checked by defineGlobals
+    exec_globals = defineGlobals(myList)
+    assert exec_globals is not None, "Global variables not defined, in execute_code"
+    
+    # The timed executions do not access the DOM, as each access is a call to the main thread
+    if mode == ANIMATED_MODE:
+        host.setOutput("Executing code...")
+        
+    # The 'ast' module is used to parse the code and restrict the imports and variable redefinitions
+    try:
+        compiled_code = compileUserCode(code)
+    except Exception as e:
+        # Handle the case when an error occurs during the parsing of the code
+        host.postMessage(f"{str(e)}")
+        return
+    
+    # During the timed execution, compare and swap neither record the trace nor call the main thread,
+    # so only the algorithm itself is measured. The recorded execution keeps the trace, and sends it by large chunks.
+    # The decimated execution does not record the trace either, it sends downsampled views of the list instead.
+    global timedExecution, streamTrace, lastFrameTime, lastFrameCost, frameTime, operationBudget, accessCounters
+    timedExecution = mode in (TIMED_MODE, DECIMATED_MODE)
+    streamTrace = mode == ANIMATED_MODE
+    operationBudget = maxOperations
+    lastFrameCost = 0
+    frameTime = 0
+    
+    # The measured executions use the trusted fast path of compare and swap.
+    # When the memory is measured, neither the trace nor the views are built, as their memory would be counted.
+    if mode != ANIMATED_MODE:
+        counters = AccessCounters(len(exec_globals['myList'])) if accesses else None
+        record, frames = mode == RECORDED_MODE and not memory, mode == DECIMATED_MODE and not memory
+        exec_globals['compare'], exec_globals['swap'] = makeFastPrimitives(exec_globals['myList'], record=record, frames=frames, counters=counters)
+        exec_globals['get'], exec_globals['set'], exec_globals['move'] = makeFastAccessors(exec_globals['myList'], record=record, frames=frames, counters=counters)
+        accessCounters = counters
+    
+    profiler = LineProfiler(code) if profile else None
+    
+    try:
+        if profiler is not None:
+            profiler.start(compiled_code)
+        start_time = perf_counter_ns()
+        lastFrameTime = start_time
+        if accessCounters is not None:
+            accessCounters.start()
+        if memory:
+            # The list and the globals are allocated before the start, so only the memory of the code is traced
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+        exec(compiled_code, exec_globals)
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1]
+        end_time = perf_counter_ns()
+        if accessCounters is not None:
+            accessCounters.sample()
+            accessCounters.stop()
+    except KeyboardInterrupt:
+        # Handle the case when the main thread interrupts the execution
+        host.postMessage(INTERRUPTED_MESSAGE)
+        return
+    except (Exception, OperationBudgetExceeded) as e:
+        # Handle the case when an error occurs during the execution of the code, or when it exceeds its budget
+        host.postMessage(f"{str(e)}")
+        return
+    finally:
+        if memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        if profiler is not None:
+            profiler.stop()
+        timedExecution = False
+        streamTrace = True
+        operationBudget = 0
+        accessCounters = None
+    
+    # Convert the time from nanoseconds to seconds, without the time spent to send the views and the recorded operations
+    final_time = (end_time - start_time - frameTime) / 1e9
+    
+    if mode == TIMED_MODE:
+        # Update the compare and swap count in the front-end, once the run has ended
+        host.updateCounts(compareCount, swapCount)
+        return final_time
+    
+    # Send the (last) recorded operations to the main thread, where they are replayed
+    flushTrace()
+    
+    myList = exec_globals.get('myList')
+        
+    if myList is None:
+        # Handle the case when the list is not found
+        host.postMessage("List not found")
+        return
+    
+    extras = []
+    if profiler is not None:
+        extras.append(profiler.result())
+    if accesses:
+        extras.append(counters.result())
+    if memory:
+        extras.append([peak - baseline, sys.getsizeof(myList)])
+    
+    # The result crosses the thread boundary as a single buffer of doubles, without converting each element
+    counts = [compareCount, swapCount, readCount, writeCount]
+    if mode == DECIMATED_MODE:
+        return host.toTransferable(pack_result(decimate(myList), final_time, counts, extras))
+    if mode == RECORDED_MODE:
+        return host.toTransferable(pack_result(myList, final_time, counts, extras))
+    
+    # A list is sent back, as an array of 64-bit integers would be converted to a BigInt64Array
+    host.setOutput("Code executed successfully")
+    return myList.tolist()
+      
+def benchmark_code(code, myList, runs=BENCHMARK_RUNS, warmups=BENCHMARK_WARMUPS) -> list | None:
+    '''
+    Executes the user's code several times and returns statistics about the execution time
+    
+    Parameters:
+    -----------
+    code: The code entered by the user in the editor (str)
+    myList: The list currently selected by the user, or the descriptor of a generated list (list | str)
+    runs: The number of measured executions (int) (default = BENCHMARK_RUNS)
+    warmups: The number of executions done before measuring, which are not taken into account (int) (default = BENCHMARK_WARMUPS)
+    
+    Return:
+    -------
+    statistics: The values described by BENCHMARK_FIELDS for the raw times, then for the overhead-corrected times,
+                both in seconds, then the overheads of OVERHEAD_PRIMITIVES in nanoseconds, then 1 if the correction
+                is reliable, else 0 (list)
+    If an error occurs: None
+    
+    Note:
+    -----
+    The code is parsed, checked and compiled once. Each execution runs on a fresh copy of myList and a fresh
+    copy of the globals, in the timed mode, so no trace is recorded and the main thread is never called.
+    The overheads of the primitives are measured once per worker (see calibrate_overhead), and the corrected time
+    of an execution is its raw time minus, for each primitive, the number of calls multiplied by the overhead of one call.
+    The correction is not reliable when an overhead is negative or larger than a raw time: the corrected times are
+    then equal to the raw times, and the last value is 0.
+    '''
+    assert isinstance(code, str), f"Expected str, got {type(code)}, in benchmark_code"
+    assert isinstance(runs, int) and runs > 0, f"Expected positive int, got {runs}, in benchmark_code"
+    assert isinstance(warmups, int) and warmups >= 0, f"Expected non-negative int, got {warmups}, in benchmark_code"
+    
+    exec_globals = defineGlobals(myList)
+    baseList = exec_globals['myList']
+    
+    try:
+        compiled_code = compileUserCode(code)
+    except Exception as e:
+        # Handle the case when an error occurs during the parsing of the code
+        host.postMessage(f"{str(e)}")
+        return
+    
+    global timedExecution, overheadCalibration
+    samples = []
+    overheads = []
+    
+    try:
+        # The calibration can also be cancelled by the main thread, it is only kept once it has ended
+        if overheadCalibration is None:
+            overheadCalibration = calibrate_overhead()
+        compareOverhead, swapOverhead, getOverhead, setOverhead = overheadCalibration
+        reliable = min(overheadCalibration) >= 0
+        
+        timedExecution = True
+        for run in range(warmups + runs):
+            elapsed = timeRun(compiled_code, exec_globals, baseList)
+            if run >= warmups:
+                samples.append(elapsed / 1e9)
+                overheads.append((compareCount * compareOverhead + swapCount * swapOverhead + readCount * getOverhead + writeCount * setOverhead) / 1e9)
+    except KeyboardInterrupt:
+        # Handle the case when the main thread interrupts the execution
+        host.postMessage(INTERRUPTED_MESSAGE)
+        return
+    except (Exception, OperationBudgetExceeded) as e:
+        # Handle the case when an error occurs during the execution of the code, or when it exceeds its budget
+        host.postMessage(f"{str(e)}")
+        return
+    finally:
+        timedExecution = False
+    
+    # Update the compare and swap count of the last execution in the front-end
+    host.updateCounts(compareCount, swapCount)
+    
+    # A correction larger than a measured time would give a negative time
+    reliable = reliable and all(overhead < sample for sample, overhead in zip(samples, overheads))
+    correctedSamples = [sample - overhead for sample, overhead in zip(samples, overheads)] if reliable else samples
+    
+    summary = summarizeTimes(samples)
+    correctedSummary = summarizeTimes(correctedSamples)
+    return [summary[field] for field in BENCHMARK_FIELDS] + [correctedSummary[field] for field in BENCHMARK_FIELDS] + overheadCalibration + [int(reliable)]
+
+def timeRun(compiled_code, exec_globals : dict, baseList : list, timeBudget : float = 0) -> int:
+    '''
+    Executes the compiled code once, on fresh copies of the list and of the globals, and returns the execution time
+    
+    Parameters:
+    -----------
+    compiled_code: The compiled user's code (code)
+    exec_globals: The globals defined by defineGlobals (dict)
+    baseList: The list to sort, which is copied before the execution (array)
+    timeBudget: The time after which the execution is stopped, in seconds, 0 if unlimited (float) (default = 0)
+    
+    Return:
+    -------
+    elapsed: The execution time, in nanoseconds (int)
+    
+    Raises:
+    -------
+    TimeBudgetExceeded: If the execution took longer than timeBudget
+    
+    Note:
+    -----
+    The compare, swap, read and write counts are reset before the execution, and the fast path of the primitives is used.
+    The caller is responsible for the timed mode. The time budget is checked by checkpoint, every 1024 operations.
+    '''
+    global timeDeadline
+    updateCompareCount(reset=True)
+    updateSwapCount(reset=True)
+    updateReadCount(reset=True)
+    updateWriteCount(reset=True)
+    run_globals = dict(exec_globals)
+    run_globals['myList'] = baseList[:]
+    run_globals['compare'], run_globals['swap'] = makeFastPrimitives(run_globals['myList'])
+    run_globals['get'], run_globals['set'], run_globals['move'] = makeFastAccessors(run_globals['myList'])
+    
+    start_time = perf_counter_ns()
+    timeDeadline = start_time + int(timeBudget * 1e9) if timeBudget > 0 else 0
+    try:
+        exec(compiled_code, run_globals)
+    finally:
+        timeDeadline = 0
+    return perf_counter_ns() - start_time
+
+def scaling_code(code, sizes=SCALING_SIZES, shapes=SCALING_SHAPES) -> list | None:
+    '''
+    Executes the user's code on lists of increasing sizes, and estimates its complexity
+    
+    Parameters:
+    -----------
+    code: The code entered by the user in the editor (str)
+    sizes: The sizes of the lists, in increasing order (list) (default = SCALING_SIZES)
+    shapes: The kinds of the lists, see generate_list (list) (default = SCALING_SHAPES)
+    
+    Return:
+    -------
+    results: For each shape, [shape, sizes, times, compareCounts, swapCounts, timeExponent, timeR2, nlognR2, operationExponent] (list)
+    If an error occurs: None
+    
+    Note:
+    -----
+    For each shape, the sizes are executed in increasing order, and each execution is stopped once it takes longer than
+    SCALING_TIME_BUDGET seconds (see timeRun): the stopped size is not measured, and the larger sizes are skipped. The exponents come from a power-law fit (value = c * n^k) of the
+    execution times and of the number of operations (compare + swap + get + set). nlognR2 is the goodness of fit of the
+    model time = c * n * log(n), to compare with timeR2.
+    '''
+    assert isinstance(code, str), f"Expected str, got {type(code)}, in scaling_code"
+    sizes = host.toPython(sizes)
+    shapes = host.toPython(shapes)
+    assert len(sizes) > 1 and all(isinstance(n, int) and n > 0 for n in sizes), "Sizes should be at least two positive integers, in scaling_code"
+    
+    exec_globals = defineGlobals([0])
+    
+    try:
+        compiled_code = compileUserCode(code)
+    except Exception as e:
+        # Handle the case when an error occurs during the parsing of the code
+        host.postMessage(f"{str(e)}")
+        return
+    
+    global timedExecution
+    timedExecution = True
+    results = []
+    
+    try:
+        # Warm-up execution, on the smallest list
+        timeRun(compiled_code, exec_globals, generate_list(f"{shapes[0]}:{sizes[0]}:{SCALING_SEED}"))
+        
+        for shape in shapes:
+            measuredSizes, times, compareCounts, swapCounts, operationCounts = [], [], [], [], []
+            
+            for n in sorted(sizes):
+                try:
+                    elapsed = timeRun(compiled_code, exec_globals, generate_list(f"{shape}:{n}:{SCALING_SEED}"), SCALING_TIME_BUDGET) / 1e9
+                except TimeBudgetExceeded:
+                    break
+                measuredSizes.append(n)
+                times.append(elapsed)
+                compareCounts.append(compareCount)
+                swapCounts.append(swapCount)
+                operationCounts.append(compareCount + swapCount + readCount + writeCount)
+            
+            timeExponent, timeR2 = fitPowerLaw(measuredSizes, times)
+            operationExponent, _ = fitPowerLaw(measuredSizes, operationCounts)
+            nlognR2 = fitNLogN(measuredSizes, times)
+            results.append([shape, measuredSizes, times, compareCounts, swapCounts, timeExponent, timeR2, nlognR2, operationExponent])
+    except KeyboardInterrupt:
+        # Handle the case when the main thread interrupts the execution
+        host.postMessage(INTERRUPTED_MESSAGE)
+        return
+    except (Exception, OperationBudgetExceeded) as e:
+        # Handle the case when an error occurs during the execution of the code, or when it exceeds its budget
+        host.postMessage(f"{str(e)}")
+        return
+    finally:
+        timedExecution = False
+    
+    return results
+
+def fitPowerLaw(sizes : list, values : list) -> tuple:
+    '''
+    Fits the model value = c * n^k, with a linear regression of log(value) on log(n)
+    
+    Parameters:
+    -----------
+    sizes: The sizes n (list)
+    values: The measured values, times or counts (list)
+    
+    Return:
+    -------
+    (exponent, rSquared): The estimated exponent k and the coefficient of determination of the fit (tuple)
+    '''
+    assert len(sizes) == len(values), "Sizes and values should have the same length, in fitPowerLaw"
+    if len(sizes) < 2:
+        return (float('nan'), float('nan'))
+    
+    # Values equal to 0 (e.g. no swap on a sorted list) are clamped, as log(0) is not defined
+    x = [math.log(n) for n in sizes]
+    y = [math.log(max(value, 1e-9)) for value in values]
+    
+    slope, intercept = statistics.linear_regression(x, y)
+    return (slope, rSquared(y, [intercept + slope * xi for xi in x]))
+
+def fitNLogN(sizes : list, times : list) -> float:
+    '''
+    Fits the model time = c * n * log(n), with a least squares regression through the origin
+    
+    Parameters:
+    -----------
+    sizes: The sizes n (list)
+    times: The measured times (list)
+    
+    Return:
+    -------
+    rSquared: The coefficient of determination of the fit (float)
+    '''
+    assert len(sizes) == len(times), "Sizes and times should have the same length, in fitNLogN"
+    if len(sizes) < 2:
+        return float('nan')
+    
+    x = [n * math.log2(n) for n in sizes]
+    c = sum(xi * ti for xi, ti in zip(x, times)) / sum(xi * xi for xi in x)
+    return rSquared(times, [c * xi for xi in x])
+
+def rSquared(observed : list, predicted : list) -> float:
+    '''
+    Computes the coefficient of determination of a fit
+    
+    Parameters:
+    -----------
+    observed: The observed values (list)
+    predicted: The values predicted by the model (list)
+    
+    Return:
+    -------
+    rSquared: 1 - (residual sum of squares / total sum of squares) (float)
+    '''
+    mean = statistics.fmean(observed)
+    total = sum((value - mean) ** 2 for value in observed)
+    residual = sum((value - prediction) ** 2 for value, prediction in zip(observed, predicted))
+    return 1.0 - residual / total if total > 0 else 1.0
 
-def parse_and_restrict(code: str) -> ast.Module:
+def summarizeTimes(samples : list) -> dict:
     '''
-    Parses the code and restricts the imports and variable redefinitions.
+    Computes robust statistics about a list of execution times
     
     Parameters:
     -----------
-    code: The code entered by the user in the editor (str)
+    samples: The measured execution times (list)
     
     Return:
     -------
-    parsed_code: The parsed code after restricting the imports and variable redefinitions (ast.Module)
+    summary: The statistics described by BENCHMARK_FIELDS (dict)
     
-    Notes:
-    ------
-    Exception: If an error occurs during restricting the imports and variable redefinitions
+    Note:
+    -----
+    The confidence interval is the 95% interval of the mean, using the Student t-distribution.
     '''
-    assert isinstance(code, str), f"Expected str, got {type(code)}, in parse_and_restrict"
+    assert isinstance(samples, list) and len(samples) > 0, "Samples should be a non-empty list, in summarizeTimes"
     
-    parsed_code = ast.parse(code, mode='exec')
-    check_node(parsed_code)
-    return parsed_code
-  
-def compare(arr : list, i : int, j : int) -> bool:
+    runs = len(samples)
+    mean = statistics.fmean(samples)
+    stddev = statistics.stdev(samples) if runs > 1 else 0.0
+    p95 = statistics.quantiles(samples, n=20, method='inclusive')[18] if runs > 1 else samples[0]
+    margin = T_CRITICAL_95.get(runs - 1, 1.96) * stddev / runs ** 0.5
+    
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": mean,
+        "stddev": stddev,
+        "p95": p95,
+        "ciLow": mean - margin,
+        "ciHigh": mean + margin,
+        "runs": runs
+    }
+
+def set_interrupt_buffer(buffer) -> bool:
     '''
-    Compares two integers, returns True if arr[i] is less than or equal to arr[j], False otherwise.
+    Uses a buffer shared with the main thread to interrupt the executions
     
     Parameters:
     -----------
-    arr: The list in which the elements are to be compared (list)
-    i: The index of the first integer (int)
-    j: The index of the second integer (int)
+    buffer: An Int32Array backed by a SharedArrayBuffer (pyodide.ffi.JsProxy)
     
     Return:
     -------
-    result: True if arr[i] is less than or equal to arr[j], False otherwise (bool)
+    interruptible: True if the buffer is used, False otherwise (bool)
     
     Note:
-    ------
-    This function is available to the user's code
+    -----
+    When the main thread writes 2 (SIGINT) in the buffer, Pyodide raises a KeyboardInterrupt in the running code,
+    which is handled by execute_code, benchmark_code and scaling_code. The worker can then be reused.
     '''
-    assert isinstance(arr, list), f"Expected list, got {type(arr)}, in compare"
-    assert len(arr) > 0, "List should not be empty, in compare"
-    
-    assert isinstance(i, int) and not isinstance(i, bool), f"Expected int, got {type(i)}, in compare"
-    assert i < len(arr), f"Index {i} out of range, in compare"
-    assert i >= 0, f"Index {i} out of range, in compare"
+    try:
+        host.setInterruptBuffer(buffer)
+    except Exception:
+        # The executions can still be stopped by terminating the worker
+        return False
+    return True
+
+def boot_times() -> list:
+    '''
+    Gives the timestamps of the boot of the worker, measured while worker.py was executed
     
-    assert isinstance(j, int) and not isinstance(i, bool), f"Expected int, got {type(j)}, in compare"
-    assert j < len(arr), f"Index {j} out of range, in compare"
-    assert j >= 0, f"Index {j} out of range, in compare"
+    Return:
+    -------
+    bootTimes: The start of worker.py, the end of its imports and its end, in seconds since the epoch (list)
     
+    Note:
+    -----
+    The clock is the wall clock of the browser, shared by the main thread and the workers, so the main thread
+    can compare these timestamps to its own (see WorkerPool.boot in main.py). Its resolution is about a millisecond.
+    '''
+    return list(bootTimes)
 
-    assert callable(sync.compareOnDiagram), f"Expected callable, got {type(sync.compareOnDiagram)}, in compare"
-    if sync.getCompare() and not timedExecution:
-        sync.compareOnDiagram(i, j)
-        sleep(sync.getAnimationTime() / 10_000)
-        
-    updateCompareCount()
-    return arr[i] <= arr[j]
-
-def updateCompareCount(reset=False) -> None:
+def reset_state() -> None:
     '''
-    Updates the compare count
+    Resets the state of the worker, so it can be reused for a new execution
     
-    Parameters:
-    -----------
-    reset: If True, the compare count is reset to 0 (bool)
+    Note:
+    -----
+    This function is called by the worker pool (see main.py) each time a worker is given back to the pool.
+    It ensures that a previous execution (even an interrupted one) does not leak into the next one.
     '''
-    global compareCount
-    if reset:
-        compareCount = 0
-    else:
-        compareCount += 1
+    global timedExecution, streamTrace, lastFrameTime, lastFrameCost, frameTime, operationBudget, timeDeadline, accessCounters, tracedList
+    timedExecution = False
+    streamTrace = True
+    operationBudget = 0
+    timeDeadline = 0
+    accessCounters = None
+    tracedList = None
+    lastFrameTime = 0
+    lastFrameCost = 0
+    frameTime = 0
+    updateCompareCount(reset=True)
+    updateSwapCount(reset=True)
+    updateReadCount(reset=True)
+    updateWriteCount(reset=True)
+    del trace[:]
+      
+# The 'sync' object is used to communicate with the main thread
+host.expose({
+    'execute_code': execute_code,
+    'benchmark_code': benchmark_code,
+    'scaling_code': scaling_code,
+    'benchmark_primitives': benchmark_primitives,
+    'calibrate_overhead': calibrate_overhead,
+    'set_interrupt_buffer': set_interrupt_buffer,
+    'boot_times': boot_times,
+    'reset_state': reset_state
+})
 
-def swap(arr: list, i: int, j: int):
+# ------------------------------------------------------------------------------------------------------------------------
+# The following function packs the result of an execution in a single buffer. It has been copied in the current file, as
+# the restricted checks below (see ./static/python/src/result_buffer.py, where unpack_result is also found).
+# ------------------------------------------------------------------------------------------------------------------------
+
+# Layout of the result of an execution, as a single buffer of doubles (see pack_result)
+RESULT_FORMAT_VERSION = 1
+RESULT_HEADER_SIZE = 8      # version, listLength, time, compareCount, swapCount, readCount, writeCount, extraCount
+
+def pack_result(myList, final_time : float, counts : list, extras : list) -> array:
     '''
-    Swaps the elements at the given indices in the list
+    Packs the result of an execution in a single buffer of doubles, which crosses the thread boundary at once
     
     Parameters:
     -----------
-    arr: The list in which the elements are to be swapped (list)
-    i: The index of the first element (int)
-    j: The index of the second element (int)
+    myList: The final list, or its downsampled view (array | list)
+    final_time: The execution time, in seconds (float)
+    counts: [compareCount, swapCount, readCount, writeCount] (list)
+    extras: The optional results, each being a list of numbers, or a list of numbers and lists of numbers (list)
     
-    Note:
-    ------
-    This function is available to the user's code
-    '''    
-    assert isinstance(arr, list), f"Expected list, got {type(arr)}, in swap"
-    assert len(arr) > 0, "List should not be empty, in swap"
+    Return:
+    -------
+    buffer: The header (RESULT_HEADER_SIZE values), the list, then each extra (array)
     
-    assert isinstance(i, int) and not isinstance(i, bool), f"Expected int, got {type(i)}, in swap"
-    assert i < len(arr), f"Index {i} out of range, in swap"
-    assert i >= 0, f"Index {i} out of range, in swap"
+    Note:
+    -----
+    Each extra is written as its number of parts, then each part as its length and its values. An extra made
+    of numbers only is a single part, otherwise each of its items is a part (a number is a part of length 1).
+    The doubles hold the integers exactly up to 2^53, like the numbers of JavaScript.
+    '''
+    assert len(counts) == 4, f"Expected 4 counts, got {len(counts)}, in pack_result"
     
-    assert isinstance(j, int) and not isinstance(i, bool), f"Expected int, got {type(j)}, in swap"
-    assert j < len(arr), f"Index {j} out of range, in swap"
-    assert j >= 0, f"Index {j} out of range, in swap"
-
-    arr[i], arr[j] = arr[j], arr[i]
+    buffer = array('d', [RESULT_FORMAT_VERSION, len(myList), final_time, *counts, len(extras)])
+    buffer.extend(map(float, myList))
     
-    # Convert the list to a JsProxy object before updating the list in the front-end
-    sync.updateList(pyodide.ffi.to_js(arr), i, j, timedExecution)
-    updateSwapCount() 
+    for extra in extras:
+        parts = [extra] if all(isinstance(item, (int, float)) for item in extra) else extra
+        buffer.append(len(parts))
+        for part in parts:
+            part = [part] if isinstance(part, (int, float)) else part
+            buffer.append(len(part))
+            buffer.extend(map(float, part))
     
-    if sync.getSwap() and not timedExecution:
-        sleep(sync.getAnimationTime() / 1_000)
+    return buffer
 
-def updateSwapCount(reset = False) -> None:
+# ------------------------------------------------------------------------------------------------------------------------
+# The following functions generate the lists from their descriptor, so the large lists do not need to be sent by the main
+# thread. They have been copied in the current file, as the restricted checks below (see ./static/python/src/generators.py).
+# ------------------------------------------------------------------------------------------------------------------------
+
+# Kinds of generated lists, see generate_list
+LIST_KINDS = {'sorted', 'reversed', 'random', 'few-unique', 'nearly-sorted', 'organ-pipe', 'sawtooth'}
+
+# Default parameter of the kinds which take one (number of distinct values, of swaps, or of teeth)
+DEFAULT_FEW_UNIQUE_VALUES = 8
+DEFAULT_NEARLY_SORTED_SWAPS_RATIO = 0.01
+DEFAULT_SAWTOOTH_TEETH = 8
+
+# Largest generated list, to keep the memory of the worker reasonable
+MAX_GENERATED_SIZE = 10_000_000
+
+class LinearCongruentialGenerator:
     '''
-    Updates the swap count
+    Pseudo-random generator, giving the same numbers as LinearCongruentialGenerator in generators.js for the same seed
     
-    Parameters:
+    Attributes:
     -----------
-        reset: If True, the swap count is reset to 0 (bool)
+    state: The current state, a 32-bit unsigned integer (int)
+    
+    Note:
+    -----
+    state = (state * 1103515245 + 12345) mod 2^32, as Math.imul(state, 1103515245) + 12345 >>> 0 in JavaScript.
     '''
-    global swapCount
-    if reset :
-        swapCount = 0
-    else :
-        swapCount += 1
+    def __init__(self, seed : int):
+        assert isinstance(seed, int) and seed >= 0, f"Expected non-negative int, got {seed}, in LinearCongruentialGenerator"
+        self.state = seed & 0xFFFFFFFF
+    
+    def next(self) -> int:
+        '''
+        Returns the next state of the generator
         
+        Return:
+        -------
+        state: A 32-bit unsigned integer (int)
+        '''
+        self.state = (self.state * 1103515245 + 12345) & 0xFFFFFFFF
+        return self.state
+    
+    def below(self, bound : int) -> int:
+        '''
+        Returns a pseudo-random integer in [0, bound)
         
-def defineGlobals(myList) -> dict:
+        Parameters:
+        -----------
+        bound: The exclusive upper bound (int)
+        
+        Return:
+        -------
+        value: The high halves of the next two states, as a 32-bit integer, modulo bound (int)
+        
+        Note:
+        -----
+        The low bits of a linear congruential generator have a short period (the lowest bit alternates), so they
+        are dropped. Only the Fisher-Yates shuffle uses the whole state, as the former shuffledList of unsortedLists.js.
+        '''
+        high = self.next() >> 16
+        return ((high << 16) | (self.next() >> 16)) % bound
+
+def parse_descriptor(descriptor : str) -> tuple:
     '''
-    Defines the global variables and builtins functions that can be accessed by the user's code
+    Parses a descriptor of a generated list
     
-    Parameter:
-    ----------
-    myList: The list currently selected by the user (list)
+    Parameters:
+    -----------
+    descriptor: "kind:n:seed" or "kind:n:seed:parameter", e.g. "nearly-sorted:1000:42:10" (str)
     
     Return:
     -------
-    exec_globals: The global variables and builtins functions that can be accessed by the user's code (dict)
-    '''
-    # Convert JsProxy to a native Python list
-    if isinstance(myList, pyodide.ffi.JsProxy):
-        myList = list(myList)
+    (kind, n, seed, parameter): The parameter is None when it is not given (tuple)
     
-    assert isinstance(myList, list), f"Expected list, got {type(myList)}, in defineGlobals"
-    assert all((isinstance(i, int) and not isinstance(i, bool)) for i in myList), "All elements of the list should be integers, in defineGlobals"
-    assert len(myList) > 0, "List should not be empty, in defineGlobals"
+    Raises:
+    -------
+    Exception: If the descriptor is malformed, or its kind is unknown
+    '''
+    assert isinstance(descriptor, str), f"Expected str, got {type(descriptor)}, in parse_descriptor"
     
-    assert callable(compare), f"Expected callable, got {type(compare)}, in defineGlobals"
-    assert callable(swap), f"Expected callable, got {type(swap)}, in defineGlobals"
+    # str.isdigit also accepts the other Unicode digits, e.g. "²", which int() rejects or reads as another number
+    fields = descriptor.split(':')
+    if len(fields) not in (3, 4) or not all(field.isascii() and field.isdigit() for field in fields[1:]):
+        raise Exception(f"Invalid list descriptor '{descriptor}', expected 'kind:n:seed' or 'kind:n:seed:parameter'")
     
-    exec_globals = {
-        '__builtins__': {
-            '__import__': __import__,
-            'range': range,
-            'len': len,
-            'int': int,
-            'float': float,
-            'str': str,
-            'list': list,
-            'bool': bool,
-            'min': min,
-            'max': max,
-            'all': all,
-            'any': any,
-            'abs': abs,
-            'sum': sum,
-            'round': round,
-            'reversed': reversed
-        },
-        'myList': copy.deepcopy(myList),
-        'compare': compare,
-        'swap': swap
-    }
+    kind, n, seed = fields[0], int(fields[1]), int(fields[2])
+    parameter = int(fields[3]) if len(fields) == 4 else None
+    if kind not in LIST_KINDS:
+        raise Exception(f"Unknown list kind '{kind}', expected one of {', '.join(sorted(LIST_KINDS))}")
+    if not 0 < n <= MAX_GENERATED_SIZE:
+        raise Exception(f"Invalid list size {n}, expected between 1 and {MAX_GENERATED_SIZE}")
     
-    return exec_globals
+    return (kind, n, seed, parameter)
 
-def execute_code(code, myList, measuringTime=False) -> list | float | None:
+def generate_list(descriptor : str) -> array:
     '''
-    Executes the user's code and returns the result
+    Generates the list described by a descriptor, always the same for the same descriptor
     
     Parameters:
     -----------
-    code: The code entered by the user in the editor (str)
-    myList: The list currently selected by the user (list)
-    measuringTime: If True, the time taken to execute the code is returned (bool)
+    descriptor: "kind:n:seed" or "kind:n:seed:parameter" (str), the kinds being:
+        - "sorted": 1, 2, ..., n
+        - "reversed": n, n - 1, ..., 1
+        - "random": a shuffle of 1, 2, ..., n
+        - "few-unique": n values drawn among parameter distinct values (default = DEFAULT_FEW_UNIQUE_VALUES)
+        - "nearly-sorted": 1, 2, ..., n with parameter random swaps (default = 1% of n)
+        - "organ-pipe": the odd numbers in increasing order, then the even numbers in decreasing order
+        - "sawtooth": parameter increasing runs (default = DEFAULT_SAWTOOTH_TEETH)
     
     Return:
     -------
-    By default : myList: The list after the code has been executed 
-    If measuringTime is True: final_time: The time taken to execute the code (float)
-    If an error occurs: None
+    myList: The generated list, as an array of 64-bit integers (array)
     
     Raises:
     -------
-    Exception: If an error occurs during the execution of the code
+    Exception: If the descriptor is malformed, or its kind is unknown (see parse_descriptor)
     
     Note:
     -----
-    The postMessage function is used to send the error to the main thread, where it handles the error
+    The same algorithms are implemented in generators.js, so the main thread can display the list while only the
+    descriptor is sent to the worker. The seed is ignored by the kinds which are not random.
     '''
-    assert isinstance(code, str), f"Expected str, got {type(code)}, in execute_code"
-    
-    # Handle the case when myList is not a list 
-    if isinstance(myList, pyodide.ffi.JsProxy):
-        myList = list(myList)
-        
-    assert isinstance(myList, list), f"Expected list, got {type(myList)}, in execute_code"
-    assert all((isinstance(i, int) and not isinstance(i, bool)) for i in myList), "All elements of the list should be integers, in execute_code"
-    assert len(myList) > 0, "List should not be empty, in execute_code"
-    
-    assert isinstance(measuringTime, bool), f"Expected bool, got {type(measuringTime)}, in execute_code"
-    
-    # Reset the compare and swap count for the new code execution
-    updateCompareCount(reset=True)
-    updateSwapCount(reset=True)
-    
-    assert isinstance(code, str), f"Expected str, got {type(code)}, in execute_code"
-    
-    outputDiv = document.getElementById('output')
-    assert outputDiv is not None, "Output div not found, in execute_code"
-    
-    exec_globals = defineGlobals(myList)
-    assert exec_globals is not None, "Global variables not defined, in execute_code"
-
-    if not measuringTime:
-        outputDiv.innerHTML = "Executing code..."
-        
-    # The 'ast' module is used to parse the code and restrict the imports and variable redefinitions
-    try:
-        parsed_code = parse_and_restrict(code)
-    except Exception as e:
-        # Handle the case when an error occurs during the parsing of the code
-        postMessage(f"{str(e)}")
-        return
+    kind, n, seed, parameter = parse_descriptor(descriptor)
+    generator = LinearCongruentialGenerator(seed)
     
-    if measuringTime:
-        global timedExecution
-        timedExecution = True
-        start_time = time()
+    if kind == 'few-unique':
+        values = parameter if parameter else DEFAULT_FEW_UNIQUE_VALUES
+        step = max(n // values, 1)
+        return array('q', ((generator.below(values) + 1) * step for _ in range(n)))
     
-    compiled_code = compile(parsed_code, filename='', mode='exec')
+    if kind == 'organ-pipe':
+        return array('q', list(range(1, n + 1, 2)) + list(range(n - n % 2, 0, -2)))
     
-    try:
-        exec(compiled_code, exec_globals)
-    except Exception as e:
-        # Handle the case when an error occurs during the execution of the code
-        postMessage(f"{str(e)}")
-        return
+    if kind == 'sawtooth':
+        teeth = parameter if parameter else DEFAULT_SAWTOOTH_TEETH
+        width = -(-n // teeth)
+        return array('q', (i % width + 1 for i in range(n)))
     
-    if measuringTime:
-        timedExecution = False
-        end_time = time()
-        final_time = end_time - start_time
-        
-        # Update the compare and swap count in the front-end
-        sync.updateCompareCount(compareCount)
-        sync.updateSwapCount(swapCount)
-        return final_time
+    myList = array('q', range(1, n + 1))
+    if kind == 'reversed':
+        myList.reverse()
+    elif kind == 'random':
+        # Fisher-Yates shuffle, the large lists stay the same as before the generators
+        for i in range(n - 1, 0, -1):
+            j = generator.next() % (i + 1)
+            myList[i], myList[j] = myList[j], myList[i]
+    elif kind == 'nearly-sorted':
+        swaps = parameter if parameter is not None else max(int(n * DEFAULT_NEARLY_SORTED_SWAPS_RATIO), 1)
+        for _ in range(swaps):
+            i, j = generator.below(n), generator.below(n)
+            myList[i], myList[j] = myList[j], myList[i]
     
-    myList = exec_globals.get('myList')
-        
-    if myList is None:
-        # Handle the case when the list is not found
-        postMessage("List not found")
-        return
-
-    outputDiv.innerHTML = "Code executed successfully"
     return myList
-      
-# The 'sync' object is used to communicate with the main thread
-sync.execute_code = execute_code
 
 # ------------------------------------------------------------------------------------------------------------------------
 # The following classes are used to restrict the imports and variable redefinitions in the user's code. It has been copied
@@ -290,6 +2076,89 @@ sync.execute_code = execute_code
 RESTRICTED_MODULES = {'os', 'sys', 'subprocess', 'shutil', 'socket', 'http', 'ftplib', 'pickle'}
 RESTRICTED_VARIABLES = {'myList'}
 
+def import_violations(node) -> list:
+    '''
+    Finds the restricted modules imported by "import ..."
+    
+    Parameters:
+    -----------
+    node: ast.Import
+    
+    Return:
+    -------
+    violations: The error message of each restricted module (list)
+    '''
+    assert hasattr(node, 'names') and isinstance(node.names, list), "Node does not have 'names' attribute or it is not a list, in import_violations"
+    return [f"Importing '{alias.name}' module is not allowed" for alias in node.names if alias.name in RESTRICTED_MODULES]
+
+def import_from_violations(node) -> list:
+    '''
+    Finds the restricted module imported by "from ... import ..."
+    
+    Parameters:
+    -----------
+    node: ast.ImportFrom
+    
+    Return:
+    -------
+    violations: The error message of the restricted module, if any (list)
+    '''
+    assert hasattr(node, 'module'), "Node does not have 'module' attribute, in import_from_violations"
+    if node.module in RESTRICTED_MODULES:
+        return [f"Importing from '{node.module}' module is not allowed"]
+    return []
+
+def attribute_violations(node) -> list:
+    '''
+    Finds the access to a restricted module via an attribute
+    
+    Parameters:
+    -----------
+    node: ast.Attribute
+    
+    Return:
+    -------
+    violations: The error message of the restricted module, if any (list)
+    '''
+    assert hasattr(node, 'value'), "Node does not have 'value' attribute, in attribute_violations"
+    if isinstance(node.value, ast.Name) and node.value.id in RESTRICTED_MODULES:
+        return [f"Access to '{node.value.id}' module is not allowed"]
+    return []
+
+def name_violations(node) -> list:
+    '''
+    Finds the redefinition or the deletion of a restricted variable
+    
+    Parameters:
+    -----------
+    node: ast.Name
+    
+    Return:
+    -------
+    violations: The error message of the restricted variable, if any (list)
+    
+    Note:
+    -----
+    Every target of an assignment is a name in the Store context: "=", "+=", annotated assignments, "for" loops,
+    comprehensions, ":=", "with ... as", and the unpacking of tuples and lists.
+    '''
+    assert hasattr(node, 'id') and hasattr(node, 'ctx'), "Node does not have 'id' or 'ctx' attribute, in name_violations"
+    if node.id not in RESTRICTED_VARIABLES:
+        return []
+    if isinstance(node.ctx, ast.Store):
+        return [f"Redefining '{node.id}' variable is not allowed"]
+    if isinstance(node.ctx, ast.Del):
+        return [f"Deleting '{node.id}' variable is not allowed"]
+    return []
+
+# Function finding the violations of each type of node, the other types of nodes are allowed
+NODE_CHECKS = {
+    ast.Import: import_violations,
+    ast.ImportFrom: import_from_violations,
+    ast.Attribute: attribute_violations,
+    ast.Name: name_violations,
+}
+
 def check_import(node):
     '''
     Checks "import ..." to restrict some modules
@@ -303,9 +2172,8 @@ def check_import(node):
     Exception: If a restricted module is imported
     '''
     assert hasattr(node, 'names') and isinstance(node.names, list), "Node does not have 'names' attribute or it is not a list, in check_import"
-    for alias in node.names:
-        if alias.name in RESTRICTED_MODULES:
-            raise Exception(f"Importing '{alias.name}' module is not allowed")
+    for message in import_violations(node):
+        raise Exception(message)
 
 def check_import_from(node):
     '''
@@ -320,8 +2188,8 @@ def check_import_from(node):
     Exception: If a restricted module is imported
     '''
     assert hasattr(node, 'module'), "Node does not have 'module' attribute, in check_import_from"
-    if node.module in RESTRICTED_MODULES:
-        raise Exception(f"Importing from '{node.module}' module is not allowed")
+    for message in import_from_violations(node):
+        raise Exception(message)
 
 def check_attribute(node):
     '''
@@ -336,8 +2204,8 @@ def check_attribute(node):
     Exception: If a restricted module is accessed
     '''
     assert hasattr(node, 'value'), "Node does not have 'value' attribute, in check_attribute"
-    if isinstance(node.value, ast.Name) and node.value.id in RESTRICTED_MODULES:
-        raise Exception(f"Access to '{node.value.id}' module is not allowed")
+    for message in attribute_violations(node):
+        raise Exception(message)
 
 def check_variable_redefinition(node):
     '''
@@ -349,13 +2217,48 @@ def check_variable_redefinition(node):
     
     Raises:
     -------
-    Exception: If a restricted variable is redefined
+    Exception: If a restricted variable is redefined, including in an unpacking such as "myList, x = ..."
     '''
     assert hasattr(node, 'targets') and isinstance(node.targets, list), "Node does not have 'targets' attribute or it is not a list, in check_variable_redefinition"
     for target in node.targets:
-        if isinstance(target, ast.Name) and target.id in RESTRICTED_VARIABLES:
-            raise Exception(f"Redefining '{target.id}' variable is not allowed")
-  
+        for child in ast.walk(target):
+            if isinstance(child, ast.Name):
+                for message in name_violations(child):
+                    raise Exception(message)
+
+def find_violations(node) -> list:
+    '''
+    Finds all the restricted imports, attributes, and variable redefinitions of an AST
+    
+    Parameters:
+    -----------
+    node: ast.Module
+    
+    Return:
+    -------
+    violations: The (line, message) pair of each violation, sorted by line (list)
+    
+    Note:
+    -----
+    The whole tree is walked exactly once, with an explicit stack, and the check of each node is found in the
+    NODE_CHECKS table, so the time is linear in the size of the AST. Nodes without a line number are reported on line 0.
+    '''
+    assert isinstance(node, ast.AST), f"Expected ast.AST, got {type(node)}, in find_violations"
+    violations = []
+    stack = [node]
+    while stack:
+        child = stack.pop()
+        check = NODE_CHECKS.get(type(child))
+        if check is not None:
+            position = (getattr(child, 'lineno', 0), getattr(child, 'col_offset', 0))
+            for message in check(child):
+                violations.append((position, message))
+        stack.extend(ast.iter_child_nodes(child))
+    
+    # The stack visits the nodes in reverse order, the violations are sorted by position in the code
+    violations.sort(key=lambda violation: violation[0])
+    return [(position[0], message) for position, message in violations]
+
 def check_node(node):
     '''
     Checks the AST node for restricted imports, attributes, and variable redefinitions
@@ -366,21 +2269,19 @@ def check_node(node):
     
     Raises:
     -------
-    Exception: If a restricted module is imported, accessed, or used in a call
+    Exception: If a restricted module is imported or accessed, or a restricted variable is redefined
     
     Note:
     -----
-    This function traverses the AST node and its children to ensure that no restricted modules
-    are imported, accessed, or used in a call. It also checks for redefinitions of certain variables.
-    It raises an exception if any restricted module is found.
+    The whole tree is checked (see find_violations), including the bodies of functions, loops and conditions,
+    and the nested expressions. The message of the exception gives every violation, one per line, with its line number.
     '''
     assert hasattr(node, 'body') and isinstance(node.body, list), "Node does not have 'body' attribute or it is not a list, in check_node"
-    for child in node.body:
-        if isinstance(child, ast.Import):
-            check_import(child)
-        elif isinstance(child, ast.ImportFrom):
-            check_import_from(child)
-        elif isinstance(child, ast.Attribute):
-            check_attribute(child)
-        elif isinstance(child, ast.Assign):
-            check_variable_redefinition(child)
\ No newline at end of file
+    violations = find_violations(node)
+    if violations:
+        raise Exception("\n".join(f"Line {line}: {message}" for line, message in violations))
+
+# ------------------------------------------------------------------------------------------------------------------------
+# End of worker.py, every function is defined (see boot_times)
+# ------------------------------------------------------------------------------------------------------------------------
+bootTimes.append(time())
@@ -0,0 +1,65 @@
+# Benchmark of the validation of large codes (see find_violations in restricted_checks.py)
+# The time per node should stay the same when the size of the code grows, as the tree is walked exactly once.
+
+import ast
+from time import perf_counter_ns
+
+from project.static.python.src.restricted_checks import *
+
+SIZES = [10, 100, 1_000, 10_000]
+REPEATS = 5
+
+def generate_code(functions : int) -> str:
+    '''
+    Generates a large code, made of many functions with nested loops, conditions and expressions
+    
+    Parameters:
+    -----------
+    functions: The number of generated functions (int)
+    
+    Return:
+    -------
+    code: The generated code (str)
+    
+    Note:
+    -----
+    One function out of ten contains a violation, so the reporting of the violations is also measured.
+    '''
+    lines = ["import random"]
+    for k in range(functions):
+        lines += [
+            f"def sort_{k}(arr):",
+            f"    n = len(arr)",
+            f"    for i in range(n):",
+            f"        for j in range(n - 1 - i):",
+            f"            if not compare(arr, j, j + 1) and (i * {k} + j) % 3 != random.randint(0, 2):",
+            f"                swap(arr, j, j + 1)",
+            f"    return [x for x in arr if x > {k}]",
+        ]
+        if k % 10 == 0:
+            lines.append("    myList = []")
+    return "\n".join(lines)
+
+def benchmark():
+    '''
+    Prints the time taken to parse and to validate codes of increasing sizes
+    '''
+    print(f"{'functions':>10} {'nodes':>10} {'violations':>10} {'parse (ms)':>12} {'check (ms)':>12} {'check (ns/node)':>16}")
+    for size in SIZES:
+        code = generate_code(size)
+        
+        parse_times, check_times = [], []
+        for _ in range(REPEATS):
+            start_time = perf_counter_ns()
+            tree = ast.parse(code)
+            parse_times.append(perf_counter_ns() - start_time)
+            
+            start_time = perf_counter_ns()
+            violations = find_violations(tree)
+            check_times.append(perf_counter_ns() - start_time)
+        
+        nodes = sum(1 for _ in ast.walk(tree))
+        print(f"{size:>10} {nodes:>10} {len(violations):>10} {min(parse_times) / 1e6:>12.2f} {min(check_times) / 1e6:>12.2f} {min(check_times) / nodes:>16.1f}")
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,101 @@
+import unittest
+from array import array
+
+from project.static.python.src.generators import *
+
+class TestGenerateList(unittest.TestCase):
+    
+    def test_sorted(self):
+        '''
+        Test case for a sorted list
+        '''
+        self.assertEqual(generate_list("sorted:5:0"), array('q', [1, 2, 3, 4, 5]))
+    
+    def test_reversed(self):
+        '''
+        Test case for a reversed list
+        '''
+        self.assertEqual(generate_list("reversed:5:0"), array('q', [5, 4, 3, 2, 1]))
+    
+    def test_random(self):
+        '''
+        Test case for a random list
+        
+        Note:
+        -----
+        The expected lists are the ones of generators.js (and of the former shuffledList) for the same seed
+        '''
+        self.assertEqual(list(generate_list("random:10:42")), [5, 10, 3, 8, 1, 7, 4, 9, 2, 6])
+        self.assertEqual(list(generate_list("random:100000:42")[:5]), [19151, 83735, 45567, 805, 49957])
+        self.assertEqual(sorted(generate_list("random:1000:7")), list(range(1, 1001)))
+    
+    def test_same_descriptor_same_list(self):
+        '''
+        Test case for the determinism of the generated lists
+        '''
+        for kind in sorted(LIST_KINDS):
+            with self.subTest(kind=kind):
+                self.assertEqual(generate_list(f"{kind}:500:3"), generate_list(f"{kind}:500:3"))
+        
+        self.assertNotEqual(generate_list("random:500:3"), generate_list("random:500:4"))
+    
+    def test_few_unique(self):
+        '''
+        Test case for a list with few distinct values
+        '''
+        myList = generate_list("few-unique:1000:42:5")
+        self.assertEqual(len(myList), 1000)
+        self.assertEqual(set(myList), {200, 400, 600, 800, 1000})
+        self.assertLessEqual(len(set(generate_list("few-unique:1000:42"))), DEFAULT_FEW_UNIQUE_VALUES)
+    
+    def test_nearly_sorted(self):
+        '''
+        Test case for a nearly sorted list
+        
+        Note:
+        -----
+        Each swap moves at most two elements
+        '''
+        myList = generate_list("nearly-sorted:1000:42:3")
+        self.assertEqual(sorted(myList), list(range(1, 1001)))
+        self.assertLessEqual(sum(value != i + 1 for i, value in enumerate(myList)), 6)
+        self.assertEqual(generate_list("nearly-sorted:100:42:0"), generate_list("sorted:100:42"))
+    
+    def test_organ_pipe(self):
+        '''
+        Test case for an organ-pipe list, with an even and an odd size
+        '''
+        self.assertEqual(list(generate_list("organ-pipe:9:0")), [1, 3, 5, 7, 9, 8, 6, 4, 2])
+        self.assertEqual(list(generate_list("organ-pipe:10:0")), [1, 3, 5, 7, 9, 10, 8, 6, 4, 2])
+    
+    def test_sawtooth(self):
+        '''
+        Test case for a sawtooth list
+        '''
+        self.assertEqual(list(generate_list("sawtooth:10:0:3")), [1, 2, 3, 4, 1, 2, 3, 4, 1, 2])
+        self.assertEqual(len(generate_list("sawtooth:1000:0")), 1000)
+    
+    def test_invalid_descriptor(self):
+        '''
+        Test case for malformed descriptors and unknown kinds
+        
+        Note:
+        -----
+        This test case is expected to raise an exception
+        '''
+        for descriptor in ["random", "random:10", "random:ten:42", "random:10:42:1:2", "random:-1:42", "random:1²:42", "random:١٠:42"]:
+            with self.subTest(descriptor=descriptor):
+                with self.assertRaises(Exception) as context:
+                    generate_list(descriptor)
+                self.assertTrue(str(context.exception).startswith("Invalid list descriptor"))
+        
+        with self.assertRaises(Exception) as context:
+            generate_list("bogo:10:42")
+        self.assertTrue(str(context.exception).startswith("Unknown list kind 'bogo'"))
+        
+        with self.assertRaises(Exception) as context:
+            generate_list("random:0:42")
+        self.assertTrue(str(context.exception).startswith("Invalid list size 0"))
+
+if __name__ == '__main__':
+    unittest.main()
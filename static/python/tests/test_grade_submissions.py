@@ -0,0 +1,63 @@
+import unittest
+import io, json, os, tempfile
+
+from project.static.python.src.grade_submissions import *
+
+SUBMISSIONS = {
+    "bubble.py": '''n = len(myList)
+for i in range(n):
+    for j in range(n - 1 - i):
+        if not compare(myList, j, j + 1):
+            swap(myList, j, j + 1)
+''',
+    "nothing.py": "pass\n",
+    "forbidden.py": "import os\n",
+    "endless.py": "while True:\n    compare(myList, 0, 0)\n",
+    "notes.txt": "not a submission\n"
+}
+
+class TestGradeSubmissions(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        for name, code in SUBMISSIONS.items():
+            with open(os.path.join(self.directory.name, name), "w", encoding="utf-8") as file:
+                file.write(code)
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def test_find_submissions(self):
+        '''
+        Test case for the submissions of a directory, which are its Python files
+        '''
+        names = [os.path.basename(path) for path in findSubmissions(self.directory.name)]
+        self.assertEqual(names, ["bubble.py", "endless.py", "forbidden.py", "nothing.py"])
+    
+    def test_grade_run(self):
+        '''
+        Test case for the execution of a submission on a list
+        '''
+        record = gradeRun(os.path.join(self.directory.name, "bubble.py"), "reversed:10:0", 0, 0)
+        
+        self.assertTrue(record["passed"])
+        self.assertIsNone(record["error"])
+        self.assertEqual((record["compares"], record["swaps"]), (45, 45))
+    
+    def test_grade_submissions(self):
+        '''
+        Test case for the grading of a directory, whose results are written as JSON lines
+        '''
+        output = io.StringIO()
+        summary = grade_submissions(self.directory.name, output, ["random:30:1", "sawtooth:30:0"], workers=2, maxOperations=10_000)
+        records = {(record["submission"], record["list"]): record for record in map(json.loads, output.getvalue().splitlines())}
+        
+        self.assertEqual(summary, {"passed": 2, "failed": 2, "errors": 4})
+        self.assertEqual(len(records), 8)
+        self.assertTrue(records[("bubble.py", "sawtooth:30:0")]["passed"])
+        self.assertFalse(records[("nothing.py", "random:30:1")]["passed"])
+        self.assertEqual(records[("forbidden.py", "random:30:1")]["error"], "Line 1: Importing 'os' module is not allowed")
+        self.assertTrue(records[("endless.py", "random:30:1")]["error"].startswith("Operation budget exceeded"))
+
+if __name__ == '__main__':
+    unittest.main()
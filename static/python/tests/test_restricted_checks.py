@@ -158,7 +158,7 @@ class TestRestrictImports(unittest.TestCase):
         with self.assertRaises(Exception) as context:
             check_node(node)
         
-        self.assertEqual(str(context.exception), "Importing 'os' module is not allowed")
+        self.assertEqual(str(context.exception), "Line 1: Importing 'os' module is not allowed")
 
     def test_check_node_with_valid_import(self):
         '''
@@ -180,7 +180,7 @@ class TestRestrictImports(unittest.TestCase):
         with self.assertRaises(Exception) as context:
             check_node(node)
         
-        self.assertEqual(str(context.exception), "Importing from 'os' module is not allowed")
+        self.assertEqual(str(context.exception), "Line 1: Importing from 'os' module is not allowed")
 
     def test_check_node_with_valid_import_from(self):
         '''
@@ -202,7 +202,7 @@ class TestRestrictImports(unittest.TestCase):
         with self.assertRaises(Exception) as context:
             check_node(node)
         
-        self.assertEqual(str(context.exception), "Access to 'os' module is not allowed")
+        self.assertEqual(str(context.exception), "Line 1: Access to 'os' module is not allowed")
 
     def test_check_node_with_valid_attribute(self):
         '''
@@ -224,7 +224,7 @@ class TestRestrictImports(unittest.TestCase):
         with self.assertRaises(Exception) as context:
             check_node(node)
         
-        self.assertEqual(str(context.exception), "Redefining 'myList' variable is not allowed")
+        self.assertEqual(str(context.exception), "Line 1: Redefining 'myList' variable is not allowed")
 
     def test_check_node_with_valid_variable_redefinition(self):
         '''
@@ -236,5 +236,106 @@ class TestRestrictImports(unittest.TestCase):
         # Should not raise any exception
         check_node(node)
 
+    def test_check_node_with_nested_import(self):
+        '''
+        Test case for check_node with an invalid import inside a function
+        '''
+        code = "def f():\n    import os\n    return 0"
+        node = ast.parse(code)
+        
+        with self.assertRaises(Exception) as context:
+            check_node(node)
+        
+        self.assertEqual(str(context.exception), "Line 2: Importing 'os' module is not allowed")
+
+    def test_check_node_with_nested_attribute(self):
+        '''
+        Test case for check_node with an invalid attribute nested in an expression
+        '''
+        code = "x = len(os.listdir('.')) + 1"
+        node = ast.parse(code)
+        
+        with self.assertRaises(Exception) as context:
+            check_node(node)
+        
+        self.assertEqual(str(context.exception), "Line 1: Access to 'os' module is not allowed")
+
+    def test_check_node_with_redefinition_in_loop(self):
+        '''
+        Test case for check_node with a variable redefinition inside a loop
+        '''
+        code = "for i in range(3):\n    if i:\n        myList = []"
+        node = ast.parse(code)
+        
+        with self.assertRaises(Exception) as context:
+            check_node(node)
+        
+        self.assertEqual(str(context.exception), "Line 3: Redefining 'myList' variable is not allowed")
+
+    def test_check_node_with_other_redefinitions(self):
+        '''
+        Test case for check_node with the other kinds of assignment targets
+        
+        Note:
+        -----
+        Augmented and annotated assignments, "for" targets, ":=" and unpacking are all redefinitions
+        '''
+        codes = ["myList += [1]", "myList: list = []", "for myList in []:\n    pass", "(myList := [])", "a, myList = 1, []"]
+        
+        for code in codes:
+            with self.subTest(code=code):
+                with self.assertRaises(Exception) as context:
+                    check_node(ast.parse(code))
+                
+                self.assertEqual(str(context.exception), "Line 1: Redefining 'myList' variable is not allowed")
+
+    def test_check_node_with_valid_use_of_variable(self):
+        '''
+        Test case for check_node with reads and item assignments of the restricted variable
+        '''
+        code = "n = len(myList)\nmyList[0], myList[1] = myList[1], myList[0]\nfor x in myList:\n    pass"
+        node = ast.parse(code)
+        
+        # Should not raise any exception
+        check_node(node)
+
+    def test_check_node_with_several_violations(self):
+        '''
+        Test case for check_node with several violations, which are all reported in the order of the code
+        '''
+        code = "import os, sys\nx = 1\ndef f():\n    from subprocess import run\n    del myList"
+        node = ast.parse(code)
+        
+        with self.assertRaises(Exception) as context:
+            check_node(node)
+        
+        self.assertEqual(str(context.exception), "\n".join([
+            "Line 1: Importing 'os' module is not allowed",
+            "Line 1: Importing 'sys' module is not allowed",
+            "Line 4: Importing from 'subprocess' module is not allowed",
+            "Line 5: Deleting 'myList' variable is not allowed",
+        ]))
+
+    # Test cases for find_violations
+    def test_find_violations_without_violation(self):
+        '''
+        Test case for find_violations with a valid code
+        '''
+        code = "import random\nfor i in range(len(myList)):\n    swap(myList, i, random.randint(0, i))"
+        
+        self.assertEqual(find_violations(ast.parse(code)), [])
+
+    def test_find_violations_with_violations(self):
+        '''
+        Test case for find_violations, which returns the (line, message) pair of each violation
+        '''
+        code = "x = os.getcwd()\nmyList = sys.argv"
+        
+        self.assertEqual(find_violations(ast.parse(code)), [
+            (1, "Access to 'os' module is not allowed"),
+            (2, "Redefining 'myList' variable is not allowed"),
+            (2, "Access to 'sys' module is not allowed"),
+        ])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from array import array
+
+from project.static.python.src.result_buffer import *
+
+class TestResultBuffer(unittest.TestCase):
+    
+    def test_round_trip(self):
+        '''
+        Test case for a result without extras
+        '''
+        buffer = pack_result(array('q', [1, 2, 3]), 0.5, [3, 2, 0, 0], [])
+        
+        self.assertEqual(len(buffer), RESULT_HEADER_SIZE + 3)
+        self.assertEqual(unpack_result(buffer), [array('d', [1, 2, 3]), 0.5, 3, 2, 0, 0])
+    
+    def test_extras(self):
+        '''
+        Test case for the extras of a result: profile, accesses and peak memory
+        '''
+        profile = [1, 0.25, 3, 0.5]
+        accesses = [[0, 2, 1], [1, 0, 0], [4, 4, 4], [0, 0, 1], 10]
+        buffer = pack_result([1, 2], 1.0, [1, 0, 4, 1], [profile, accesses, [2048]])
+        
+        result = unpack_result(buffer)
+        self.assertEqual(result[6], [profile])
+        self.assertEqual(result[7], [[0, 2, 1], [1, 0, 0], [4, 4, 4], [0, 0, 1], [10]])
+        self.assertEqual(result[8], [[2048]])
+    
+    def test_invalid_buffer(self):
+        '''
+        Test case for a truncated buffer and a buffer of another version
+        
+        Note:
+        -----
+        This test case is expected to raise an exception
+        '''
+        buffer = pack_result([1, 2], 1.0, [0, 0, 0, 0], [[1, 2, 3]])
+        
+        with self.assertRaises(Exception):
+            unpack_result(buffer[:-1])
+        with self.assertRaises(Exception):
+            unpack_result(buffer[:RESULT_HEADER_SIZE - 1])
+        
+        buffer[0] = RESULT_FORMAT_VERSION + 1
+        with self.assertRaises(Exception) as context:
+            unpack_result(buffer)
+        self.assertEqual(str(context.exception), "Invalid result buffer, in unpack_result")
+
+if __name__ == '__main__':
+    unittest.main()
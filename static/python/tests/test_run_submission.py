@@ -0,0 +1,95 @@
+import unittest
+import io, os, tempfile
+from contextlib import redirect_stdout
+
+from project.static.python.src.run_submission import *
+
+INSERTION_SORT = '''for i in range(1, len(myList)):
+    x = get(myList, i)
+    j = i - 1
+    while j >= 0 and get(myList, j) > x:
+        set(myList, j + 1, get(myList, j))
+        j -= 1
+    set(myList, j + 1, x)
+'''
+
+class TestRunSubmission(unittest.TestCase):
+    
+    def test_recorded(self):
+        '''
+        Test case for a recorded execution of a correct submission
+        '''
+        result = run_submission(INSERTION_SORT, "reversed:20:0")
+        
+        self.assertTrue(result["sorted"])
+        self.assertEqual((result["compares"], result["swaps"]), (0, 0))
+        self.assertEqual(result["writes"], 20 * 19 // 2 + 19)
+    
+    def test_unsorted(self):
+        '''
+        Test case for a submission which does not sort the list
+        '''
+        self.assertFalse(run_submission("pass", "random:20:1")["sorted"])
+    
+    def test_timed(self):
+        '''
+        Test case for a timed execution, which also checks that the list is sorted
+        '''
+        result = run_submission(INSERTION_SORT, "reversed:20:0", "timed")
+        
+        self.assertTrue(result["sorted"])
+        self.assertEqual(result["writes"], 20 * 19 // 2 + 19)
+        self.assertFalse(run_submission("pass", "random:20:1", "timed")["sorted"])
+    
+    def test_benchmark(self):
+        '''
+        Test case for the benchmark of a submission
+        '''
+        result = run_submission(INSERTION_SORT, "random:50:1", "benchmark", runs=3, warmups=0)
+        
+        self.assertEqual(result["raw"]["runs"], 3)
+        self.assertLessEqual(result["raw"]["min"], result["raw"]["median"])
+        self.assertEqual(list(result["overheads"]), worker.OVERHEAD_PRIMITIVES)
+        if result["reliable"]:
+            self.assertLess(result["corrected"]["min"], result["raw"]["min"])
+    
+    def test_benchmark_unreliable_correction(self):
+        '''
+        Test case for an overhead larger than the measured times, which is reported instead of giving negative times
+        '''
+        self.addCleanup(setattr, worker, "overheadCalibration", worker.overheadCalibration)
+        worker.overheadCalibration = [1e9, 1e9, 1e9, 1e9]
+        result = run_submission(INSERTION_SORT, "random:50:1", "benchmark", runs=3, warmups=0)
+        
+        # The calibration is done once per worker, so the overheads set above are used
+        self.assertEqual(list(result["overheads"].values()), worker.overheadCalibration)
+        self.assertFalse(result["reliable"])
+        self.assertEqual(result["corrected"], result["raw"])
+        self.assertIn("unreliable", formatResult(result))
+    
+    def test_errors(self):
+        '''
+        Test case for the errors of the submission and of the list
+        '''
+        self.assertEqual(run_submission("import os")["error"], "Line 1: Importing 'os' module is not allowed")
+        self.assertEqual(run_submission("while True:\n    pass", timeout=0.2)["error"], worker.INTERRUPTED_MESSAGE)
+        self.assertTrue(run_submission("pass", "bogo:10:1")["error"].startswith("Unknown list kind 'bogo'"))
+    
+    def test_main(self):
+        '''
+        Test case for the command line, whose status is 0 only if the list is sorted
+        '''
+        with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as file:
+            file.write(INSERTION_SORT)
+        
+        try:
+            output = io.StringIO()
+            with redirect_stdout(output):
+                self.assertEqual(main([file.name, "--list", "organ-pipe:30:0"]), 0)
+                self.assertEqual(main([file.name, "--mode", "timed", "--json"]), 0)
+            self.assertIn("sorted: True", output.getvalue())
+        finally:
+            os.remove(file.name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import random, statistics
+
+from project.static.python.src.running_stats import *
+
+class TestRunningStats(unittest.TestCase):
+    
+    def test_mean_and_deviation(self):
+        '''
+        Test case for the mean and the standard deviation, updated incrementally
+        '''
+        times = [0.5, 0.25, 1.0, 0.75, 0.0]
+        stats = RunningStats()
+        for time in times:
+            stats.push(time)
+        
+        self.assertEqual(stats.count, 5)
+        self.assertAlmostEqual(stats.mean, statistics.mean(times))
+        self.assertAlmostEqual(stats.standardDeviation, statistics.pstdev(times))
+    
+    def test_quantiles(self):
+        '''
+        Test case for the quantiles of the sketch, which are within SKETCH_ACCURACY of the real ones
+        '''
+        generator = random.Random(42)
+        times = sorted(generator.lognormvariate(-5, 1) for _ in range(1001))
+        stats = RunningStats()
+        for time in times:
+            stats.push(time)
+        
+        for q in (0.0, 0.5, 0.95, 1.0):
+            with self.subTest(q=q):
+                expected = times[round(q * (len(times) - 1))]
+                self.assertLessEqual(abs(stats.quantile(q) - expected), SKETCH_ACCURACY * expected)
+    
+    def test_merge(self):
+        '''
+        Test case for the merge of two sessions, which gives the same statistics as a single session
+        '''
+        generator = random.Random(7)
+        times = [generator.lognormvariate(-5, 1) for _ in range(500)] + [0.0]
+        single, first, second = RunningStats(), RunningStats(), RunningStats()
+        for time in times:
+            single.push(time)
+        for time in times[:200]:
+            first.push(time)
+        for time in times[200:]:
+            second.push(time)
+        
+        merged = first.merge(second)
+        self.assertEqual(merged.count, single.count)
+        self.assertAlmostEqual(merged.mean, single.mean)
+        self.assertAlmostEqual(merged.variance, single.variance)
+        for q in (0.0, 0.5, 0.95, 1.0):
+            self.assertEqual(merged.quantile(q), single.quantile(q))
+        self.assertIs(merged.merge(RunningStats()), merged)
+    
+    def test_json(self):
+        '''
+        Test case for the statistics saved in the localStorage
+        '''
+        stats = RunningStats()
+        for time in (0.0, 0.125, 0.5):
+            stats.push(time)
+        restored = RunningStats.fromJSON(stats.toJSON())
+        
+        self.assertEqual((restored.count, restored.mean, restored.m2), (stats.count, stats.mean, stats.m2))
+        self.assertEqual(restored.quantile(0.5), stats.quantile(0.5))
+    
+    def test_from_summary(self):
+        '''
+        Test case for the statistics rebuilt from the displayed stats, whose quantiles only cover the new times
+        '''
+        stats = RunningStats.fromSummary(10, 2.0, 0.5)
+        self.assertEqual((stats.count, stats.sketchCount), (10, 0))
+        self.assertEqual(stats.quantile(0.5), 0.0)
+        
+        stats.push(1.0)
+        self.assertEqual((stats.count, stats.sketchCount), (11, 1))
+        self.assertAlmostEqual(stats.quantile(0.95), 1.0, delta=SKETCH_ACCURACY)
+    
+    def test_restore_after_instrumented_run(self):
+        '''
+        Test case for the sequence normal run, profiled run, normal run (see startWorker in main.py): the profiled run
+        gives back its execution count, so the saved statistics still match the window and keep their quantiles
+        '''
+        executionCount, text = 0, None
+        for time, instrumented in ((0.25, False), (9.0, True), (0.5, False)):
+            executionCount += 1
+            if instrumented:
+                executionCount -= 1
+                continue
+            stats = RunningStats.restore(text, executionCount - 1, 0.0, 0.0)
+            stats.push(time)
+            text = stats.toJSON()
+        
+        self.assertEqual((stats.count, stats.sketchCount), (2, 2))
+        self.assertAlmostEqual(stats.mean, 0.375)
+        self.assertAlmostEqual(stats.quantile(0.0), 0.25, delta=SKETCH_ACCURACY)
+        
+        # Saved statistics which do not match the window are rebuilt from the displayed stats
+        stats = RunningStats.restore(text, 3, 2.0, 0.5)
+        self.assertEqual((stats.count, stats.sketchCount, stats.mean), (3, 0, 2.0))
+
+if __name__ == '__main__':
+    unittest.main()
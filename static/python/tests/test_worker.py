@@ -0,0 +1,255 @@
+import unittest
+import importlib.util, sys, time
+from array import array
+
+# The module is imported as a whole, as the counters are global variables of the worker
+import project.static.python.src.worker as worker
+from project.static.python.src.result_buffer import unpack_result
+
+BUBBLE_SORT = '''n = len(myList)
+for i in range(n):
+    for j in range(n - 1 - i):
+        if not compare(myList, j, j + 1):
+            swap(myList, j, j + 1)
+'''
+
+class TestExecutionEngine(unittest.TestCase):
+    '''
+    Tests of the execution engine of worker.py, on native CPython with a NullHost
+    '''
+    
+    def setUp(self):
+        worker.reset_state()
+        del worker.host.messages[:]
+    
+    def test_null_host(self):
+        '''
+        Test case for the host used outside of the browser
+        '''
+        self.assertIsInstance(worker.host, worker.NullHost)
+        self.assertFalse(worker.set_interrupt_buffer(None))
+    
+    def test_browser_imports(self):
+        '''
+        Test case for the imports of pyscript in the browser, whose failure is not hidden by the NullHost fallback
+        '''
+        platform = sys.platform
+        self.addCleanup(setattr, sys, "platform", platform)
+        sys.platform = "emscripten"
+        
+        spec = importlib.util.spec_from_file_location("browser_worker", worker.__file__)
+        with self.assertRaises(ImportError):
+            spec.loader.exec_module(importlib.util.module_from_spec(spec))
+    
+    def test_boot_times(self):
+        '''
+        Test case for the timestamps of the boot of the worker, which are in order
+        '''
+        started, imported, executed = worker.boot_times()
+        self.assertLessEqual(started, imported)
+        self.assertLessEqual(imported, executed)
+    
+    def test_parse_and_restrict(self):
+        '''
+        Test case for the restrictions of the user's code
+        
+        Note:
+        -----
+        This test case is expected to raise an exception
+        '''
+        worker.parse_and_restrict(BUBBLE_SORT)
+        
+        with self.assertRaises(Exception) as context:
+            worker.parse_and_restrict("import os")
+        
+        self.assertEqual(str(context.exception), "Line 1: Importing 'os' module is not allowed")
+    
+    def test_compare_and_swap(self):
+        '''
+        Test case for compare and swap, outside of an execution
+        '''
+        arr = array('q', [3, 1, 2])
+        
+        self.assertFalse(worker.compare(arr, 0, 1))
+        worker.swap(arr, 0, 1)
+        self.assertEqual(list(arr), [1, 3, 2])
+        self.assertEqual((worker.compareCount, worker.swapCount), (1, 1))
+        
+        with self.assertRaises(AssertionError) as context:
+            worker.compare(arr, 0, 3)
+        self.assertEqual(str(context.exception), "Index 3 out of range, in compare")
+    
+    def test_fast_primitives_index_types(self):
+        '''
+        Test case for the bool and float indices, which give the same errors on the fast path as on the checked path
+        '''
+        arr = array('q', [3, 1, 2])
+        fast_compare, fast_swap = worker.makeFastPrimitives(arr)
+        
+        for name, checked, fast in (("compare", worker.compare, fast_compare), ("swap", worker.swap, fast_swap)):
+            for i, j in ((True, 0), (0, True), (1.0, 0), (0, 1.0)):
+                with self.subTest(name=name, i=i, j=j):
+                    with self.assertRaises(AssertionError) as expected:
+                        checked(arr, i, j)
+                    with self.assertRaises(AssertionError) as context:
+                        fast(arr, i, j)
+                    self.assertEqual(str(context.exception), str(expected.exception))
+                    self.assertTrue(str(context.exception).startswith("Expected int, got"))
+        self.assertEqual(list(arr), [3, 1, 2])
+    
+    def test_fast_accessors_index_types(self):
+        '''
+        Test case for the bool and float indices, which give the same errors on the fast get and set as on the checked ones
+        '''
+        arr = array('q', [3, 1, 2])
+        fast_get, fast_set, fast_move = worker.makeFastAccessors(arr)
+        
+        for index in (True, 1.0):
+            with self.subTest(index=index):
+                with self.assertRaises(AssertionError) as expected:
+                    worker.getValue(arr, index)
+                with self.assertRaises(AssertionError) as context:
+                    fast_get(arr, index)
+                self.assertEqual(str(context.exception), str(expected.exception))
+                
+                with self.assertRaises(AssertionError) as expected:
+                    worker.setValue(arr, index, 5)
+                with self.assertRaises(AssertionError) as context:
+                    fast_set(arr, index, 5)
+                self.assertEqual(str(context.exception), str(expected.exception))
+                self.assertTrue(str(context.exception).startswith("Expected int, got"))
+        self.assertEqual(list(arr), [3, 1, 2])
+    
+    def test_define_globals(self):
+        '''
+        Test case for the globals of the user's code, from a list and from a descriptor
+        '''
+        self.assertEqual(worker.defineGlobals([3, 1, 2])['myList'], array('q', [3, 1, 2]))
+        self.assertEqual(worker.defineGlobals("reversed:3:0")['myList'], array('q', [3, 2, 1]))
+        
+        with self.assertRaises(AssertionError):
+            worker.defineGlobals([1, 2.5])
+    
+    def test_recorded_execution(self):
+        '''
+        Test case for a recorded execution, whose trace is given to the host
+        '''
+        traceLength = worker.host.traceLength
+        result = unpack_result(worker.execute_code(BUBBLE_SORT, [3, 1, 2], worker.RECORDED_MODE))
+        
+        self.assertEqual(list(result[0]), [1, 2, 3])
+        self.assertEqual(result[2:6], [3, 2, 0, 0])
+        self.assertEqual(worker.host.traceLength - traceLength, 5)
+    
+    def test_recorded_wide_values(self):
+        '''
+        Test case for the values written outside of the 32-bit range, which are recorded in the trace
+        '''
+        code = "set(myList, 0, 2**40)\nset(myList, 1, -2**40)"
+        chunks = []
+        worker.host.receiveTrace = chunks.append
+        self.addCleanup(delattr, worker.host, "receiveTrace")
+        
+        for mode in (worker.RECORDED_MODE, worker.ANIMATED_MODE):
+            worker.reset_state()
+            del chunks[:]
+            self.assertIsNotNone(worker.execute_code(code, [3, 1, 2], mode), mode)
+            self.assertEqual(worker.host.messages, [])
+            self.assertEqual(list(chunks[-1]), [worker.TRACE_WRITE, 0, 2**40, worker.TRACE_WRITE, 1, -2**40])
+    
+    def test_recorded_chunks(self):
+        '''
+        Test case for a long recorded execution, whose trace is sent by chunks while it runs instead of being kept
+        '''
+        chunkSize = worker.RECORDED_CHUNK_SIZE
+        worker.RECORDED_CHUNK_SIZE = 1024
+        self.addCleanup(setattr, worker, "RECORDED_CHUNK_SIZE", chunkSize)
+        sizes = []
+        worker.host.receiveTrace = lambda chunk: sizes.append((len(chunk) // 3, len(worker.trace) // 3))
+        self.addCleanup(delattr, worker.host, "receiveTrace")
+        
+        result = unpack_result(worker.execute_code(BUBBLE_SORT, "reversed:200:1", worker.RECORDED_MODE))
+        
+        self.assertEqual(list(result[0]), list(range(1, 201)))
+        self.assertEqual(sum(size for size, _ in sizes), 2 * 200 * 199 // 2)
+        # The trace is sent as soon as it reaches the size of a chunk, checked every 1024 calls
+        self.assertGreater(len(sizes), 10)
+        self.assertLessEqual(max(kept for _, kept in sizes), 4 * 1024)
+    
+    def test_timed_execution(self):
+        '''
+        Test case for a timed execution, on a generated list
+        '''
+        elapsed = worker.execute_code(BUBBLE_SORT, "random:100:42", worker.TIMED_MODE)
+        
+        self.assertIsInstance(elapsed, float)
+        self.assertEqual(worker.compareCount, 100 * 99 // 2)
+    
+    def test_benchmark_interrupted_calibration(self):
+        '''
+        Test case for a benchmark interrupted during the calibration, which is handled as an interrupted execution
+        '''
+        def interrupt():
+            raise KeyboardInterrupt()
+        
+        self.addCleanup(setattr, worker, "calibrate_overhead", worker.calibrate_overhead)
+        self.addCleanup(setattr, worker, "overheadCalibration", worker.overheadCalibration)
+        worker.calibrate_overhead = interrupt
+        worker.overheadCalibration = None
+        
+        self.assertIsNone(worker.benchmark_code(BUBBLE_SORT, [3, 1, 2], 1, 0))
+        self.assertEqual(worker.host.messages, [worker.INTERRUPTED_MESSAGE])
+        self.assertIsNone(worker.overheadCalibration)
+    
+    def test_scaling_time_budget(self):
+        '''
+        Test case for the time budget of the complexity estimation, which stops a slow execution while it runs
+        '''
+        budget = worker.SCALING_TIME_BUDGET
+        worker.SCALING_TIME_BUDGET = 0.05
+        self.addCleanup(setattr, worker, "SCALING_TIME_BUDGET", budget)
+        
+        start = time.perf_counter()
+        results = worker.scaling_code(BUBBLE_SORT, [10, 30, 100, 10_000], ["reversed"])
+        
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertEqual(results[0][1], [10, 30, 100])
+        self.assertEqual(worker.timeDeadline, 0)
+    
+    def test_execution_errors(self):
+        '''
+        Test case for the errors of the user's code, which are given to the host
+        '''
+        self.assertIsNone(worker.execute_code("import os", [3, 1, 2], worker.RECORDED_MODE))
+        self.assertIsNone(worker.execute_code("swap(myList, 0, 3)", [3, 1, 2], worker.RECORDED_MODE))
+        self.assertIsNone(worker.execute_code(BUBBLE_SORT, "reversed:100:0", worker.RECORDED_MODE, 10))
+        
+        self.assertEqual(worker.host.messages, [
+            "Line 1: Importing 'os' module is not allowed",
+            "Index 3 out of range, in swap",
+            "Operation budget exceeded: more than 10 compare, swap, get and set calls"
+        ])
+    
+    def test_budgets_not_caught(self):
+        '''
+        Test case for the budgets, which are not caught by an `except Exception` around compare, swap, get or set
+        '''
+        self.addCleanup(worker.reset_state)
+        worker.operationBudget = 10
+        worker.compareCount = 11
+        with self.assertRaises(worker.OperationBudgetExceeded):
+            try:
+                worker.checkpoint(array('q', [1, 2]))
+            except Exception:
+                pass
+        
+        worker.reset_state()
+        worker.timeDeadline = 1
+        with self.assertRaises(worker.TimeBudgetExceeded):
+            try:
+                worker.checkpoint(array('q', [1, 2]))
+            except Exception:
+                pass
+
+if __name__ == '__main__':
+    unittest.main()